@@ -6,3 +6,14 @@ Deploy signatures to your entire Google Workspace from the terminal.
 
 __version__ = "1.0.4"
 __author__ = "Hancock Contributors"
+
+__all__ = ['Session']
+
+
+def __getattr__(name):
+    # Imported on first use, so the CLI doesn't pay for the Google API
+    # client libraries before it needs them
+    if name == 'Session':
+        from .core.session import Session
+        return Session
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,9 +5,100 @@ from . import __version__
 from .ui import console
 
 
+def _split_list(value: str) -> tuple:
+    """Split a comma-separated option value into a tuple of items."""
+    return tuple(item.strip() for item in value.split(',') if item.strip())
+
+
+def _matching_options(f):
+    """Add the file discovery and matching options shared by deploy and validate."""
+    options = [
+        click.option(
+            '--fuzzy',
+            is_flag=True,
+            help='Also match files to users by name similarity and email aliases'
+        ),
+        click.option(
+            '--match-priority',
+            default='email,name,combo,alias',
+            show_default=True,
+            help='Matching strategies used to resolve conflicts, highest priority first'
+        ),
+        click.option(
+            '--recursive', '-r',
+            is_flag=True,
+            help='Also scan subfolders'
+        ),
+        click.option(
+            '--include',
+            multiple=True,
+            help='File pattern to pick up, e.g. "*.html" or "sales/*.html" (repeatable)'
+        ),
+        click.option(
+            '--exclude',
+            multiple=True,
+            help='File or folder pattern to skip, e.g. "drafts" (repeatable)'
+        ),
+    ]
+    for option in reversed(options):
+        f = option(f)
+    return f
+
+
+def _scope_options(f):
+    """Add the user scoping options shared by deploy, watch and validate."""
+    options = [
+        click.option(
+            '--ou',
+            'org_unit',
+            help='Only users in this organizational unit (and its sub-units), e.g. /Sales'
+        ),
+        click.option(
+            '--group',
+            'groups',
+            multiple=True,
+            help='Only members of this group, e.g. sales@company.com (repeatable)'
+        ),
+        click.option(
+            '--query',
+            help='Only users matching a Directory API query, e.g. "isSuspended=false"'
+        ),
+        click.option(
+            '--directory-workers',
+            type=click.IntRange(min=1),
+            default=8,
+            show_default=True,
+            help='Parallel requests when listing users from a large directory (1 = page by page)'
+        ),
+    ]
+    for option in reversed(options):
+        f = option(f)
+    return f
+
+
 @click.group()
 @click.version_option(version=__version__, prog_name="hancock")
-def main():
+@click.option(
+    '--profile',
+    help='Named configuration profile (one per Workspace tenant) [env: HANCOCK_PROFILE]'
+)
+@click.option(
+    '--service-account',
+    type=click.Path(dir_okay=False),
+    help='Service account JSON key, overriding the config file [env: HANCOCK_SERVICE_ACCOUNT_FILE]'
+)
+@click.option(
+    '--admin-email',
+    help='Workspace admin email, overriding the config file [env: HANCOCK_ADMIN_EMAIL]'
+)
+@click.option(
+    '--trace',
+    'trace_file',
+    type=click.Path(dir_okay=False, writable=True),
+    help='Record API call timings to this file (OpenTelemetry OTLP/JSON) and print a breakdown'
+)
+@click.pass_context
+def main(ctx, profile, service_account, admin_email, trace_file):
     """
     Hancock - Gmail Signature Deployment CLI
 
@@ -19,10 +110,39 @@ def main():
       2. Create signature HTML files in a folder
       3. hancock deploy signatures/  # Deploy!
 
+    \b
+    Multiple tenants:
+      hancock --profile acme init
+      hancock --profile acme deploy signatures/acme/
+      hancock deploy --all-profiles "signatures/{profile}/"
+
     \b
     ✨ Pro tip: Run Hancock in Claude Code terminal for guided setup help!
     """
-    pass
+    from .core.config import set_active_profile
+    try:
+        set_active_profile(profile, {
+            'service_account_file': service_account,
+            'admin_email': admin_email,
+        })
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--profile')
+
+    if trace_file:
+        from .core import tracing
+
+        def finish_trace():
+            from .ui import print_trace_summary
+            count = tracing.export_otlp_json(trace_file)
+            tracing.disable()
+            if count:
+                print_trace_summary(tracing.summarize(), tracing.slowest('deploy_user'))
+            console.print(f"[muted]Wrote {count} spans to {trace_file}[/muted]")
+
+        tracing.enable()
+        # Closed in reverse order: the root span ends before the export
+        ctx.call_on_close(finish_trace)
+        ctx.with_resource(tracing.span(f"hancock {ctx.invoked_subcommand}"))
 
 
 @main.command()
@@ -42,20 +162,119 @@ def init():
 
 
 @main.command()
-@click.argument('folder', type=click.Path(exists=True))
+@click.argument('folders', nargs=-1, required=True)
 @click.option(
     '--dry-run',
     is_flag=True,
     help='Show what would be deployed without actually deploying'
 )
-def deploy(folder, dry_run):
+@click.option(
+    '--all-profiles',
+    is_flag=True,
+    help='Deploy to every profile in parallel ("{profile}" in FOLDERS is replaced per tenant)'
+)
+@_matching_options
+@_scope_options
+@click.option(
+    '--manifest',
+    type=click.Path(exists=True, dir_okay=False),
+    help='CSV/YAML file of email,file rows to use instead of filename matching'
+)
+@click.option(
+    '--image-base-url',
+    help='Move base64 images out of signatures and link them from this URL'
+)
+@click.option(
+    '--image-dir',
+    type=click.Path(file_okay=False),
+    help='Folder to write extracted images to (upload it to --image-base-url)'
+)
+@click.option(
+    '--all-aliases',
+    is_flag=True,
+    help='Update every sendAs alias of each user, not just the primary address'
+)
+@click.option(
+    '--minify',
+    is_flag=True,
+    help='Strip comments, whitespace and redundant inline styles before validating'
+)
+@click.option(
+    '--canary',
+    type=click.IntRange(min=1),
+    help='Deploy to this many users first and stop if they fail'
+)
+@click.option(
+    '--stages',
+    help='Roll out in cumulative waves, e.g. "1%,10%,100%" or "50,500,100%"'
+)
+@click.option(
+    '--max-error-rate',
+    type=click.FloatRange(0, 100),
+    default=5.0,
+    show_default=True,
+    help='Halt the rollout when a wave has a higher percentage of failures'
+)
+@click.option(
+    '--max-latency',
+    type=click.FloatRange(min=0),
+    help='Halt the rollout when a wave\'s p95 seconds per user is higher'
+)
+@click.option(
+    '--workers',
+    type=click.IntRange(min=1),
+    help='Users deployed at the same time  [default: 4, or 100 with --async]'
+)
+@click.option(
+    '--rate',
+    type=click.FloatRange(min=0, min_open=True),
+    default=10.0,
+    show_default=True,
+    help='Gmail API requests per second, shared by all workers'
+)
+@click.option(
+    '--probe',
+    type=click.IntRange(min=1),
+    help='With --dry-run, time read-only API calls for N users to estimate the deployment time'
+)
+@click.option(
+    '--async', 'use_async',
+    is_flag=True,
+    help='Deploy from a single asyncio event loop (needs hancock-cli[async])'
+)
+@click.option(
+    '--shard',
+    help='Only deploy to shard K of N of the users, e.g. "3/8" (split by email hash)'
+)
+@click.option(
+    '--results',
+    type=click.Path(dir_okay=False, writable=True),
+    help='Save the outcome to a JSON file for hancock merge-results'
+)
+@click.option(
+    '--dead-letter',
+    type=click.Path(dir_okay=False, writable=True),
+    help='Append users that fail every attempt to this JSON Lines file  [default: ~/.hancock/dead-letter/<profile>.jsonl]'
+)
+@click.option(
+    '--yes', '-y', 'assume_yes',
+    is_flag=True,
+    help='Deploy without asking for confirmation (unattended runs)'
+)
+@click.pass_context
+def deploy(ctx, folders, dry_run, all_profiles, fuzzy, match_priority, recursive, include, exclude,
+           org_unit, groups, query, directory_workers, manifest, image_base_url, image_dir, all_aliases, minify,
+           canary, stages, max_error_rate, max_latency, workers, rate, probe, use_async, shard,
+           results, dead_letter, assume_yes):
     """
-    Deploy signatures from a FOLDER to Google Workspace users.
+    Deploy signatures from one or more FOLDERS to Google Workspace users.
 
     \b
     Example:
       hancock deploy signatures/
       hancock deploy ~/Documents/my-signatures/ --dry-run
+      hancock deploy sales/ marketing/ --recursive --exclude drafts
+      hancock deploy signatures/ --ou /Sales
 
     \b
     File Naming:
@@ -68,10 +287,131 @@ def deploy(folder, dry_run):
     Tips:
       • Keep signatures under 10KB (Gmail limit)
       • Use base64-encoded images (no external hosting)
-      • Test with --dry-run first!
+      • Test with --dry-run first! Add --probe 5 for a time estimate
+      • Use --fuzzy to catch typos like jon.smith.html
+      • Use --manifest mapping.csv to map emails to files explicitly
+      • Use --all-profiles to roll out to every tenant at once
+      • Use --canary 20 or --stages 1%,10%,100% to limit the blast radius
+      • Use --shard 3/8 --results r3.json to split a deployment across machines
     """
-    from .commands.deploy import run_deploy
-    run_deploy(folder, dry_run)
+    if image_dir and not image_base_url:
+        raise click.UsageError('--image-dir requires --image-base-url')
+    if all_profiles and ctx.parent.params.get('profile'):
+        raise click.UsageError('--all-profiles cannot be combined with --profile')
+    if stages:
+        from .core.rollout import parse_stages
+        try:
+            stages = parse_stages(stages)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--stages')
+    if shard:
+        from .core.shard import parse_shard
+        try:
+            shard = parse_shard(shard)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--shard')
+
+    from .commands.deploy import run_deploy, run_deploy_all_profiles
+    deploy_fn = run_deploy_all_profiles if all_profiles else run_deploy
+    outcome = deploy_fn(
+        folders,
+        dry_run,
+        fuzzy=fuzzy,
+        match_priority=_split_list(match_priority),
+        manifest_path=manifest,
+        include=include,
+        exclude=exclude,
+        recursive=recursive,
+        image_base_url=image_base_url,
+        image_dir=image_dir,
+        minify=minify,
+        org_unit=org_unit,
+        groups=groups,
+        query=query,
+        directory_workers=directory_workers,
+        all_aliases=all_aliases,
+        canary=canary,
+        stages=stages,
+        max_error_rate=max_error_rate / 100,
+        max_p95_latency=max_latency,
+        workers=workers,
+        rate=rate,
+        probe=probe or 0,
+        use_async=use_async,
+        shard=shard,
+        dead_letter=dead_letter,
+        assume_yes=assume_yes
+    )
+
+    if results:
+        from .core.shard import write_results
+        write_results(results, outcome if all_profiles else [outcome], shard)
+        console.print(f"[muted]Results saved to {results}[/muted]")
+
+
+@main.command()
+@click.argument('folders', nargs=-1, required=True, type=click.Path(exists=True, file_okay=False))
+@click.option(
+    '--match-priority',
+    default='email,name,combo,alias',
+    show_default=True,
+    help='Matching strategies used to resolve conflicts, highest priority first'
+)
+@click.option('--recursive', '-r', is_flag=True, help='Also watch subfolders')
+@click.option('--include', multiple=True, help='File pattern to pick up (repeatable)')
+@click.option('--exclude', multiple=True, help='File or folder pattern to skip (repeatable)')
+@_scope_options
+@click.option('--image-base-url', help='Move base64 images out of signatures and link them from this URL')
+@click.option(
+    '--image-dir',
+    type=click.Path(file_okay=False),
+    help='Folder to write extracted images to (upload it to --image-base-url)'
+)
+@click.option('--minify', is_flag=True, help='Minify signatures before validating')
+@click.option('--all-aliases', is_flag=True, help='Update every sendAs alias, not just the primary address')
+@click.option(
+    '--debounce',
+    type=float,
+    default=2.0,
+    show_default=True,
+    help='Seconds a file must be unchanged before it is deployed'
+)
+@click.option('--interval', type=float, default=1.0, show_default=True, help='Seconds between folder scans')
+def watch(folders, match_priority, recursive, include, exclude, org_unit, groups, query,
+          directory_workers, image_base_url, image_dir, minify, all_aliases, debounce, interval):
+    """
+    Watch FOLDERS and deploy signatures as soon as their files change.
+
+    \b
+    Example:
+      hancock watch signatures/
+      hancock watch signatures/ --recursive --debounce 5
+
+    Runs until stopped with Ctrl+C. Only the users whose files changed are
+    rematched and deployed; there is no confirmation prompt, so check your
+    folder with "hancock validate" first.
+    """
+    if image_dir and not image_base_url:
+        raise click.UsageError('--image-dir requires --image-base-url')
+
+    from .commands.watch import run_watch
+    run_watch(
+        folders,
+        match_priority=_split_list(match_priority),
+        include=include,
+        exclude=exclude,
+        recursive=recursive,
+        org_unit=org_unit,
+        groups=groups,
+        query=query,
+        image_base_url=image_base_url,
+        image_dir=image_dir,
+        minify=minify,
+        all_aliases=all_aliases,
+        debounce=debounce,
+        interval=interval,
+        directory_workers=directory_workers
+    )
 
 
 @main.command()
@@ -91,27 +431,170 @@ def preview(email):
 
 
 @main.command()
-@click.argument('folder', type=click.Path(exists=True))
-def validate(folder):
+@click.argument('folders', nargs=-1, required=True, type=click.Path(exists=True))
+@_matching_options
+@_scope_options
+@click.option(
+    '--users', 'users_file',
+    type=click.Path(exists=True, dir_okay=False),
+    help='Match against users from a CSV export (e.g. the Admin console user download) or snapshot'
+)
+@click.option(
+    '--online',
+    is_flag=True,
+    help='Fetch users from Google Workspace instead (implied by --ou, --group and --query)'
+)
+@click.pass_context
+def validate(ctx, folders, fuzzy, match_priority, recursive, include, exclude, org_unit, groups, query,
+             directory_workers, users_file, online):
     """
-    Validate signature files in a FOLDER without deploying.
+    Validate signature files in one or more FOLDERS without deploying.
 
     \b
     Example:
       hancock validate signatures/
+      hancock validate signatures/ --users users.csv
 
     Checks:
       • File size (must be under 10KB)
-      • HTML format
-      • Image encoding (base64 vs external)
+      • HTML markup (disallowed tags, scripts, unclosed tags)
+      • Image encoding (base64 vs external, incl. srcset and CSS backgrounds)
       • Matching to users
 
-    Use this to check your signatures before deploying.
+    Runs offline: files are matched against --users or the users cached by
+    the last hancock deploy, so it works without credentials (e.g. in a
+    pre-commit hook). Exits with status 1 when a file has errors.
+    """
+    online = online or bool(org_unit or groups or query)
+    if online and users_file:
+        raise click.UsageError('--users cannot be combined with --online, --ou, --group or --query')
+
+    if online:
+        from .commands.deploy import run_deploy
+        # Online validation is the same as a dry-run deploy
+        console.print("[bold cyan]Validating signatures...[/bold cyan]\n")
+        outcome = run_deploy(
+            folders,
+            dry_run=True,
+            fuzzy=fuzzy,
+            match_priority=_split_list(match_priority),
+            include=include,
+            exclude=exclude,
+            recursive=recursive,
+            org_unit=org_unit,
+            groups=groups,
+            query=query,
+            directory_workers=directory_workers
+        )
+    else:
+        from .commands.validate import run_validate
+        outcome = run_validate(
+            folders,
+            fuzzy=fuzzy,
+            match_priority=_split_list(match_priority),
+            include=include,
+            exclude=exclude,
+            recursive=recursive,
+            users_file=users_file
+        )
+
+    if outcome['errors'] or outcome['error']:
+        ctx.exit(1)
+
+
+@main.command()
+@click.argument('folders', nargs=-1, required=True, type=click.Path(exists=True, file_okay=False))
+@click.option(
+    '--output', '-o',
+    default='signatures.hsig',
+    show_default=True,
+    help='Bundle file to write (.hsig, or .zip for a plain zip archive)'
+)
+@click.option('--recursive', '-r', is_flag=True, help='Also pack subfolders')
+@click.option('--include', multiple=True, help='File pattern to pick up (repeatable)')
+@click.option('--exclude', multiple=True, help='File or folder pattern to skip (repeatable)')
+def pack(folders, output, recursive, include, exclude):
+    """
+    Pack signature files from FOLDERS into a single bundle.
+
+    \b
+    Example:
+      hancock pack signatures/ -r -o signatures.hsig
+      hancock deploy signatures.hsig
+
+    Bundles deploy exactly like folders, but ship as one file.
+    """
+    from .commands.pack import run_pack
+    run_pack(folders, output, include=include, exclude=exclude, recursive=recursive)
+
+
+@main.command('merge-results')
+@click.argument('files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    '--output', '-o',
+    type=click.Path(dir_okay=False, writable=True),
+    help='Also save the combined results to this file'
+)
+def merge_results(files, output):
+    """
+    Combine the results of sharded deployments into one summary.
+
+    \b
+    Example:
+      hancock deploy signatures/ --shard 1/2 --results r1.json --yes
+      hancock deploy signatures/ --shard 2/2 --results r2.json --yes
+      hancock merge-results r1.json r2.json
+    """
+    from .commands.merge import run_merge_results
+    run_merge_results(files, output=output)
+
+
+@main.command()
+@click.option(
+    '--limit', '-n',
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help='Most recent runs to show'
+)
+@click.option(
+    '--window',
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help='Earlier runs in the rolling median each run is compared with'
+)
+@click.option(
+    '--threshold',
+    type=click.FloatRange(0, 100),
+    default=25.0,
+    show_default=True,
+    help='Flag runs whose users/sec is this many percent below the median'
+)
+def history(limit, window, threshold):
+    """
+    Show past deployments and flag runs that got slower.
+
+    Every deployment is recorded with its phase timings, users/sec, retries
+    and errors. Each run is compared with the median throughput of the runs
+    of the same profile before it.
+
+    \b
+    Example:
+      hancock history
+      hancock --profile acme history --limit 50
     """
-    from .commands.deploy import run_deploy
-    # Validate is the same as dry-run deploy
-    console.print("[bold cyan]Validating signatures...[/bold cyan]\n")
-    run_deploy(folder, dry_run=True)
+    from .commands.history import run_history
+    from .core.config import get_config
+    # The active profile: --profile or HANCOCK_PROFILE
+    profile = get_config().profile
+    run_history(
+        profile,
+        all_profiles=not profile,
+        limit=limit,
+        window=window,
+        threshold=threshold / 100
+    )
 
 
 @main.command()
@@ -124,17 +607,22 @@ def config():
       • Service account path
       • Admin email
       • Configuration status
+      • Saved profiles
     """
-    from .core.config import get_config
+    from .core.config import get_config, list_profiles
 
     cfg = get_config()
 
     console.print("[bold cyan]Hancock Configuration[/bold cyan]\n")
+    if cfg.profile:
+        console.print(f"[bold]Profile:[/bold] {cfg.profile}")
     console.print(f"[bold]Config file:[/bold] {cfg.get_config_path()}")
 
-    if cfg.exists():
-        console.print(f"[bold]Service account:[/bold] {cfg.get('service_account_file', '[not set]')}")
-        console.print(f"[bold]Admin email:[/bold] {cfg.get('admin_email', '[not set]')}")
+    if cfg.exists() or cfg.is_configured():
+        for key, label in (('service_account_file', 'Service account'), ('admin_email', 'Admin email')):
+            source = cfg.source(key)
+            note = f" [muted]({source})[/muted]" if source in ('env', 'cli') else ""
+            console.print(f"[bold]{label}:[/bold] {cfg.get(key, '[not set]')}{note}")
 
         if cfg.is_configured():
             console.print("\n[green]✓ Fully configured and ready to use[/green]\n")
@@ -145,6 +633,11 @@ def config():
         console.print("\n[yellow]No configuration found[/yellow]")
         console.print("[cyan]Run:[/cyan] [bold]hancock init[/bold]\n")
 
+    profiles = list_profiles()
+    if profiles:
+        console.print(f"[bold]Profiles:[/bold] {', '.join(profiles)}")
+        console.print("[muted]Select one with: hancock --profile <name> <command>[/muted]\n")
+
 
 if __name__ == '__main__':
     main()
@@ -1,11 +1,42 @@
 """Deploy signatures to Google Workspace users."""
 
+import sqlite3
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from ..core.config import get_config
-from ..core.auth import authenticate, get_service
-from ..core.directory import get_all_users, extract_user_data
-from ..core.matching import match_signatures_to_users
-from ..core.gmail import deploy_signatures_batch
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from .. import __version__
+from ..core.config import Config, get_config, list_profiles
+from ..core.auth import authenticate, get_service, GROUP_SCOPES
+from ..core.directory import load_user_records, DEFAULT_CRAWL_WORKERS
+from ..core.matching import (
+    match_signatures_to_users,
+    find_alias_files,
+    ALIAS_FILE_PATTERNS,
+    DEFAULT_MATCH_PRIORITY,
+)
+from ..core.manifest import match_manifest_to_users
+from ..core.scanner import SignatureStore
+from ..core.bundle import is_bundle_path
+from ..core.images import ImageExtractor
+from ..core.minify import minify_html
+from ..core.transforms import chain_transforms
+from ..core.gmail import deploy_signatures_batch, DEFAULT_WORKERS
+from ..core.async_gmail import deploy_signatures_async, is_available as async_available, DEFAULT_CONCURRENCY
+from ..core.shard import format_shard
+from ..core.rollout import plan_waves, parse_stages, run_rollout, rollout_order, DEFAULT_MAX_ERROR_RATE
+from ..core.ratelimit import RateLimiter, DEFAULT_RATE
+from ..core.estimate import (
+    load_latency_samples,
+    save_latency_samples,
+    probe_latency,
+    estimate_deployment,
+    GMAIL_PROJECT_UNITS_PER_MINUTE,
+)
+from ..core.history import record_run
+from ..core.deadletter import get_dead_letter_path, write_dead_letters
+from ..core.snapshot import save_user_snapshot
 from ..ui import (
     console,
     print_header,
@@ -17,40 +48,179 @@ from ..ui import (
     create_match_table,
     print_summary,
     print_deployment_summary,
+    print_profile_summary,
+    print_size_savings,
+    print_estimate,
     create_progress_bar,
     create_spinner,
 )
 
-
-def run_deploy(folder_path: str, dry_run: bool = False):
+# Rows shown in the match preview table; large orgs get a truncated preview
+MAX_TABLE_ROWS = 200
+
+# Placeholder in folder and manifest paths replaced with the profile name
+PROFILE_PLACEHOLDER = '{profile}'
+
+# Upper bound on tenants deployed at the same time with --all-profiles
+MAX_PARALLEL_PROFILES = 16
+
+
+def run_deploy(
+    folder_path: Union[str, Sequence[str]],
+    dry_run: bool = False,
+    fuzzy: bool = False,
+    match_priority: Optional[Sequence[str]] = None,
+    manifest_path: Optional[str] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    recursive: bool = False,
+    image_base_url: Optional[str] = None,
+    image_dir: Optional[str] = None,
+    minify: bool = False,
+    org_unit: Optional[str] = None,
+    groups: Optional[Sequence[str]] = None,
+    query: Optional[str] = None,
+    all_aliases: bool = False,
+    canary: Optional[int] = None,
+    stages: Optional[Union[str, Sequence]] = None,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    max_p95_latency: Optional[float] = None,
+    workers: Optional[int] = None,
+    rate: float = DEFAULT_RATE,
+    probe: int = 0,
+    use_async: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+    directory_workers: int = DEFAULT_CRAWL_WORKERS,
+    dead_letter: Optional[str] = None,
+    profile: Optional[str] = None,
+    assume_yes: bool = False
+) -> Dict:
     """
     Deploy signatures from a folder to Google Workspace users.
 
     Args:
-        folder_path: Path to folder containing signature HTML files
+        folder_path: Path to folder or bundle (.hsig/.zip) containing signature
+            HTML files, or a list of them to scan together. "{profile}" is
+            replaced with the profile name
         dry_run: If True, only show what would be deployed without actually deploying
+        fuzzy: If True, also match files to users by name similarity
+        match_priority: Matching strategies used to resolve conflicts, highest first
+        manifest_path: Optional CSV/YAML manifest of email,file rows used instead
+            of filename matching (relative paths resolve against the first folder)
+        include: File patterns to pick up (default: *.html, *.htm)
+        exclude: File or directory patterns to skip
+        recursive: If True, also scan subfolders
+        image_base_url: If set, move base64 images out of the signatures and
+            link them from this URL instead
+        image_dir: Folder to write the extracted images to for hosting
+        minify: If True, minify signature HTML before validation and upload
+        org_unit: Only deploy to users in this organizational unit (e.g. "/Sales")
+        groups: Only deploy to members of these groups
+        query: Only deploy to users matching this Directory API query
+        all_aliases: If True, update every sendAs identity of each user, not
+            just the primary one. Files named after an address
+            (e.g. "sales@company.com.html") always set that identity's signature
+        canary: Deploy to this many users first, then to the rest
+        stages: Cumulative rollout stages, e.g. "1%,10%,100%" (see parse_stages)
+        max_error_rate: Halt remaining waves when a wave's failure share is higher
+        max_p95_latency: Halt remaining waves when a wave's p95 seconds per user is higher
+        workers: Users deployed at the same time (default: DEFAULT_WORKERS,
+            or DEFAULT_CONCURRENCY with use_async)
+        rate: Gmail API requests per second, shared by all workers
+        probe: With dry_run, time read-only API calls for this many users
+            to estimate how long the deployment would take (otherwise
+            latencies saved by earlier deployments are used)
+        use_async: If True, deploy over the asyncio transport (needs aiohttp)
+            instead of a thread pool of discovery clients
+        shard: Only deploy to users in this (index, count) shard (see
+            parse_shard), so several machines can split one deployment
+        directory_workers: Parallel Directory requests when the user list
+            spans several pages (see crawl_users); 1 lists page by page
+        dead_letter: JSON Lines file users that fail every attempt are
+            appended to (default: get_dead_letter_path(profile))
+        profile: Configuration profile (tenant) to deploy to (default: the
+            active profile)
+        assume_yes: If True, deploy without asking for confirmation
+
+    Returns:
+        Summary dictionary with profile, matched, unmatched, errors,
+        deployed and failed counts, error (why the run stopped early, or
+        None), unmatched_files (paths), error_files ({filename, path,
+        error}) and failures ({email, error}, users that failed to deploy)
     """
+    summary = {
+        'profile': profile,
+        'matched': 0,
+        'unmatched': 0,
+        'errors': 0,
+        'deployed': 0,
+        'failed': 0,
+        'error': None,
+        'unmatched_files': [],
+        'error_files': [],
+        'failures': [],
+    }
+
+    def fail(message: str) -> Dict:
+        print_error(message)
+        summary['error'] = message
+        return summary
+
+    # Start time and seconds spent in each phase, for the run history
+    started = datetime.now(timezone.utc).isoformat()
+    phases = {}
+    phase_started = time.monotonic()
+
+    def end_phase(name: str):
+        nonlocal phase_started
+        now = time.monotonic()
+        phases[name] = now - phase_started
+        phase_started = now
+
     print_header("🚀 Hancock Signature Deployment")
 
     # Check configuration
-    config = get_config()
+    config = Config(profile) if profile else get_config()
+    if config.profile:
+        console.print(f"[cyan]👤 Profile: {config.profile}[/cyan]")
+    if shard:
+        console.print(f"[cyan]🧩 Shard: {format_shard(shard)} (users are split by a hash of their email)[/cyan]")
     if not config.is_configured():
-        print_error("Hancock is not configured yet")
+        fail("Hancock is not configured yet")
         console.print("\n[cyan]Run this command first:[/cyan]")
-        console.print("[bold]  hancock init[/bold]\n")
-        return
-
-    # Validate folder path
-    signatures_folder = Path(folder_path).expanduser().absolute()
-    if not signatures_folder.exists():
-        print_error(f"Folder not found: {signatures_folder}")
-        return
-
-    if not signatures_folder.is_dir():
-        print_error(f"Path is not a directory: {signatures_folder}")
-        return
-
-    console.print(f"[cyan]📁 Signatures folder: {signatures_folder}[/cyan]\n")
+        console.print(f"[bold]  hancock{' --profile ' + config.profile if config.profile else ''} init[/bold]\n")
+        return summary
+
+    if use_async and not async_available():
+        return fail('--async needs aiohttp: pip install "hancock-cli[async]"')
+    if workers is None:
+        workers = DEFAULT_CONCURRENCY if use_async else DEFAULT_WORKERS
+
+    # Validate folder paths
+    if isinstance(folder_path, (str, Path)):
+        folder_path = [folder_path]
+
+    signatures_folders = []
+    for path in folder_path:
+        # "{profile}" lets one command line point each tenant at its own folder
+        path = str(path).replace(PROFILE_PLACEHOLDER, config.profile or '')
+        signatures_folder = Path(path).expanduser().absolute()
+        if not signatures_folder.exists():
+            return fail(f"Folder not found: {signatures_folder}")
+
+        if is_bundle_path(signatures_folder):
+            signatures_folders.append(signatures_folder)
+            console.print(f"[cyan]📦 Signatures bundle: {signatures_folder}[/cyan]")
+            continue
+
+        if not signatures_folder.is_dir():
+            return fail(f"Path is not a directory: {signatures_folder}")
+
+        signatures_folders.append(signatures_folder)
+        console.print(f"[cyan]📁 Signatures folder: {signatures_folder}[/cyan]")
+
+    signatures_folder = signatures_folders[0]
+    console.print()
 
     # Authenticate
     print_section("🔐 Authenticating with Google Workspace")
@@ -61,7 +231,8 @@ def run_deploy(folder_path: str, dry_run: bool = False):
 
             credentials, admin_email = authenticate(
                 config.get('service_account_file'),
-                config.get('admin_email')
+                config.get('admin_email'),
+                extra_scopes=GROUP_SCOPES if groups else None
             )
 
             # Use admin_email for directory access
@@ -69,11 +240,12 @@ def run_deploy(folder_path: str, dry_run: bool = False):
 
         print_success("Connected to Google Workspace")
         console.print()
+        end_phase('auth')
 
     except Exception as e:
-        print_error(f"Authentication failed: {e}")
+        fail(f"Authentication failed: {e}")
         console.print("\n[yellow]Try running:[/yellow] [bold]hancock init[/bold]\n")
-        return
+        return summary
 
     # Fetch users
     print_section("👥 Fetching Users")
@@ -81,49 +253,144 @@ def run_deploy(folder_path: str, dry_run: bool = False):
     try:
         with create_spinner() as progress:
             task = progress.add_task("Loading users from your workspace...", total=None)
-            users_raw = get_all_users(directory_service)
+            timings = []
+            users = load_user_records(
+                directory_service,
+                query=query,
+                org_unit=org_unit,
+                groups=groups,
+                service_factory=lambda: get_service('admin', 'directory_v1', credentials, user_email=admin_email),
+                workers=directory_workers,
+                timings=timings
+            )
 
-        users = [extract_user_data(u) for u in users_raw]
-        print_success(f"Found {len(users)} users in your workspace")
+        scope = _describe_scope(org_unit, groups, query)
+        if scope:
+            print_success(f"Found {len(users)} users in {scope}")
+        else:
+            print_success(f"Found {len(users)} users in your workspace")
+        if timings:
+            slowest = max(timings, key=lambda t: t['seconds'])
+            console.print(
+                f"[muted]Listed in {len(timings)} partitions, {directory_workers} at a time; slowest "
+                f"{slowest['partition']} ({slowest['users']} users, {slowest['pages']} pages) "
+                f"took {slowest['seconds']:.1f}s[/muted]"
+            )
         console.print()
+        end_phase('directory')
+
+        # Cache the full user list for offline hancock validate
+        if not (org_unit or groups or query):
+            try:
+                save_user_snapshot(config.profile, users)
+            except OSError:
+                pass
 
     except Exception as e:
-        print_error(f"Failed to fetch users: {e}")
-        return
+        return fail(f"Failed to fetch users: {e}")
+
+    # Signature transforms applied before validation and deployment
+    transform = chain_transforms(
+        ImageExtractor(image_base_url, image_dir) if image_base_url else None,
+        minify_html if minify else None,
+    )
 
     # Match signatures to users
     print_section("🔍 Matching Signatures")
 
-    try:
-        matched, unmatched, errors = match_signatures_to_users(signatures_folder, users)
+    alias_files = {}
 
-        console.print(f"[cyan]Found {len(matched) + len(unmatched) + len(errors)} HTML files[/cyan]\n")
+    try:
+        if manifest_path:
+            manifest = Path(manifest_path.replace(PROFILE_PLACEHOLDER, config.profile or '')).expanduser().absolute()
+            console.print(f"[cyan]📄 Using manifest: {manifest}[/cyan]\n")
+            matched, unmatched, errors = match_manifest_to_users(
+                manifest,
+                signatures_folder,
+                users,
+                transform=transform,
+                shard=shard
+            )
+            console.print(f"[cyan]Found {len(matched) + len(unmatched) + len(errors)} mappings[/cyan]\n")
+        else:
+            # Files named after a sendAs address are deployed by address
+            alias_files, alias_errors = find_alias_files(
+                signatures_folders,
+                exclude=exclude,
+                recursive=recursive,
+                transform=transform
+            )
+            matched, unmatched, errors = match_signatures_to_users(
+                signatures_folders,
+                users,
+                fuzzy=fuzzy,
+                priority=match_priority or DEFAULT_MATCH_PRIORITY,
+                include=include,
+                exclude=list(exclude or ()) + list(ALIAS_FILE_PATTERNS),
+                recursive=recursive,
+                transform=transform,
+                shard=shard
+            )
+            errors.extend(alias_errors)
+            found = len(matched) + len(unmatched) + len(errors) + len(alias_files)
+            console.print(f"[cyan]Found {found} HTML files[/cyan]\n")
 
         # Display match table
-        table = create_match_table(matched, unmatched, errors)
+        table = create_match_table(
+            matched + list(alias_files.values()),
+            unmatched,
+            errors,
+            limit=MAX_TABLE_ROWS
+        )
         console.print(table)
 
         # Summary
         print_summary(len(matched), len(unmatched), len(errors))
 
     except ValueError as e:
-        print_error(str(e))
-        return
+        return fail(str(e))
     except Exception as e:
-        print_error(f"Error matching signatures: {e}")
-        return
+        return fail(f"Error matching signatures: {e}")
+
+    summary.update(
+        matched=len(matched),
+        unmatched=len(unmatched),
+        errors=len(errors),
+        unmatched_files=[u['path'] for u in unmatched],
+        error_files=[{'filename': e['filename'], 'path': e['path'], 'error': e['error']} for e in errors],
+    )
+
+    # Every file that will be deployed, including per-address signatures
+    deployable = matched + list(alias_files.values())
 
     # Check if there are any signatures to deploy
+    if alias_files:
+        console.print(f"[cyan]📨 {len(alias_files)} per-address signatures will be set on the sendAs identity with that address[/cyan]")
+        console.print("[muted]The owning user needs a matched signature file to be included in the deployment.[/muted]\n")
+
     if not matched:
         print_warning("No signatures matched to users")
         console.print("\n[yellow]Make sure your filenames match user emails or names.[/yellow]")
         console.print("[yellow]Example: john.smith.html → john.smith@yourcompany.com[/yellow]\n")
-        return
+        return summary
+
+    # Report bytes saved by minification and image extraction
+    if transform:
+        print_size_savings(deployable)
 
-    # Show warnings for external images
+    if image_base_url:
+        console.print(f"[cyan]🖼  Base64 images now link to {image_base_url}[/cyan]")
+        if image_dir:
+            console.print(f"[muted]Upload {Path(image_dir).expanduser()} to {image_base_url} before deploying.[/muted]")
+        console.print()
+
+    # Show warnings for external images (other than the ones we host)
     external_image_warnings = []
-    for match in matched:
-        if match.get('info', {}).get('has_external_images'):
+    for match in deployable:
+        urls = match.get('info', {}).get('external_image_urls', [])
+        if image_base_url:
+            urls = [u for u in urls if not u.startswith(image_base_url.rstrip('/') + '/')]
+        if urls:
             external_image_warnings.append(match['email'])
 
     if external_image_warnings:
@@ -131,56 +398,142 @@ def run_deploy(folder_path: str, dry_run: bool = False):
         console.print("[muted]External images require hosting and may not display correctly in all email clients.[/muted]")
         console.print("[muted]Consider using base64-encoded images instead.[/muted]\n")
 
+    # Show markup problems found while linting
+    lint_warnings = [m for m in deployable if m.get('info', {}).get('warnings')]
+    if lint_warnings:
+        console.print(f"[yellow]⚠ Warning: {len(lint_warnings)} signatures have markup problems[/yellow]")
+        for match in lint_warnings[:5]:  # Show first 5
+            console.print(f"  [muted]• {match['filename']}: {'; '.join(match['info']['warnings'][:3])}[/muted]")
+        if len(lint_warnings) > 5:
+            console.print(f"  [muted]... and {len(lint_warnings) - 5} more[/muted]")
+        console.print()
+
+    end_phase('match')
+
     # Dry run mode
     if dry_run:
         console.print("[bold yellow]🔍 DRY RUN MODE - No signatures will be deployed[/bold yellow]\n")
         console.print("[cyan]The above signatures would be deployed to Google Workspace.[/cyan]")
         console.print("[cyan]Remove --dry-run to actually deploy.[/cyan]\n")
-        return
+        _print_deploy_estimate(
+            config.profile,
+            credentials,
+            matched,
+            directory_users=len(users),
+            directory_pages=sum(t['pages'] for t in timings) or None,
+            alias_patches=len(alias_files),
+            workers=workers,
+            rate=rate,
+            probe=probe,
+            all_aliases=all_aliases
+        )
+        return summary
+
+    # Plan rollout waves
+    if isinstance(stages, str):
+        try:
+            stages = parse_stages(stages)
+        except ValueError as e:
+            return fail(str(e))
+    waves = plan_waves([m['email'] for m in matched], canary=canary, stages=stages)
+
+    if len(waves) > 1:
+        sizes = ' → '.join(str(len(w)) for w in waves)
+        console.print(f"[cyan]🐤 Staged rollout in {len(waves)} waves: {sizes} users[/cyan]")
+        limits = f"error rate above {max_error_rate:.0%}"
+        if max_p95_latency is not None:
+            limits += f" or p95 latency above {max_p95_latency:g}s"
+        console.print(f"[muted]Remaining waves are skipped if a wave has an {limits}.[/muted]\n")
 
     # Confirm deployment
-    console.print(f"[bold]Ready to deploy {len(matched)} signatures to Google Workspace?[/bold]\n")
-    console.print("[muted]This will update Gmail signatures for the matched users.[/muted]\n")
+    if not assume_yes:
+        console.print(f"[bold]Ready to deploy {len(matched)} signatures to Google Workspace?[/bold]\n")
+        console.print("[muted]This will update Gmail signatures for the matched users.[/muted]\n")
 
-    if not ask_yes_no("Deploy signatures?", default=False):
-        console.print("\n[yellow]Deployment cancelled[/yellow]\n")
-        return
+        if not ask_yes_no("Deploy signatures?", default=False):
+            console.print("\n[yellow]Deployment cancelled[/yellow]\n")
+            return summary
 
-    console.print()
+        console.print()
 
     # Deploy signatures
     print_section("📤 Deploying Signatures")
+    phase_started = time.monotonic()  # Time spent on the prompt is not a phase
 
-    # Prepare signatures dict
-    signatures_dict = {}
-    for match in matched:
-        with open(match['path'], 'r', encoding='utf-8') as f:
-            signatures_dict[match['email']] = f.read()
+    # Signatures are read as each user is deployed, not all up front
+    signatures = SignatureStore({m['email']: m['path'] for m in matched}, transform=transform)
+    alias_signatures = SignatureStore({a: m['path'] for a, m in alias_files.items()}, transform=transform)
 
     # Deploy with progress bar
-    success_count = 0
-    failed_count = 0
-    errors_list = []
-
     with create_progress_bar() as progress:
         task = progress.add_task("Deploying signatures...", total=len(matched))
 
         def progress_callback(email, success, error_msg):
-            nonlocal success_count, failed_count
-            if success:
-                success_count += 1
-            else:
-                failed_count += 1
-                errors_list.append({'email': email, 'error': error_msg})
             progress.update(task, advance=1)
 
-        success_count, failed_count, errors_list = deploy_signatures_batch(
+        def wave_callback(wave):
+            if len(waves) > 1:
+                console.print(
+                    f"[muted]Wave {wave['wave']}/{len(waves)}: {wave['success']}/{wave['size']} deployed, "
+                    f"{wave['error_rate']:.1%} errors, p50 {wave['p50']:.2f}s, p95 {wave['p95']:.2f}s[/muted]"
+                )
+
+        rollout = run_rollout(
             credentials,
-            signatures_dict,
-            progress_callback=progress_callback
+            signatures,
+            waves,
+            max_error_rate=max_error_rate,
+            max_p95_latency=max_p95_latency,
+            wave_callback=wave_callback,
+            progress_callback=progress_callback,
+            all_aliases=all_aliases,
+            alias_signatures=alias_signatures,
+            workers=workers,
+            rate_limiter=RateLimiter(rate),
+            deploy=deploy_signatures_async if use_async else deploy_signatures_batch
         )
 
+    end_phase('deploy')
     console.print()
+    success_count = rollout['success']
+    failed_count = rollout['failed']
+    errors_list = rollout['errors']
+    summary.update(deployed=success_count, failed=failed_count, failures=errors_list)
+
+    if rollout['halted']:
+        print_error(f"Rollout halted: {rollout['halted']}")
+        console.print(f"[yellow]{rollout['skipped']} users were not deployed. Fix the errors below and run again.[/yellow]")
+        summary['error'] = f"Rollout halted: {rollout['halted']}"
+
+    # Keep this run's timings for --dry-run estimates and hancock history
+    try:
+        save_latency_samples(config.profile, rollout['latencies'], rollout['retries'])
+        record_run({
+            'started': started,
+            'profile': config.profile,
+            'version': __version__,
+            'shard': format_shard(shard),
+            'transport': 'async' if use_async else 'threads',
+            'workers': workers,
+            'users': len(matched),
+            'deployed': success_count,
+            'failed': failed_count,
+            'retries': rollout['retries'],
+            'seconds': sum(phases.values()),
+            'phases': phases,
+            'failures': errors_list,
+            'error': summary['error'],
+        })
+    except (OSError, sqlite3.Error) as e:
+        print_warning(f"Could not save this run to the history: {e}")
+
+    if errors_list:
+        dead_letter_path = dead_letter or get_dead_letter_path(config.profile)
+        try:
+            write_dead_letters(dead_letter_path, errors_list, profile=config.profile)
+            console.print(f"[muted]Users that failed every attempt were added to {dead_letter_path}[/muted]")
+        except OSError as e:
+            print_warning(f"Could not write the dead-letter file: {e}")
 
     # Show results
     print_deployment_summary(success_count, failed_count, len(unmatched))
@@ -195,3 +548,150 @@ def run_deploy(folder_path: str, dry_run: bool = False):
 
     if success_count > 0:
         console.print("[bold green]Done! 🎉[/bold green]\n")
+
+    return summary
+
+
+def _print_deploy_estimate(
+    profile: Optional[str],
+    credentials,
+    matched: List[Dict],
+    directory_users: int,
+    directory_pages: Optional[int],
+    alias_patches: int,
+    workers: int,
+    rate: float,
+    probe: int,
+    all_aliases: bool
+):
+    """Print how long a deployment would take and the API quota it would use."""
+    samples = None
+    source = None
+    retry_rate = 0.0
+    identities = 1.0
+
+    if probe and matched:
+        emails = rollout_order([m['email'] for m in matched])
+        with create_spinner() as progress:
+            progress.add_task(f"Timing API calls for {min(probe, len(emails))} users (read-only)...", total=None)
+            probed = probe_latency(credentials, emails, probe)
+        if probed['samples']:
+            samples = probed['samples']
+            source = f"a probe of {len(samples)} users"
+            if all_aliases:
+                identities = probed['identities']
+        if probed['errors']:
+            print_warning(f"{probed['errors']} probe requests failed")
+    else:
+        history = load_latency_samples(profile)
+        if history:
+            samples = history['samples']
+            retry_rate = history.get('retry_rate', 0.0)
+            source = f"the last deployment ({history.get('users', len(samples))} users, {history['recorded'][:10]})"
+
+    estimate = estimate_deployment(
+        len(matched),
+        directory_users,
+        samples,
+        workers=workers,
+        rate=rate,
+        retry_rate=retry_rate,
+        identities_per_user=identities,
+        alias_patches=alias_patches,
+        directory_pages=directory_pages
+    )
+    print_estimate(estimate, workers=workers, rate=rate, source=source, quota_limit=GMAIL_PROJECT_UNITS_PER_MINUTE)
+
+
+def _describe_scope(org_unit: Optional[str], groups: Optional[Sequence[str]], query: Optional[str]) -> str:
+    """Describe a user scope for messages, e.g. "OU /Sales, group sales@..."."""
+    parts = []
+    if org_unit:
+        parts.append(f"OU {org_unit}")
+    if groups:
+        parts.append(f"group {', '.join(groups)}")
+    if query:
+        parts.append(f"query \"{query}\"")
+    return ', '.join(parts)
+
+
+def _deploy_profile(profile: str, folder_path, options: Dict) -> Dict:
+    """Deploy one profile in a worker process, without terminal output."""
+    console.quiet = True
+    try:
+        return run_deploy(folder_path, profile=profile, assume_yes=True, **options)
+    except Exception as e:
+        return {
+            'profile': profile,
+            'matched': 0,
+            'unmatched': 0,
+            'errors': 0,
+            'deployed': 0,
+            'failed': 0,
+            'error': str(e),
+        }
+
+
+def run_deploy_all_profiles(
+    folder_path: Union[str, Sequence[str]],
+    dry_run: bool = False,
+    profiles: Optional[Sequence[str]] = None,
+    profile_workers: Optional[int] = None,
+    assume_yes: bool = False,
+    **options
+) -> List[Dict]:
+    """
+    Deploy to every configured profile (tenant) in parallel.
+
+    Each profile runs in its own process with its own credentials, user
+    list and rate limiter, so a fleet-wide rollout takes about as long as
+    the slowest tenant. Use "{profile}" in folder paths to give each tenant
+    its own signatures, e.g. "signatures/{profile}/".
+
+    Args:
+        folder_path: Folder(s) or bundle(s), as for run_deploy
+        dry_run: If True, only report what would be deployed
+        profiles: Profiles to deploy (default: all saved profiles)
+        profile_workers: Tenants deployed at the same time (default: all
+            of them; never more than MAX_PARALLEL_PROFILES)
+        assume_yes: If True, deploy without asking for confirmation
+        **options: Other run_deploy arguments (fuzzy, manifest_path,
+            workers for the users deployed at the same time per tenant, ...)
+
+    Returns:
+        List of run_deploy summaries, one per profile
+    """
+    print_header("🚀 Hancock Fleet Deployment")
+
+    profiles = list(profiles or list_profiles())
+    if not profiles:
+        print_error("No profiles configured")
+        console.print("\n[cyan]Create one with:[/cyan]")
+        console.print("[bold]  hancock --profile <name> init[/bold]\n")
+        return []
+
+    console.print(f"[cyan]👥 Profiles: {', '.join(profiles)}[/cyan]\n")
+
+    if not dry_run and not assume_yes:
+        console.print(f"[bold]Deploy signatures to all {len(profiles)} tenants without further prompts?[/bold]")
+        console.print("[muted]Run with --dry-run first to review the matches per tenant.[/muted]\n")
+        if not ask_yes_no("Deploy signatures?", default=False):
+            console.print("\n[yellow]Deployment cancelled[/yellow]\n")
+            return []
+        console.print()
+
+    profile_workers = min(profile_workers or len(profiles), len(profiles), MAX_PARALLEL_PROFILES)
+    options['dry_run'] = dry_run
+
+    with create_spinner() as progress:
+        progress.add_task(f"Deploying to {len(profiles)} tenants...", total=None)
+        with ProcessPoolExecutor(max_workers=profile_workers) as executor:
+            summaries = list(executor.map(
+                _deploy_profile,
+                profiles,
+                [folder_path] * len(profiles),
+                [options] * len(profiles)
+            ))
+
+    print_profile_summary(summaries)
+    return summaries
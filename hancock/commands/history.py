@@ -0,0 +1,77 @@
+"""Show past deployments and flag the ones that got slower."""
+
+from typing import Dict, List, Optional
+from ..core.history import (
+    load_runs,
+    find_regressions,
+    slowest_phase,
+    get_history_path,
+    DEFAULT_WINDOW,
+    REGRESSION_THRESHOLD,
+)
+from ..ui import (
+    console,
+    print_header,
+    print_warning,
+    print_history,
+    format_duration,
+)
+
+# Runs shown by default
+DEFAULT_LIMIT = 20
+
+
+def run_history(
+    profile: Optional[str] = None,
+    all_profiles: bool = True,
+    limit: int = DEFAULT_LIMIT,
+    window: int = DEFAULT_WINDOW,
+    threshold: float = REGRESSION_THRESHOLD
+) -> List[Dict]:
+    """
+    Print recent deployments with their throughput against the rolling median.
+
+    Args:
+        profile: Only show runs of this profile
+        all_profiles: If True, show the runs of every profile
+        limit: Most recent runs to show
+        window: Earlier runs in each profile's rolling median
+        threshold: Slowdown flagged as a regression (0.25 is 25% slower)
+
+    Returns:
+        The runs shown, annotated by find_regressions
+    """
+    print_header("📈 Hancock History")
+
+    runs = find_regressions(load_runs(profile, all_profiles=all_profiles), window=window, threshold=threshold)
+    if not runs:
+        console.print("[yellow]No deployments recorded yet[/yellow]")
+        console.print(f"[muted]Every hancock deploy is recorded in {get_history_path()}[/muted]\n")
+        return []
+
+    shown = runs[-limit:]
+    print_history(shown, show_profile=len({r['profile'] for r in shown}) > 1)
+
+    regressed = [r for r in shown if r['regressed']]
+    if not regressed:
+        console.print(f"[green]✓ No run was more than {threshold:.0%} slower than the median of the {window} before it[/green]\n")
+        return shown
+
+    print_warning(f"{len(regressed)} runs were more than {threshold:.0%} slower than the median of the {window} before them")
+    for run in regressed:
+        reasons = []
+        phase = slowest_phase(run, runs, window=window)
+        if phase and phase['seconds'] > phase['baseline']:
+            reasons.append(
+                f"{phase['phase']} took {format_duration(phase['seconds'])} "
+                f"(usually ~{format_duration(phase['baseline'])})"
+            )
+        if run['previous_version'] and run['version'] != run['previous_version']:
+            reasons.append(f"first run after upgrading from {run['previous_version']} to {run['version']}")
+        top_error = next(iter(run['error_classes']), None)
+        if top_error:
+            reasons.append(f"{run['error_classes'][top_error]} × {top_error}")
+        console.print(f"  [yellow]• Run {run['id']}: {'; '.join(reasons) or 'no single phase stands out'}[/yellow]")
+    console.print()
+
+    return shown
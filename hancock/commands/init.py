@@ -26,6 +26,9 @@ def run_init():
     )
 
     config = get_config()
+    if config.profile:
+        print_info(f"Profile: {config.profile}")
+        console.print()
 
     # Check if already configured
     if config.is_configured():
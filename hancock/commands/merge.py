@@ -0,0 +1,58 @@
+"""Combine the results of sharded deployments."""
+
+from typing import Dict, List, Optional, Sequence
+from ..core.shard import read_results, check_shards, merge_results, write_results
+from ..ui import (
+    console,
+    print_header,
+    print_error,
+    print_warning,
+    print_profile_summary,
+)
+
+
+def run_merge_results(paths: Sequence[str], output: Optional[str] = None) -> List[Dict]:
+    """
+    Load results files from `hancock deploy --results` and print one summary.
+
+    Args:
+        paths: Results files, typically one per shard
+        output: Optional file to save the combined results to
+
+    Returns:
+        Combined summaries, one per profile
+    """
+    print_header("🧩 Hancock Results")
+
+    results = []
+    for path in paths:
+        try:
+            data = read_results(path)
+        except (OSError, ValueError) as e:
+            print_error(str(e))
+            return []
+        results.append(data)
+        label = f"shard {data['shard']}" if data.get('shard') else "unsharded"
+        console.print(f"[cyan]📄 {path}[/cyan] [muted]({label}, {data.get('created', 'unknown time')})[/muted]")
+    console.print()
+
+    for problem in check_shards(results):
+        print_warning(problem)
+
+    merged = merge_results(results)
+    print_profile_summary(merged)
+
+    failures = [f for summary in merged for f in summary['failures']]
+    if failures:
+        console.print("[bold red]Errors:[/bold red]")
+        for failure in failures[:5]:  # Show first 5
+            console.print(f"  [red]• {failure['email']}: {failure['error']}[/red]")
+        if len(failures) > 5:
+            console.print(f"  [muted]... and {len(failures) - 5} more errors[/muted]")
+        console.print()
+
+    if output:
+        write_results(output, merged)
+        console.print(f"[muted]Combined results saved to {output}[/muted]\n")
+
+    return merged
@@ -0,0 +1,69 @@
+"""Pack signature files into a single bundle."""
+
+import os
+from pathlib import Path
+from typing import Optional, Sequence
+from ..core.bundle import pack_bundle
+from ..core.scanner import iter_signature_files
+from ..ui import (
+    console,
+    print_header,
+    print_success,
+    print_error,
+    print_warning,
+)
+
+
+def run_pack(
+    folder_paths: Sequence[str],
+    output_path: str,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    recursive: bool = False
+):
+    """
+    Pack signature files from folders into a .hsig (or .zip) bundle.
+
+    Member names keep the path relative to their folder, so subfolders
+    survive the round trip.
+
+    Args:
+        folder_paths: Folders containing signature HTML files
+        output_path: Bundle file to write (.hsig or .zip)
+        include: File patterns to pick up (default: *.html, *.htm)
+        exclude: File or directory patterns to skip
+        recursive: If True, also pack subfolders
+    """
+    print_header("📦 Hancock Signature Bundle")
+
+    output = Path(output_path).expanduser().absolute()
+    files = []
+    names = set()
+
+    for folder_path in folder_paths:
+        folder = Path(folder_path).expanduser().absolute()
+        if not folder.is_dir():
+            print_error(f"Path is not a directory: {folder}")
+            return
+
+        for file_path in iter_signature_files(folder, include, exclude, recursive=recursive):
+            name = os.path.relpath(file_path, folder).replace(os.sep, '/')
+            if name in names:
+                print_warning(f"Skipping {file_path}: {name} is already in the bundle")
+                continue
+            names.add(name)
+            files.append((name, file_path))
+
+    if not files:
+        print_error("No signature files found")
+        return
+
+    try:
+        count = pack_bundle(files, output)
+    except (OSError, ValueError) as e:
+        print_error(f"Could not write bundle: {e}")
+        return
+
+    size_kb = output.stat().st_size / 1024
+    print_success(f"Packed {count} signatures into {output} ({size_kb:.1f}KB)")
+    console.print(f"\n[cyan]Deploy it with:[/cyan] [bold]hancock deploy {output.name}[/bold]\n")
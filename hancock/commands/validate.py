@@ -0,0 +1,181 @@
+"""Validate signature files offline, without the Google APIs."""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+from ..core.config import Config, get_config
+from ..core.matching import (
+    match_signatures_to_users,
+    find_alias_files,
+    validate_signature_files,
+    DEFAULT_MATCH_PRIORITY,
+    ALIAS_FILE_PATTERNS,
+)
+from ..core.scanner import iter_signature_files
+from ..core.bundle import is_bundle_path
+from ..core.snapshot import get_snapshot_path, load_user_snapshot, load_users_file
+from ..ui import (
+    console,
+    print_header,
+    print_error,
+    print_warning,
+    create_match_table,
+    print_summary,
+)
+
+# Rows shown in the results table
+MAX_TABLE_ROWS = 200
+
+
+def run_validate(
+    folder_path: Union[str, Sequence[str]],
+    fuzzy: bool = False,
+    match_priority: Optional[Sequence[str]] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    recursive: bool = False,
+    users_file: Optional[str] = None,
+    profile: Optional[str] = None
+) -> Dict:
+    """
+    Validate signature files and match them to users without the network.
+
+    Files get the same checks as a deployment (size, markup, images).
+    Users come from `users_file` (a CSV export or snapshot) or else from
+    the profile's user snapshot, saved by every unscoped hancock deploy.
+    Without either, files are only checked, not matched.
+
+    Args:
+        folder_path: Folder or bundle of signature files, or a list of them
+        fuzzy: If True, also match files to users by name similarity
+        match_priority: Matching strategies used to resolve conflicts, highest first
+        include: File patterns to pick up (default: *.html, *.htm)
+        exclude: File or directory patterns to skip
+        recursive: If True, also scan subfolders
+        users_file: CSV (e.g. the Admin console user export) or snapshot
+            (.json) of the users to match against
+        profile: Profile whose user snapshot is used (default: the active
+            profile)
+
+    Returns:
+        Summary dictionary with files, matched, unmatched and errors counts,
+        users (None when files were not matched) and error (why validation
+        could not run, or None)
+    """
+    summary = {
+        'files': 0,
+        'matched': 0,
+        'unmatched': 0,
+        'errors': 0,
+        'users': None,
+        'error': None,
+    }
+
+    def fail(message: str) -> Dict:
+        print_error(message)
+        summary['error'] = message
+        return summary
+
+    print_header("🔍 Hancock Signature Validation")
+
+    if isinstance(folder_path, (str, Path)):
+        folder_path = [folder_path]
+    roots = [Path(path).expanduser().absolute() for path in folder_path]
+    for root in roots:
+        if not root.exists():
+            return fail(f"Folder not found: {root}")
+        if not root.is_dir() and not is_bundle_path(root):
+            return fail(f"Path is not a directory: {root}")
+
+    # Users to match against, if any are available offline
+    users = None
+    if users_file:
+        try:
+            users = load_users_file(users_file)
+        except (OSError, ValueError) as e:
+            return fail(f"Could not load users: {e}")
+        console.print(f"[cyan]👥 {len(users)} users from {users_file}[/cyan]\n")
+    else:
+        config = Config(profile) if profile else get_config()
+        snapshot = get_snapshot_path(config.profile)
+        if snapshot.exists():
+            try:
+                users, saved = load_user_snapshot(snapshot)
+            except (OSError, ValueError) as e:
+                print_warning(f"Ignoring the cached user list: {e}")
+            else:
+                console.print(f"[cyan]👥 {len(users)} users cached by hancock deploy {_describe_age(saved)}[/cyan]\n")
+        if users is None:
+            console.print("[muted]No user list: files are checked but not matched to users.[/muted]")
+            console.print("[muted]Pass --users export.csv, or run hancock deploy once to cache the users.[/muted]\n")
+
+    try:
+        if users is None:
+            files = list(iter_signature_files(roots, include, exclude, recursive=recursive))
+            matched, unmatched, errors, checked = [], [], [], []
+            for file_path, (is_valid, error_msg, info) in zip(files, validate_signature_files(files)):
+                if is_valid:
+                    checked.append({'filename': file_path.name, 'path': str(file_path), 'info': info})
+                else:
+                    errors.append({'filename': file_path.name, 'path': str(file_path), 'error': error_msg})
+            if not files:
+                return fail(f"No HTML files found in {', '.join(str(r) for r in roots)}")
+        else:
+            alias_files, alias_errors = find_alias_files(roots, exclude=exclude, recursive=recursive)
+            matched, unmatched, errors = match_signatures_to_users(
+                roots,
+                users,
+                fuzzy=fuzzy,
+                priority=match_priority or DEFAULT_MATCH_PRIORITY,
+                include=include,
+                exclude=list(exclude or ()) + list(ALIAS_FILE_PATTERNS),
+                recursive=recursive
+            )
+            errors.extend(alias_errors)
+            matched += list(alias_files.values())
+            checked = matched
+            if not (matched or unmatched or errors):
+                return fail(f"No HTML files found in {', '.join(str(r) for r in roots)}")
+    except ValueError as e:
+        return fail(str(e))
+    except Exception as e:
+        return fail(f"Error validating signatures: {e}")
+
+    summary.update(
+        files=len(checked) + len(unmatched) + len(errors),
+        matched=len(matched),
+        unmatched=len(unmatched),
+        errors=len(errors),
+        users=len(users) if users is not None else None,
+    )
+    console.print(f"[cyan]Found {summary['files']} HTML files[/cyan]\n")
+
+    if users is not None:
+        console.print(create_match_table(matched, unmatched, errors, limit=MAX_TABLE_ROWS))
+    elif errors:
+        console.print(create_match_table([], [], errors, limit=MAX_TABLE_ROWS))
+    print_summary(len(checked), len(unmatched), len(errors))
+
+    # Show markup problems found while linting
+    lint_warnings = [m for m in checked if m.get('info', {}).get('warnings')]
+    if lint_warnings:
+        console.print(f"[yellow]⚠ Warning: {len(lint_warnings)} signatures have markup problems[/yellow]")
+        for match in lint_warnings[:5]:  # Show first 5
+            console.print(f"  [muted]• {match['filename']}: {'; '.join(match['info']['warnings'][:3])}[/muted]")
+        if len(lint_warnings) > 5:
+            console.print(f"  [muted]... and {len(lint_warnings) - 5} more[/muted]")
+        console.print()
+
+    return summary
+
+
+def _describe_age(saved: Optional[str]) -> str:
+    """Describe when a snapshot was saved, e.g. "3 days ago"."""
+    if not saved:
+        return "at an unknown time"
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(saved)
+    if age.days >= 1:
+        return f"{age.days} days ago"
+    if age.seconds >= 3600:
+        return f"{age.seconds // 3600} hours ago"
+    return "within the last hour"
@@ -0,0 +1,259 @@
+"""Watch signature folders and deploy changes as they happen."""
+
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+from ..core.config import get_config
+from ..core.auth import authenticate, get_service, GROUP_SCOPES
+from ..core.directory import load_user_records, DEFAULT_CRAWL_WORKERS
+from ..core.matching import (
+    build_match_index,
+    match_files_to_users,
+    ALIAS_FILE_PATTERNS,
+    DEFAULT_MATCH_PRIORITY,
+)
+from ..core.scanner import read_signature
+from ..core.images import ImageExtractor
+from ..core.minify import minify_html
+from ..core.transforms import chain_transforms
+from ..core.gmail import deploy_signatures_batch
+from ..core.ratelimit import RateLimiter
+from ..core.watch import (
+    FolderWatcher,
+    DebounceQueue,
+    ServiceCache,
+    users_for_files,
+    files_for_users,
+    DEFAULT_DEBOUNCE,
+    DEFAULT_POLL_INTERVAL,
+)
+from ..ui import (
+    console,
+    print_header,
+    print_success,
+    print_error,
+    print_section,
+    create_spinner,
+)
+
+# Seconds between refreshes of the cached user list
+USER_REFRESH_INTERVAL = 15 * 60
+
+
+def _log(message: str, style: str = ""):
+    """Print a timestamped line."""
+    stamp = datetime.now().strftime("%H:%M:%S")
+    if style:
+        console.print(f"[muted]{stamp}[/muted] [{style}]{message}[/{style}]")
+    else:
+        console.print(f"[muted]{stamp}[/muted] {message}")
+
+
+def run_watch(
+    folder_path: Union[str, Sequence[str]],
+    match_priority: Optional[Sequence[str]] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    recursive: bool = False,
+    org_unit: Optional[str] = None,
+    groups: Optional[Sequence[str]] = None,
+    query: Optional[str] = None,
+    image_base_url: Optional[str] = None,
+    image_dir: Optional[str] = None,
+    minify: bool = False,
+    all_aliases: bool = False,
+    debounce: float = DEFAULT_DEBOUNCE,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    directory_workers: int = DEFAULT_CRAWL_WORKERS
+):
+    """
+    Watch folders and deploy the signatures of users whose files change.
+
+    Credentials, Gmail clients and the user list (with its match index) are
+    set up once and kept warm; the user list is refreshed every
+    USER_REFRESH_INTERVAL seconds. Each change only rematches the files that
+    could belong to the affected users (see files_for_users), validates them
+    and deploys those users, instead of running a full deployment.
+
+    Args:
+        folder_path: Folder, or list of folders, containing signature HTML files
+        match_priority: Matching strategies used to resolve conflicts, highest first
+        include: File patterns to pick up (default: *.html, *.htm)
+        exclude: File or directory patterns to skip
+        recursive: If True, also watch subfolders
+        org_unit: Only deploy to users in this organizational unit
+        groups: Only deploy to members of these groups
+        query: Only deploy to users matching this Directory API query
+        image_base_url: If set, move base64 images out of the signatures and
+            link them from this URL instead
+        image_dir: Folder to write the extracted images to for hosting
+        minify: If True, minify signature HTML before validation and upload
+        all_aliases: If True, update every sendAs identity of each user
+        debounce: Seconds a file must be unchanged before it is deployed
+        interval: Seconds between folder scans
+        directory_workers: Parallel Directory requests when loading users
+            (see crawl_users)
+    """
+    print_header("👀 Hancock Watch", "Deploys signatures as their files change. Press Ctrl+C to stop.")
+
+    config = get_config()
+    if not config.is_configured():
+        print_error("Hancock is not configured yet")
+        console.print("\n[cyan]Run this command first:[/cyan]")
+        console.print("[bold]  hancock init[/bold]\n")
+        return
+
+    if isinstance(folder_path, (str, Path)):
+        folder_path = [folder_path]
+
+    roots = []
+    for path in folder_path:
+        root = Path(path).expanduser().absolute()
+        if not root.is_dir():
+            print_error(f"Folder not found: {root}")
+            return
+        roots.append(root)
+        console.print(f"[cyan]📁 Watching: {root}[/cyan]")
+    console.print()
+
+    # Authenticate once for the whole session
+    try:
+        credentials, admin_email = authenticate(
+            config.get('service_account_file'),
+            config.get('admin_email'),
+            extra_scopes=GROUP_SCOPES if groups else None
+        )
+        directory_service = get_service('admin', 'directory_v1', credentials, user_email=admin_email)
+    except Exception as e:
+        print_error(f"Authentication failed: {e}")
+        return
+
+    priority = match_priority or DEFAULT_MATCH_PRIORITY
+    transform = chain_transforms(
+        ImageExtractor(image_base_url, image_dir) if image_base_url else None,
+        minify_html if minify else None,
+    )
+    rate_limiter = RateLimiter()
+    service_cache = ServiceCache()
+
+    def load_users():
+        users = load_user_records(
+            directory_service,
+            query=query,
+            org_unit=org_unit,
+            groups=groups,
+            service_factory=lambda: get_service('admin', 'directory_v1', credentials, user_email=admin_email),
+            workers=directory_workers
+        )
+        return users, build_match_index(users, priority)
+
+    try:
+        with create_spinner() as progress:
+            progress.add_task("Loading users from your workspace...", total=None)
+            users, index = load_users()
+    except Exception as e:
+        print_error(f"Failed to fetch users: {e}")
+        return
+    users_loaded_at = time.monotonic()
+    print_success(f"Found {len(users)} users")
+
+    # Per-address files are only applied by a full deploy
+    watcher = FolderWatcher(
+        roots,
+        include=include,
+        exclude=list(exclude or ()) + list(ALIAS_FILE_PATTERNS),
+        recursive=recursive
+    )
+    queue = DebounceQueue(debounce)
+    print_success(f"Watching {len(watcher.files)} signature files")
+    print_section("📡 Waiting for changes")
+
+    try:
+        while True:
+            time.sleep(interval)
+
+            for path in watcher.poll():
+                queue.add(path)
+
+            changed = queue.pop_ready()
+            if not changed:
+                continue
+
+            if time.monotonic() - users_loaded_at > USER_REFRESH_INTERVAL:
+                try:
+                    users, index = load_users()
+                    users_loaded_at = time.monotonic()
+                except Exception as e:
+                    _log(f"Could not refresh users, keeping the cached list: {e}", "warning")
+
+            # A file removed mid-deploy or an API error must not stop the watcher
+            try:
+                _deploy_changes(
+                    changed, watcher.files, users, index, priority, transform,
+                    credentials, rate_limiter, service_cache, all_aliases
+                )
+            except Exception as e:
+                print_error(f"Could not deploy {len(changed)} changed files: {e}")
+
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Stopped watching[/yellow]\n")
+
+
+def _deploy_changes(
+    changed: List[str],
+    files: List[Path],
+    users: List[Dict],
+    index: Dict,
+    priority: Sequence[str],
+    transform,
+    credentials,
+    rate_limiter: RateLimiter,
+    service_cache: ServiceCache,
+    all_aliases: bool
+):
+    """Rematch, validate and deploy the users affected by changed files."""
+    for path in changed:
+        _log(f"Changed: {Path(path).name}")
+
+    affected = users_for_files(changed, index)
+    if not affected:
+        _log("No matching users, nothing to deploy", "muted")
+        return
+
+    candidates = files_for_users(files, affected, index)
+    matched, _, errors = match_files_to_users(
+        candidates, users, priority=priority, transform=transform, workers=1, index=index
+    )
+
+    for error in errors:
+        _log(f"✗ {error['filename']}: {error['error']}", "error")
+
+    signatures = {}
+    for match in matched:
+        if match['email'] not in affected:
+            continue
+        html = read_signature(match['path'])
+        signatures[match['email']] = transform(html) if transform else html
+
+    for email in sorted(affected - set(signatures)):
+        if not any(e.get('conflict') and email in e['conflict'] for e in errors):
+            _log(f"⚠ No valid signature file for {email}, leaving it unchanged", "warning")
+
+    if not signatures:
+        return
+
+    def progress_callback(email, success, error_msg):
+        if success:
+            _log(f"✓ Deployed {email}", "success")
+        else:
+            _log(f"✗ {email}: {error_msg}", "error")
+
+    deploy_signatures_batch(
+        credentials,
+        signatures,
+        progress_callback=progress_callback,
+        rate_limiter=rate_limiter,
+        all_aliases=all_aliases,
+        service_cache=service_cache
+    )
@@ -0,0 +1,423 @@
+"""Asyncio transport for the Gmail endpoints used by deploy.
+
+The discovery clients built by get_service are synchronous: every in-flight
+request holds a thread and each user needs its own client. This module
+talks to the few endpoints a deployment needs (sendAs.list and patch)
+directly over aiohttp, minting delegated access tokens itself, so hundreds
+of users can be deployed concurrently from a single thread.
+
+aiohttp is optional; install it with ``pip install "hancock-cli[async]"``.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import time
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import quote
+
+from google.auth import jwt
+
+from .gmail import plan_send_as_updates
+from .ratelimit import RateLimiter
+from .tracing import span, current_span
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Users deployed at the same time by hancock deploy --async
+DEFAULT_CONCURRENCY = 100
+
+# OAuth token endpoint of the credentials' universe domain (googleapis.com
+# unless the key file names another), for credentials that don't expose one
+TOKEN_URI = 'https://oauth2.{universe_domain}/token'
+
+GMAIL_USERS_URL = 'https://gmail.googleapis.com/gmail/v1/users'
+
+# Lifetime requested for delegated tokens, and how long before expiry they
+# are replaced (seconds)
+TOKEN_LIFETIME = 3600
+TOKEN_REFRESH_MARGIN = 60
+
+# Seconds before a single HTTP request is abandoned
+REQUEST_TIMEOUT = 60
+
+
+def is_available() -> bool:
+    """Check whether the async transport can be used (aiohttp is installed)."""
+    return aiohttp is not None
+
+
+class AsyncHttpError(Exception):
+    """An error response from a Google API."""
+
+    def __init__(self, status: int, content: str):
+        super().__init__(f"HTTP {status}: {content}")
+        self.status = status
+        self.content = content
+
+
+class AsyncGoogleClient:
+    """
+    Minimal asyncio client for the Gmail API.
+
+    Requests are made as the given user (domain-wide delegation). Each
+    user's access token is minted on first use by signing a JWT grant with
+    the service account key and cached until shortly before it expires.
+    """
+
+    def __init__(self, credentials, session):
+        """
+        Args:
+            credentials: Base service account credentials (from authenticate)
+            session: aiohttp.ClientSession used for every request
+        """
+        self.credentials = credentials
+        self.session = session
+        self._tokens = {}  # user -> (access token, expiry)
+        self._locks = {}  # user -> asyncio.Lock, so a token is minted once
+
+    async def _mint_token(self, user_email: str) -> Tuple[str, float]:
+        """Exchange a signed JWT grant for a delegated access token."""
+        token_uri = getattr(self.credentials, 'token_uri', None) or TOKEN_URI.format(
+            universe_domain=getattr(self.credentials, 'universe_domain', None) or 'googleapis.com'
+        )
+        now = int(time.time())
+        assertion = jwt.encode(self.credentials.signer, {
+            'iss': self.credentials.service_account_email,
+            'sub': user_email,
+            'aud': token_uri,
+            'scope': ' '.join(self.credentials.scopes or []),
+            'iat': now,
+            'exp': now + TOKEN_LIFETIME,
+        })
+
+        with span('token.mint'):
+            async with self.session.post(token_uri, data={
+                'grant_type': 'urn:ietf:params:oauth:grant-type:jwt-bearer',
+                'assertion': assertion.decode('utf-8'),
+            }) as response:
+                text = await response.text()
+                if response.status >= 400:
+                    raise AsyncHttpError(response.status, text)
+
+        data = json.loads(text)
+        expiry = time.monotonic() + int(data.get('expires_in', TOKEN_LIFETIME))
+        return data['access_token'], expiry
+
+    async def get_token(self, user_email: str) -> str:
+        """Get a valid access token for a user, minting one if needed."""
+        lock = self._locks.setdefault(user_email, asyncio.Lock())
+        async with lock:
+            token, expiry = self._tokens.get(user_email, (None, 0.0))
+            if token is None or time.monotonic() > expiry - TOKEN_REFRESH_MARGIN:
+                token, expiry = await self._mint_token(user_email)
+                self._tokens[user_email] = (token, expiry)
+            return token
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        user_email: str,
+        params: Optional[Dict] = None,
+        body: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Make an API request as a user.
+
+        Args:
+            method: HTTP method
+            url: Endpoint URL
+            user_email: User to act as
+            params: Query parameters
+            body: JSON request body
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            AsyncHttpError: If the API returns an error
+        """
+        for attempt in range(2):
+            token = await self.get_token(user_email)
+            async with self.session.request(
+                method,
+                url,
+                params=params,
+                json=body,
+                headers={'Authorization': f'Bearer {token}'}
+            ) as response:
+                text = await response.text()
+                # A revoked or expired token: mint a new one and try once more
+                if response.status == 401 and attempt == 0:
+                    self._tokens.pop(user_email, None)
+                    continue
+                if response.status >= 400:
+                    raise AsyncHttpError(response.status, text)
+                return json.loads(text) if text else {}
+
+    def _send_as_url(self, user_email: str, send_as_email: Optional[str] = None) -> str:
+        url = f"{GMAIL_USERS_URL}/{quote(user_email, safe='@')}/settings/sendAs"
+        if send_as_email:
+            url += '/' + quote(send_as_email, safe='@')
+        return url
+
+    async def list_send_as(self, user_email: str) -> List[Dict]:
+        """List a user's sendAs identities (sendAs.list)."""
+        with span('sendAs.list'):
+            response = await self.request('GET', self._send_as_url(user_email), user_email)
+        return response.get('sendAs', [])
+
+    async def patch_send_as(self, user_email: str, send_as_email: str, signature_html: str) -> Dict:
+        """Set the signature of a sendAs identity (sendAs.patch)."""
+        with span('sendAs.patch'):
+            return await self.request(
+                'PATCH',
+                self._send_as_url(user_email, send_as_email),
+                user_email,
+                body={'signature': signature_html}
+            )
+
+
+def _format_error(error: Exception) -> str:
+    """Describe a failed request the way deploy_signature does."""
+    if isinstance(error, asyncio.TimeoutError):
+        return "Request timed out"
+    return str(error) or type(error).__name__
+
+
+async def deploy_signature_async(
+    client: AsyncGoogleClient,
+    user_email: str,
+    signature_html: str,
+    all_aliases: bool = False,
+    alias_signatures: Optional[Dict[str, str]] = None,
+    throttle: Optional[Callable[[int], Awaitable]] = None
+) -> Tuple[bool, Optional[str]]:
+    """
+    Deploy signature to a single user's Gmail account (see deploy_signature).
+
+    Several sendAs updates for the user are sent concurrently.
+
+    Args:
+        client: AsyncGoogleClient
+        user_email: User's email address
+        signature_html: HTML signature content
+        all_aliases: If True, update every sendAs identity, not just the primary
+        alias_signatures: Signatures for specific sendAs addresses
+            (lowercased email -> HTML)
+        throttle: Optional coroutine function awaited with the number of
+            API requests about to be made (e.g. RateLimiter.acquire_async)
+
+    Returns:
+        Tuple of (success: bool, error_message: Optional[str])
+    """
+    try:
+        if throttle:
+            await throttle(1)
+        send_as_entries = await client.list_send_as(user_email)
+        if not send_as_entries:
+            return False, "No sendAs configuration found"
+
+        updates = plan_send_as_updates(
+            send_as_entries,
+            signature_html,
+            all_aliases=all_aliases,
+            alias_signatures=alias_signatures
+        )
+
+        if throttle:
+            await throttle(len(updates))
+        results = await asyncio.gather(
+            *(client.patch_send_as(user_email, address, html) for address, html in updates.items()),
+            return_exceptions=True
+        )
+    except Exception as e:
+        return False, _format_error(e)
+
+    failures = [
+        (address, result) for address, result in zip(updates, results)
+        if isinstance(result, BaseException)
+    ]
+    if not failures:
+        return True, None
+    if len(updates) == 1:
+        return False, _format_error(failures[0][1])
+    return False, '; '.join(f"{address}: {_format_error(error)}" for address, error in failures)
+
+
+def deploy_signatures_async(
+    credentials,
+    signatures: Mapping[str, str],
+    retry_attempts: int = 3,
+    retry_delay: int = 2,
+    progress_callback: Optional[Callable[[str, bool, Optional[str]], None]] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    all_aliases: bool = False,
+    alias_signatures: Optional[Dict[str, str]] = None,
+    workers: int = DEFAULT_CONCURRENCY,
+    stats: Optional[Dict] = None
+) -> Tuple[int, int, List[Dict]]:
+    """
+    Deploy signatures to multiple users on an asyncio event loop.
+
+    A drop-in replacement for deploy_signatures_batch (same arguments and
+    results, and progress_callback is called from the calling thread), but
+    each of the `workers` is a coroutine rather than a thread with its own
+    discovery client, so `workers` can be in the hundreds. As with threads,
+    a failed attempt goes into a retry queue instead of holding its worker.
+
+    Args:
+        credentials: Base service account credentials (will impersonate each user)
+        signatures: Mapping of email -> signature HTML, read when the user
+            is about to be deployed (so a SignatureStore loads files lazily)
+        retry_attempts: Number of retry attempts on failure
+        retry_delay: Delay between retries (seconds)
+        progress_callback: Optional callback function(email, success, error_msg)
+        rate_limiter: Limiter shared by all requests to this tenant
+            (default: a new RateLimiter at DEFAULT_RATE)
+        all_aliases: If True, update every sendAs identity of each user
+        alias_signatures: Signatures for specific sendAs addresses
+            (lowercased email -> HTML), applied to whichever user owns them
+        workers: Number of users deployed at the same time
+        stats: Optional dictionary that receives 'latencies' (seconds per
+            user spent on attempts, not waiting for retries or the rate
+            limiter), 'limiter_wait' (total seconds spent waiting for the
+            rate limiter) and 'retries' (total retry count)
+
+    Returns:
+        Tuple of (success_count, failed_count, errors_list), where errors
+        are {email, error, attempts} for users that used up their attempts
+
+    Raises:
+        RuntimeError: If aiohttp is not installed
+    """
+    if aiohttp is None:
+        raise RuntimeError('The async transport needs aiohttp: pip install "hancock-cli[async]"')
+
+    if rate_limiter is None:
+        rate_limiter = RateLimiter()
+    if stats is not None:
+        stats.setdefault('latencies', [])
+        stats.setdefault('limiter_wait', 0.0)
+        stats.setdefault('retries', 0)
+
+    # Spans opened inside the event loop nest under the caller's span
+    parent_span = current_span()
+
+    async def deploy_all() -> Tuple[int, int, List[Dict]]:
+        success_count = 0
+        failed_count = 0
+        errors = []
+        loop = asyncio.get_running_loop()
+
+        # Attempts made and seconds spent so far, per user in flight
+        attempts = {}
+        elapsed = {}
+
+        # Users waiting to be retried, as (due time, order, email)
+        retry_queue = []
+        order = itertools.count()
+        fresh = iter(signatures)
+
+        connector = aiohttp.TCPConnector(limit=workers)
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            client = AsyncGoogleClient(credentials, session)
+
+            async def attempt_user(user_email: str, signature_html: str, number: int) -> Tuple[bool, Optional[str], float]:
+                with span('deploy_user', parent=parent_span, user=user_email, attempt=number) as user_span:
+                    started = time.monotonic()
+
+                    # Every API request takes a token; time spent waiting
+                    # for them is left out of the latency
+                    waited = 0.0
+
+                    async def throttle(requests: int):
+                        nonlocal waited
+                        with span('rate_limit.wait', requests=requests):
+                            waited += await rate_limiter.acquire_async(requests)
+
+                    with span('attempt', number=number) as attempt_span:
+                        success, error_msg = await deploy_signature_async(
+                            client,
+                            user_email,
+                            signature_html,
+                            all_aliases=all_aliases,
+                            alias_signatures=alias_signatures,
+                            throttle=throttle
+                        )
+                        if error_msg:
+                            attempt_span.set('error', error_msg)
+                    if stats is not None:
+                        stats['limiter_wait'] += waited
+                    user_span.set('success', success)
+                    return success, error_msg, time.monotonic() - started - waited
+
+            def record(user_email: str, success: bool, error_msg: Optional[str]):
+                nonlocal success_count, failed_count
+
+                latency = elapsed.pop(user_email, 0.0)
+                user_attempts = attempts.pop(user_email, 0)
+
+                if success:
+                    success_count += 1
+                else:
+                    failed_count += 1
+                    errors.append({
+                        'email': user_email,
+                        'error': error_msg,
+                        'attempts': user_attempts
+                    })
+
+                if stats is not None:
+                    stats['latencies'].append(latency)
+                    stats['retries'] += max(0, user_attempts - 1)
+
+                if progress_callback:
+                    progress_callback(user_email, success, error_msg)
+
+            async def worker():
+                # Take due retries first, then new users; a worker only
+                # stops once there is neither (whoever queues a retry is
+                # still running and picks it up)
+                while True:
+                    if retry_queue and retry_queue[0][0] <= time.monotonic():
+                        user_email = heapq.heappop(retry_queue)[2]
+                    else:
+                        user_email = next(fresh, None)
+                        if user_email is None:
+                            if not retry_queue:
+                                return
+                            with span('retry.wait', parent=parent_span):
+                                await asyncio.sleep(max(0.0, retry_queue[0][0] - time.monotonic()))
+                            continue
+
+                    try:
+                        # A SignatureStore reads from disk: keep it off the event loop
+                        signature_html = await loop.run_in_executor(None, signatures.__getitem__, user_email)
+                    except Exception as e:
+                        record(user_email, False, f"Could not read signature: {e}")
+                        continue
+
+                    attempts[user_email] = attempts.get(user_email, 0) + 1
+                    success, error_msg, latency = await attempt_user(user_email, signature_html, attempts[user_email])
+                    elapsed[user_email] = elapsed.get(user_email, 0.0) + latency
+
+                    if success or attempts[user_email] >= retry_attempts:
+                        record(user_email, success, error_msg)
+                    else:
+                        due = time.monotonic() + retry_delay
+                        heapq.heappush(retry_queue, (due, next(order), user_email))
+
+            # A fixed set of workers rather than a coroutine per user, so
+            # memory doesn't grow with the size of the tenant
+            await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+
+        return success_count, failed_count, errors
+
+    return asyncio.run(deploy_all())
@@ -4,7 +4,8 @@ import os
 from pathlib import Path
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Sequence
+from .tracing import span, is_enabled as tracing_enabled
 
 # Required scopes for Hancock
 SCOPES = [
@@ -12,14 +13,25 @@ SCOPES = [
     'https://www.googleapis.com/auth/gmail.settings.basic'
 ]
 
+# Extra scope for group-scoped deployments (--group). Only requested when
+# used, since delegation fails if any requested scope is not authorized.
+GROUP_SCOPES = [
+    'https://www.googleapis.com/auth/admin.directory.group.member.readonly'
+]
+
 
-def authenticate(service_account_file: str, admin_email: str) -> Tuple[object, str]:
+def authenticate(
+    service_account_file: str,
+    admin_email: str,
+    extra_scopes: Optional[Sequence[str]] = None
+) -> Tuple[object, str]:
     """
     Authenticate with Google Workspace using Service Account with Domain-Wide Delegation.
 
     Args:
         service_account_file: Path to service account JSON key file
         admin_email: Admin email for domain-wide delegation
+        extra_scopes: Scopes needed in addition to SCOPES (e.g. GROUP_SCOPES)
 
     Returns:
         Tuple of (base_credentials, admin_email) - credentials WITHOUT impersonation yet
@@ -37,10 +49,11 @@ def authenticate(service_account_file: str, admin_email: str) -> Tuple[object, s
         )
 
     try:
-        credentials = service_account.Credentials.from_service_account_file(
-            str(service_account_path),
-            scopes=SCOPES
-        )
+        with span('authenticate'):
+            credentials = service_account.Credentials.from_service_account_file(
+                str(service_account_path),
+                scopes=list(SCOPES) + list(extra_scopes or [])
+            )
 
         # Return base credentials (no impersonation yet) and admin_email
         return credentials, admin_email
@@ -48,6 +61,22 @@ def authenticate(service_account_file: str, admin_email: str) -> Tuple[object, s
         raise ValueError(f"Failed to load credentials: {str(e)}")
 
 
+def _trace_token_refresh(credentials):
+    """
+    Record access token minting as 'token.refresh' spans.
+
+    Tokens are minted lazily, on a client's first request, so without this
+    their cost would be hidden inside whichever API call came first.
+    """
+    refresh = credentials.refresh
+
+    def traced_refresh(request):
+        with span('token.refresh'):
+            return refresh(request)
+
+    credentials.refresh = traced_refresh
+
+
 def get_service(api_name: str, api_version: str, credentials, user_email: Optional[str] = None) -> object:
     """
     Build and return a Google API service client.
@@ -61,12 +90,12 @@ def get_service(api_name: str, api_version: str, credentials, user_email: Option
     Returns:
         API service client
     """
-    if user_email:
-        # Impersonate the specified user
-        delegated_credentials = credentials.with_subject(user_email)
-        return build(api_name, api_version, credentials=delegated_credentials, cache_discovery=False)
-    else:
-        # Use credentials without impersonation
+    with span('get_service', api=f"{api_name}/{api_version}"):
+        if user_email:
+            # Impersonate the specified user
+            credentials = credentials.with_subject(user_email)
+        if tracing_enabled():
+            _trace_token_refresh(credentials)
         return build(api_name, api_version, credentials=credentials, cache_discovery=False)
 
 
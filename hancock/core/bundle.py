@@ -0,0 +1,323 @@
+"""Signature bundles: many signature files packed into one archive.
+
+Two formats are supported:
+
+- ``.hsig`` - Hancock's own pack format. A small header and an offset
+  table are followed by the raw file contents::
+
+      b"HSIG" | version (u8) | 3 reserved bytes | entry count (u32)
+      entry count x [name length (u16) | name (utf-8) | offset (u64) | length (u32)]
+      file contents...
+
+  All integers are little-endian; offsets are absolute.
+
+- ``.zip`` - regular zip archives. Stored (uncompressed) entries are read
+  straight from the mapped file; compressed entries are inflated on read.
+
+Bundles are memory-mapped, so reading a member returns a memoryview slice
+of the mapping instead of a copy, and a whole bundle costs one file handle.
+Members are addressed as ``<bundle path>::<member name>`` wherever a
+signature path is expected (see hancock.core.scanner.read_signature_bytes).
+"""
+
+import mmap
+import struct
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+# Separator between a bundle path and a member name
+BUNDLE_SEPARATOR = '::'
+
+# File suffixes recognized as bundles
+BUNDLE_SUFFIXES = ('.hsig', '.zip')
+
+HSIG_MAGIC = b'HSIG'
+HSIG_VERSION = 1
+_HEADER = struct.Struct('<4sB3xI')
+_ENTRY = struct.Struct('<QI')
+_NAME_LENGTH = struct.Struct('<H')
+
+# Size of a zip local file header before its variable-length fields
+_ZIP_LOCAL_HEADER = struct.Struct('<4s22xHH')
+
+
+class BundleMember(NamedTuple):
+    """A signature file inside a bundle, usable where a file Path is expected."""
+
+    bundle: str
+    member: str
+
+    @property
+    def name(self) -> str:
+        """File name without any folders, used for matching."""
+        return self.member.rsplit('/', 1)[-1]
+
+    def exists(self) -> bool:
+        """Check the member is present in its bundle."""
+        return self.member in open_bundle(self.bundle)
+
+    def __str__(self) -> str:
+        return f"{self.bundle}{BUNDLE_SEPARATOR}{self.member}"
+
+
+class SignatureBundle:
+    """Read-only, memory-mapped view of a signature bundle."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"Bundle is empty: {self.path}")
+
+        self._view = memoryview(self._mmap)
+        self._zip = None
+
+        try:
+            if self.path.lower().endswith('.zip'):
+                self._entries = self._read_zip_index()
+            else:
+                self._entries = self._read_hsig_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_hsig_index(self) -> Dict[str, Tuple[int, int]]:
+        """Parse the .hsig offset table."""
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"Not a Hancock bundle: {self.path}")
+
+        magic, version, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != HSIG_MAGIC:
+            raise ValueError(f"Not a Hancock bundle: {self.path}")
+        if version != HSIG_VERSION:
+            raise ValueError(f"Unsupported bundle version {version}: {self.path}")
+
+        entries = {}
+        pos = _HEADER.size
+        try:
+            for _ in range(count):
+                (name_length,) = _NAME_LENGTH.unpack_from(self._mmap, pos)
+                pos += _NAME_LENGTH.size
+                name = bytes(self._view[pos:pos + name_length]).decode('utf-8')
+                pos += name_length
+                offset, length = _ENTRY.unpack_from(self._mmap, pos)
+                pos += _ENTRY.size
+                if offset + length > len(self._mmap):
+                    raise ValueError(f"Bundle is truncated: {self.path}")
+                entries[name] = (offset, length)
+        except struct.error:
+            # The offset table runs past the end of the file
+            raise ValueError(f"Bundle is truncated: {self.path}")
+        except UnicodeDecodeError:
+            raise ValueError(f"Bundle has an invalid member name: {self.path}")
+        return entries
+
+    def _read_zip_index(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Index a zip archive.
+
+        Stored entries map to (offset, length) of their data in the file;
+        compressed entries map to (-1, size) and are inflated on read.
+        """
+        self._zip = zipfile.ZipFile(self._file)
+        entries = {}
+        for info in self._zip.infolist():
+            if info.is_dir():
+                continue
+            if info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1:
+                _, name_length, extra_length = _ZIP_LOCAL_HEADER.unpack_from(self._mmap, info.header_offset)
+                offset = info.header_offset + _ZIP_LOCAL_HEADER.size + name_length + extra_length
+                entries[info.filename] = (offset, info.file_size)
+            else:
+                entries[info.filename] = (-1, info.file_size)
+        return entries
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def names(self) -> List[str]:
+        """Member names in bundle order."""
+        return list(self._entries)
+
+    def members(self) -> Iterator[BundleMember]:
+        """Iterate members as BundleMember references."""
+        for name in self._entries:
+            yield BundleMember(self.path, name)
+
+    def size(self, name: str) -> int:
+        """Size of a member in bytes."""
+        return self._entries[name][1]
+
+    def view(self, name: str) -> memoryview:
+        """
+        Get a member's contents.
+
+        Returns a zero-copy slice of the mapping for .hsig and stored zip
+        members; compressed zip members are inflated into a new buffer.
+
+        Raises:
+            KeyError: If the member does not exist
+        """
+        offset, length = self._entries[name]
+        if offset < 0:
+            return memoryview(self._zip.read(name))
+        return self._view[offset:offset + length]
+
+    def close(self):
+        """Release the mapping and file handle."""
+        if self._zip is not None:
+            self._zip.close()
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Member views are still in use; the mapping goes with them
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Bundles opened through open_bundle, by path, with the (mtime, size) of
+# the file they were opened from
+_open_bundles = {}
+
+
+def is_bundle_path(path: Union[str, Path]) -> bool:
+    """Check whether a path points to a bundle file."""
+    path = Path(path)
+    return path.suffix.lower() in BUNDLE_SUFFIXES and path.is_file()
+
+
+def open_bundle(path: Union[str, Path]) -> SignatureBundle:
+    """
+    Open a bundle, reusing an already opened mapping of the same file.
+
+    A bundle rebuilt since it was opened (e.g. by hancock pack while
+    hancock watch runs) is opened again. The old mapping is not closed,
+    as views of its members may still be in use; it goes when they do.
+
+    Args:
+        path: Path to a .hsig or .zip bundle
+
+    Returns:
+        SignatureBundle
+    """
+    key = str(Path(path).expanduser().absolute())
+    stat = Path(key).stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _open_bundles.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, SignatureBundle(key))
+        _open_bundles[key] = cached
+    return cached[1]
+
+
+def split_bundle_ref(path: Union[str, BundleMember]) -> Optional[Tuple[str, str]]:
+    """
+    Split a "<bundle>::<member>" reference.
+
+    Returns:
+        Tuple of (bundle_path, member) or None for plain file paths
+    """
+    if isinstance(path, BundleMember):
+        return path.bundle, path.member
+    bundle_path, sep, member = str(path).partition(BUNDLE_SEPARATOR)
+    if sep and Path(bundle_path).suffix.lower() in BUNDLE_SUFFIXES:
+        return bundle_path, member
+    return None
+
+
+def read_bundle_member(path: Union[str, BundleMember]) -> memoryview:
+    """
+    Read a bundle member reference.
+
+    Raises:
+        FileNotFoundError: If the bundle or the member does not exist
+    """
+    bundle_path, member = split_bundle_ref(path)
+    if not Path(bundle_path).is_file():
+        raise FileNotFoundError(f"Bundle not found: {bundle_path}")
+    try:
+        return open_bundle(bundle_path).view(member)
+    except KeyError:
+        raise FileNotFoundError(f"Not in bundle: {path}")
+
+
+def pack_bundle(
+    files: Sequence[Tuple[str, Path]],
+    output_path: Path
+) -> int:
+    """
+    Write files into a bundle.
+
+    A .zip output is written with stored (uncompressed) entries so it can
+    still be read without copies; any other suffix produces a .hsig pack.
+
+    Args:
+        files: List of (member_name, source_path) tuples
+        output_path: Bundle file to create
+
+    Returns:
+        Number of files packed
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+
+    try:
+        if output_path.suffix.lower() == '.zip':
+            with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_STORED) as zf:
+                for name, source in files:
+                    zf.write(source, name)
+            count = len(files)
+        else:
+            count = _write_hsig(files, tmp_path)
+        tmp_path.replace(output_path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+    return count
+
+
+def _write_hsig(files: Sequence[Tuple[str, Path]], path: Path) -> int:
+    """Write files into a .hsig pack (see pack_bundle)."""
+    entries = []
+    for name, source in files:
+        encoded = name.encode('utf-8')
+        if len(encoded) > 0xFFFF:
+            raise ValueError(f"Member name too long: {name}")
+        entries.append((encoded, source, source.stat().st_size))
+
+    table_size = sum(_NAME_LENGTH.size + len(n) + _ENTRY.size for n, _, _ in entries)
+    offset = _HEADER.size + table_size
+
+    with open(path, 'wb') as out:
+        out.write(_HEADER.pack(HSIG_MAGIC, HSIG_VERSION, len(entries)))
+        for encoded, _, size in entries:
+            out.write(_NAME_LENGTH.pack(len(encoded)))
+            out.write(encoded)
+            out.write(_ENTRY.pack(offset, size))
+            offset += size
+
+        for encoded, source, size in entries:
+            with open(source, 'rb') as f:
+                data = f.read()
+            if len(data) != size:
+                raise ValueError(f"File changed while packing: {source}")
+            out.write(data)
+
+    return len(entries)
@@ -1,75 +1,201 @@
 """Configuration management for Hancock."""
 
 import os
+import re
+import tempfile
 import yaml
 from pathlib import Path
-from typing import Optional, Dict
+from types import MappingProxyType
+from typing import Optional, Dict, List, Mapping
 
+# Allowed profile names (used as file names)
+PROFILE_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
 
-class Config:
-    """Manages Hancock configuration."""
+# Settings Hancock knows about, with their defaults
+DEFAULTS = {
+    'service_account_file': None,
+    'admin_email': None,
+}
 
-    def __init__(self):
-        self.config_dir = Path.home() / ".hancock"
-        self.config_file = self.config_dir / "config.yaml"
-        self._data = None
+# Environment variables are HANCOCK_<SETTING>, e.g. HANCOCK_ADMIN_EMAIL
+ENV_PREFIX = 'HANCOCK_'
 
-    def exists(self) -> bool:
-        """Check if config file exists."""
-        return self.config_file.exists()
+# Environment variable overriding the config folder (default ~/.hancock)
+HOME_ENV_VAR = 'HANCOCK_HOME'
 
-    def load(self) -> Dict:
-        """Load configuration from file."""
-        if not self.exists():
-            return {}
+# Environment variable selecting a profile when --profile is not given
+PROFILE_ENV_VAR = 'HANCOCK_PROFILE'
 
-        with open(self.config_file, 'r') as f:
-            self._data = yaml.safe_load(f) or {}
-        return self._data
+# Layers a setting can come from, lowest precedence first
+SOURCES = ('default', 'file', 'env', 'cli')
 
-    def save(self, data: Dict):
-        """Save configuration to file."""
-        # Create config directory if it doesn't exist
-        self.config_dir.mkdir(parents=True, exist_ok=True)
 
-        # Save config
-        with open(self.config_file, 'w') as f:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+def get_config_dir() -> Path:
+    """Get the folder holding config.yaml and profiles/ (HANCOCK_HOME or ~/.hancock)."""
+    home = os.environ.get(HOME_ENV_VAR)
+    if home:
+        return Path(home).expanduser()
+    return Path.home() / ".hancock"
 
-        self._data = data
+
+class Config:
+    """
+    Manages Hancock configuration.
+
+    Settings are resolved from layers, each overriding the one before:
+    defaults < config file < HANCOCK_* environment variables < command line
+    flags. The layers are read once, on first use, into an immutable mapping
+    that is used for the rest of the run; nothing is re-read or re-checked
+    on the filesystem afterwards.
+
+    Without a profile, the file is <config dir>/config.yaml. Named profiles
+    (one per Workspace tenant) live in <config dir>/profiles/<profile>.yaml.
+    The config dir is ~/.hancock unless HANCOCK_HOME is set, and no file is
+    needed at all when the settings come from the environment (containers).
+
+    Changes made with set() are staged and written together, atomically, by
+    save().
+    """
+
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        overrides: Optional[Mapping] = None,
+        environ: Optional[Mapping[str, str]] = None
+    ):
+        """
+        Args:
+            profile: Profile name, or None for the default config file
+            overrides: Settings from command line flags (None values are ignored)
+            environ: Environment to read HANCOCK_* variables from (default: os.environ)
+        """
+        if profile is not None and not PROFILE_NAME_PATTERN.match(profile):
+            raise ValueError(f"Invalid profile name: {profile}")
+
+        self.profile = profile
+        self.config_dir = get_config_dir()
+        if profile:
+            self.config_file = self.config_dir / "profiles" / f"{profile}.yaml"
+        else:
+            self.config_file = self.config_dir / "config.yaml"
+
+        self._overrides = {k: v for k, v in (overrides or {}).items() if v is not None}
+        self._environ = os.environ if environ is None else environ
+        self._file_data = None
+        self._settings = None
+        self._sources = None
+        self._pending = {}
+        self._service_account_path = False  # False: not checked yet
+
+    def exists(self) -> bool:
+        """Check if config file exists."""
+        return self.config_file.exists()
+
+    def load(self) -> Dict:
+        """Load the config file layer (read once and cached)."""
+        if self._file_data is None:
+            self._file_data = {}
+            if self.exists():
+                with open(self.config_file, 'r') as f:
+                    self._file_data = yaml.safe_load(f) or {}
+        return dict(self._file_data)
+
+    def _env_layer(self) -> Dict:
+        """Settings given as HANCOCK_<SETTING> environment variables."""
+        values = {}
+        for key in DEFAULTS:
+            value = self._environ.get(ENV_PREFIX + key.upper())
+            if value:
+                values[key] = value
+        return values
+
+    def _resolve(self):
+        """Merge all layers into the read-only settings mapping."""
+        settings = {}
+        sources = {}
+        layers = (DEFAULTS, self.load(), self._env_layer(), self._overrides)
+        for source, layer in zip(SOURCES, layers):
+            for key, value in layer.items():
+                settings[key] = value
+                sources[key] = source
+        self._settings = MappingProxyType(settings)
+        self._sources = MappingProxyType(sources)
+
+    @property
+    def settings(self) -> Mapping:
+        """Resolved settings (read-only), built from all layers on first use."""
+        if self._settings is None:
+            self._resolve()
+        return self._settings
+
+    def source(self, key: str) -> Optional[str]:
+        """Get the layer a setting was resolved from ('default', 'file', 'env' or 'cli')."""
+        if self._sources is None:
+            self._resolve()
+        return self._sources.get(key)
 
     def get(self, key: str, default=None):
         """Get a configuration value."""
-        if self._data is None:
-            self.load()
-        return self._data.get(key, default)
+        value = self.settings.get(key)
+        return default if value is None else value
 
     def set(self, key: str, value):
-        """Set a configuration value."""
-        if self._data is None:
-            self.load()
-        self._data[key] = value
-        self.save(self._data)
+        """Stage a configuration value; call save() to write it."""
+        self._pending[key] = value
+
+    def save(self, data: Optional[Dict] = None):
+        """
+        Write the config file atomically.
+
+        Args:
+            data: Replaces the file contents when given; otherwise the
+                staged set() changes are merged into the current file
+        """
+        if data is None:
+            data = self.load()
+        data = dict(data)
+        data.update(self._pending)
 
-    def get_service_account_path(self) -> Optional[Path]:
-        """Get the path to the service account JSON file."""
-        path_str = self.get('service_account_file')
-        if not path_str:
-            return None
+        # Create config directory if it doesn't exist
+        self.config_file.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file and swap it in, so readers never see a
+        # partial file
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.config_file.parent), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            os.replace(tmp_path, str(self.config_file))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._file_data = data
+        self._pending = {}
+        self._settings = None
+        self._sources = None
+        self._service_account_path = False
 
-        path = Path(path_str).expanduser()
-        if path.exists():
-            return path
-        return None
+    def get_service_account_path(self) -> Optional[Path]:
+        """Get the path to the service account JSON file (checked once)."""
+        if self._service_account_path is False:
+            path = None
+            path_str = self.get('service_account_file')
+            if path_str:
+                path = Path(path_str).expanduser()
+                if not path.exists():
+                    path = None
+            self._service_account_path = path
+        return self._service_account_path
 
     def get_admin_email(self) -> Optional[str]:
         """Get the admin email."""
         return self.get('admin_email')
 
     def is_configured(self) -> bool:
-        """Check if Hancock is fully configured."""
+        """Check if Hancock is fully configured (from any layer)."""
         return (
-            self.exists() and
             self.get_service_account_path() is not None and
             self.get_admin_email() is not None
         )
@@ -79,10 +205,44 @@ class Config:
         return self.config_file
 
 
-# Global config instance
-_config = Config()
+# Global config instance, created on first use
+_config = None
+
+# Command line overrides applied to the global config
+_overrides = {}
 
 
 def get_config() -> Config:
     """Get the global config instance."""
+    global _config
+    if _config is None:
+        _config = Config(os.environ.get(PROFILE_ENV_VAR) or None, _overrides)
+    return _config
+
+
+def set_active_profile(profile: Optional[str], overrides: Optional[Mapping] = None) -> Config:
+    """
+    Switch the global config instance to a named profile.
+
+    Args:
+        profile: Profile name, or None for HANCOCK_PROFILE / the default config
+        overrides: Settings from command line flags
+
+    Returns:
+        The new global config instance
+    """
+    global _config, _overrides
+    _overrides = dict(overrides or {})
+    _config = Config(profile or os.environ.get(PROFILE_ENV_VAR) or None, _overrides)
     return _config
+
+
+def list_profiles() -> List[str]:
+    """List the names of all saved profiles, sorted."""
+    profiles_dir = get_config_dir() / "profiles"
+    if not profiles_dir.is_dir():
+        return []
+    return sorted(
+        path.stem for path in profiles_dir.glob('*.yaml')
+        if PROFILE_NAME_PATTERN.match(path.stem)
+    )
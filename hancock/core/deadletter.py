@@ -0,0 +1,44 @@
+"""Keep a record of users whose deployment failed on every attempt."""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .config import get_config_dir
+
+
+def get_dead_letter_path(profile: Optional[str] = None) -> Path:
+    """Get the default dead-letter file (<config dir>/dead-letter/<profile>.jsonl)."""
+    return get_config_dir() / "dead-letter" / f"{profile or 'default'}.jsonl"
+
+
+def write_dead_letters(path: Path, failures: Iterable[Dict], profile: Optional[str] = None) -> int:
+    """
+    Append failed users to a dead-letter file, one JSON object per line.
+
+    Args:
+        path: JSON Lines file to append to (created if missing)
+        failures: Users that used up their attempts ({email, error, attempts})
+        profile: Profile the users belong to
+
+    Returns:
+        Number of users written
+    """
+    failed = datetime.now(timezone.utc).isoformat()
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    count = 0
+    with open(path, 'a', encoding='utf-8') as f:
+        for failure in failures:
+            f.write(json.dumps({
+                'failed': failed,
+                'profile': profile,
+                'email': failure['email'],
+                'error': failure['error'],
+                'attempts': failure.get('attempts'),
+            }) + '\n')
+            count += 1
+    return count
+
@@ -1,46 +1,425 @@
 """Google Directory API integration for fetching users."""
 
-from typing import List, Dict, Optional
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Sequence, Set
 from googleapiclient.errors import HttpError
+from .matching import user_match_keys
+from .tracing import span, current_span
 
+# Requests per Directory API batch (the API accepts up to 1000; smaller
+# batches keep a single failure cheap to retry)
+BATCH_SIZE = 100
 
-def get_all_users(service, max_results: int = 500) -> List[Dict]:
+# User fields Hancock reads (see UserRecord); requesting only these keeps
+# Directory responses, and the memory they take, small
+USER_FIELDS = 'primaryEmail,name(fullName,givenName,familyName),aliases,nonEditableAliases'
+
+# Partitions listed side by side by crawl_users, one per character a
+# Workspace username can start with: letters, digits, and the dash,
+# underscore, apostrophe and period it may contain
+PARTITION_PREFIXES = tuple('abcdefghijklmnopqrstuvwxyz0123456789') + ('_', '-', "'", '.')
+
+# Partitions listed at the same time by crawl_users
+DEFAULT_CRAWL_WORKERS = 8
+
+
+def build_user_query(query: Optional[str] = None, org_unit: Optional[str] = None) -> Optional[str]:
+    """
+    Combine a Directory API search query with an organizational unit filter.
+
+    Args:
+        query: Directory API user query, e.g. "isSuspended=false"
+        org_unit: Organizational unit path, e.g. "/Sales" (includes sub-units)
+
+    Returns:
+        Combined query string, or None for no filtering
+    """
+    terms = []
+    if org_unit:
+        org_unit = '/' + org_unit.strip('/')
+        terms.append(f"orgUnitPath='{org_unit}'")
+    if query:
+        terms.append(query)
+    return ' '.join(terms) or None
+
+
+def get_all_users(
+    service,
+    max_results: int = 500,
+    query: Optional[str] = None,
+    org_unit: Optional[str] = None
+) -> List[Dict]:
     """
     Fetch all users from Google Workspace Directory.
 
+    Filters are applied by the Directory API, so a scoped fetch only pages
+    through the users it returns.
+
     Args:
         service: Authenticated Directory API service
         max_results: Maximum results per page (max 500)
+        query: Optional Directory API user query (see build_user_query)
+        org_unit: Optional organizational unit path, e.g. "/Sales"
 
     Returns:
         List of user dictionaries with user data
     """
-    users = []
+    return list(iter_users(service, max_results=max_results, query=query, org_unit=org_unit))
+
+
+def iter_users(
+    service,
+    max_results: int = 500,
+    query: Optional[str] = None,
+    org_unit: Optional[str] = None,
+    fields: Optional[str] = None
+) -> Iterator[Dict]:
+    """
+    Stream users from the Directory, one page at a time.
+
+    Args:
+        service: Authenticated Directory API service
+        max_results: Maximum results per page (max 500)
+        query: Optional Directory API user query (see build_user_query)
+        org_unit: Optional organizational unit path, e.g. "/Sales"
+        fields: Optional user fields to request (e.g. USER_FIELDS) instead
+            of the full user resource
+
+    Yields:
+        User dictionaries from the Directory API
+    """
+    for response in _list_pages(service, build_user_query(query, org_unit), fields, max_results):
+        yield from response.get('users', [])
+
+
+def _list_pages(service, query: Optional[str], fields: Optional[str], max_results: int) -> Iterator[Dict]:
+    """Yield users.list responses, following page tokens."""
     page_token = None
 
     try:
         while True:
-            request = service.users().list(
+            params = dict(
                 customer='my_customer',  # Get all users in admin's domain
                 maxResults=min(max_results, 500),
                 pageToken=page_token,
                 orderBy='email',
                 projection='full'  # Get full user data
             )
+            if query:
+                params['query'] = query
+            if fields:
+                params['fields'] = f"nextPageToken,users({fields})"
 
-            response = request.execute()
+            request = service.users().list(**params)
 
-            if 'users' in response:
-                users.extend(response['users'])
+            with span('directory.users.list') as page:
+                response = request.execute()
+                page.set('users', len(response.get('users', [])))
 
             page_token = response.get('nextPageToken')
+            yield response
+
             if not page_token:
                 break
 
     except HttpError as error:
         raise Exception(f"Error fetching users: {error}")
 
-    return users
+
+def crawl_users(
+    service_factory: Callable[[], object],
+    max_results: int = 500,
+    query: Optional[str] = None,
+    org_unit: Optional[str] = None,
+    fields: Optional[str] = None,
+    workers: int = DEFAULT_CRAWL_WORKERS,
+    prefixes: Sequence[str] = PARTITION_PREFIXES,
+    timings: Optional[List[Dict]] = None
+) -> Iterator[Dict]:
+    """
+    Stream users from the Directory, listing partitions concurrently.
+
+    users.list pages can only be fetched one after another, so a large
+    domain is split by the first character of the email address
+    ("email:a*", ...) and the partitions are listed side by side. A domain
+    whose users fit on one page is listed with that single request. Pages
+    are ordered by email, so partitions that the first page already holds
+    in full are not listed again.
+
+    The email search also matches aliases, so a user can turn up in more
+    than one partition; each user is yielded once.
+
+    Args:
+        service_factory: Function returning a new Directory API service
+            (clients are not thread-safe; each worker builds its own)
+        max_results: Maximum results per page (max 500)
+        query: Optional Directory API user query (see build_user_query)
+        org_unit: Optional organizational unit path, e.g. "/Sales"
+        fields: Optional user fields to request (e.g. USER_FIELDS)
+        workers: Partitions listed at the same time
+        prefixes: Email prefixes to partition by
+        timings: Optional list that receives one {partition, users, pages,
+            seconds} entry per partition listed
+
+    Yields:
+        User dictionaries from the Directory API, partition by partition
+    """
+    query = build_user_query(query, org_unit)
+    local = threading.local()
+
+    def get_thread_service():
+        if getattr(local, 'service', None) is None:
+            local.service = service_factory()
+        return local.service
+
+    # One request tells whether partitioning is worth it
+    first_page = next(_list_pages(get_thread_service(), query, fields, max_results), {})
+    first_users = first_page.get('users', [])
+    if not first_page.get('nextPageToken'):
+        yield from first_users
+        return
+
+    # Every partition but the one the first page stops in is complete there
+    first_chars = [user.get('primaryEmail', '')[:1].lower() for user in first_users]
+    complete = {char for char in first_chars[:-1] if char != first_chars[-1] and char.isalnum()}
+
+    seen = set()
+    for user in first_users:
+        seen.add(user.get('primaryEmail', '').lower())
+        yield user
+
+    parent_span = current_span()
+
+    def fetch(prefix: str):
+        escaped = prefix.replace("'", "\\'")  # Quotes are escaped in queries
+        term = f"email:{escaped}*"
+        with span('directory.partition', parent=parent_span, partition=term) as partition_span:
+            started = time.monotonic()
+            users = []
+            pages = 0
+            service = get_thread_service()
+            for response in _list_pages(service, f"{query} {term}" if query else term, fields, max_results):
+                pages += 1
+                users.extend(response.get('users', []))
+            partition_span.set('users', len(users))
+            return term, users, pages, time.monotonic() - started
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fetch, prefix) for prefix in prefixes if prefix not in complete]
+        for future in as_completed(futures):
+            term, users, pages, seconds = future.result()
+            if timings is not None:
+                timings.append({'partition': term, 'users': len(users), 'pages': pages, 'seconds': seconds})
+
+            for user in users:
+                key = user.get('primaryEmail', '').lower()
+                if key not in seen:
+                    seen.add(key)
+                    yield user
+
+
+def get_group_member_emails(service, group_key: str) -> Set[str]:
+    """
+    List the email addresses of a group's user members.
+
+    Members of nested groups are included (derived membership); external
+    and non-user members are skipped.
+
+    Args:
+        service: Authenticated Directory API service (needs GROUP_SCOPES)
+        group_key: Group email address or ID
+
+    Returns:
+        Set of lowercased member emails
+    """
+    emails = set()
+    page_token = None
+
+    try:
+        while True:
+            with span('directory.members.list', group=group_key):
+                response = service.members().list(
+                    groupKey=group_key,
+                    maxResults=200,
+                    pageToken=page_token,
+                    includeDerivedMembership=True
+                ).execute()
+
+            for member in response.get('members', []):
+                if member.get('type') == 'USER' and member.get('email'):
+                    emails.add(member['email'].lower())
+
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+
+    except HttpError as error:
+        raise Exception(f"Error fetching members of {group_key}: {error}")
+
+    return emails
+
+
+def get_users_by_email(
+    service,
+    emails: Iterable[str],
+    batch_size: int = BATCH_SIZE,
+    fields: Optional[str] = None
+) -> List[Dict]:
+    """
+    Fetch specific users, many per HTTP round trip.
+
+    Emails that are not users of the domain (e.g. external group members)
+    are skipped.
+
+    Args:
+        service: Authenticated Directory API service
+        emails: Primary emails or aliases to fetch
+        batch_size: Users requested per batch
+        fields: Optional user fields to request (e.g. USER_FIELDS); the
+            primaryEmail field is always needed
+
+    Returns:
+        List of user dictionaries, sorted by primary email
+    """
+    users = {}
+    failures = []
+
+    def callback(request_id, response, exception):
+        if exception is None:
+            users[response['primaryEmail'].lower()] = response
+        elif not (isinstance(exception, HttpError) and exception.resp.status == 404):
+            failures.append(exception)
+
+    emails = sorted(set(emails))
+    for start in range(0, len(emails), batch_size):
+        chunk = emails[start:start + batch_size]
+        batch = service.new_batch_http_request(callback=callback)
+        for email in chunk:
+            if fields:
+                batch.add(service.users().get(userKey=email, projection='full', fields=fields))
+            else:
+                batch.add(service.users().get(userKey=email, projection='full'))
+        with span('directory.users.batch_get', users=len(chunk)):
+            batch.execute()
+
+        if failures:
+            raise Exception(f"Error fetching users: {failures[0]}")
+
+    return [users[key] for key in sorted(users)]
+
+
+def get_scoped_users(
+    service,
+    query: Optional[str] = None,
+    org_unit: Optional[str] = None,
+    groups: Optional[Iterable[str]] = None
+) -> List[Dict]:
+    """
+    Fetch the users a deployment is scoped to (see iter_scoped_users).
+
+    Returns:
+        List of user dictionaries
+    """
+    return list(iter_scoped_users(service, query=query, org_unit=org_unit, groups=groups))
+
+
+def iter_scoped_users(
+    service,
+    query: Optional[str] = None,
+    org_unit: Optional[str] = None,
+    groups: Optional[Iterable[str]] = None,
+    fields: Optional[str] = None,
+    service_factory: Optional[Callable[[], object]] = None,
+    workers: int = 1,
+    timings: Optional[List[Dict]] = None
+) -> Iterator[Dict]:
+    """
+    Fetch the users a deployment is scoped to.
+
+    Without groups this is iter_users with its filters. With groups, only
+    members are fetched; a query or OU filter is then intersected with the
+    membership, so each side is still filtered by the API.
+
+    Args:
+        service: Authenticated Directory API service
+        query: Optional Directory API user query
+        org_unit: Optional organizational unit path
+        groups: Optional group emails; users must be in at least one
+        fields: Optional user fields to request (e.g. USER_FIELDS)
+        service_factory: Function building more Directory services; with
+            workers > 1, users are listed by crawl_users
+        workers: Partitions listed at the same time
+        timings: Optional list receiving crawl_users partition timings
+
+    Yields:
+        User dictionaries from the Directory API
+    """
+    def list_users():
+        if service_factory is not None and workers > 1:
+            return crawl_users(
+                service_factory, query=query, org_unit=org_unit, fields=fields,
+                workers=workers, timings=timings
+            )
+        return iter_users(service, query=query, org_unit=org_unit, fields=fields)
+
+    groups = list(groups or [])
+    if not groups:
+        yield from list_users()
+        return
+
+    members = set()
+    for group in groups:
+        members |= get_group_member_emails(service, group)
+
+    if query or org_unit:
+        for user in list_users():
+            if user.get('primaryEmail', '').lower() in members:
+                yield user
+        return
+
+    yield from get_users_by_email(service, members, fields=fields)
+
+
+def load_user_records(
+    service,
+    query: Optional[str] = None,
+    org_unit: Optional[str] = None,
+    groups: Optional[Iterable[str]] = None,
+    service_factory: Optional[Callable[[], object]] = None,
+    workers: int = 1,
+    timings: Optional[List[Dict]] = None
+) -> List['UserRecord']:
+    """
+    Fetch the users a deployment is scoped to as compact UserRecords.
+
+    Only USER_FIELDS are requested, and each page of API results is
+    converted and released as it arrives, so the full Directory payloads
+    are never held in memory together.
+
+    Args:
+        service: Authenticated Directory API service
+        query: Optional Directory API user query
+        org_unit: Optional organizational unit path
+        groups: Optional group emails; users must be in at least one
+        service_factory: Function building more Directory services, for
+            a partitioned crawl (see crawl_users)
+        workers: Partitions listed at the same time
+        timings: Optional list receiving crawl_users partition timings
+
+    Returns:
+        List of UserRecords, sorted by email
+    """
+    users = iter_scoped_users(
+        service, query=query, org_unit=org_unit, groups=groups, fields=USER_FIELDS,
+        service_factory=service_factory, workers=workers, timings=timings
+    )
+    records = [UserRecord.from_api(user) for user in users]
+    # Partitions finish in any order; keep the Directory's email order
+    records.sort(key=lambda record: record.email.lower())
+    return records
 
 
 def extract_user_data(user: Dict) -> Dict:
@@ -63,4 +442,73 @@ def extract_user_data(user: Dict) -> Dict:
         'name': name.get('fullName') or f"{name.get('givenName', '')} {name.get('familyName', '')}".strip(),
         'first_name': name.get('givenName', ''),
         'last_name': name.get('familyName', ''),
+        'aliases': list(user.get('aliases', [])) + list(user.get('nonEditableAliases', [])),
     }
+
+
+class UserRecord:
+    """
+    A Workspace user, reduced to what matching and deployment need.
+
+    A slotted replacement for the dictionaries from extract_user_data, for
+    large tenants: no per-user dict, the email domain and repeated first
+    and last names are interned (shared between users), and the normalized
+    match keys are computed once here instead of by every index built over
+    the users. Records can be read like those dictionaries (record['email'],
+    record.get('name')).
+    """
+
+    __slots__ = ('local', 'domain', 'name', 'first_name', 'last_name', 'aliases', 'match_keys')
+
+    # Keys readable with [] and get()
+    KEYS = ('email', 'name', 'first_name', 'last_name', 'aliases')
+
+    def __init__(
+        self,
+        email: str,
+        name: str = '',
+        first_name: str = '',
+        last_name: str = '',
+        aliases: Sequence[str] = ()
+    ):
+        # Most users of a tenant share a domain, so only the local part (up
+        # to and including the @) is stored per user
+        local, at, domain = email.rpartition('@')
+        self.local = local + at
+        self.domain = sys.intern(domain)
+        self.name = name
+        self.first_name = sys.intern(first_name)
+        self.last_name = sys.intern(last_name)
+        self.aliases = tuple(aliases)
+
+        # Flat (strategy, key, strategy, key, ...) tuple, which takes far
+        # less memory than a tuple of pairs; user_match_keys unpacks it
+        self.match_keys = None
+        self.match_keys = tuple(part for pair in user_match_keys(self) for part in pair)
+
+    @property
+    def email(self) -> str:
+        """Primary email address."""
+        return self.local + self.domain
+
+    @classmethod
+    def from_api(cls, user: Dict) -> 'UserRecord':
+        """Build a record from a Directory API user (see extract_user_data)."""
+        data = extract_user_data(user)
+        return cls(data['email'], data['name'], data['first_name'], data['last_name'], data['aliases'])
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        """Read a field by name, like dict.get."""
+        return getattr(self, key) if key in self.KEYS else default
+
+    def to_dict(self) -> Dict:
+        """Convert to the dictionary format of extract_user_data."""
+        return {key: list(self.aliases) if key == 'aliases' else getattr(self, key) for key in self.KEYS}
+
+    def __repr__(self) -> str:
+        return f"UserRecord({self.email!r})"
@@ -0,0 +1,222 @@
+"""Estimate how long a deployment will take and how much API quota it uses."""
+
+import json
+import math
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Sequence
+
+from .auth import get_service
+from .config import get_config_dir
+from .rollout import percentile
+
+# Gmail API quota units per call
+# (https://developers.google.com/gmail/api/reference/quota)
+GMAIL_QUOTA_UNITS = {
+    'sendAs.list': 1,
+    'sendAs.get': 1,
+    'sendAs.patch': 100,
+}
+
+# Gmail API quota units a project may use per minute
+GMAIL_PROJECT_UNITS_PER_MINUTE = 1200000
+
+# Users per Directory users.list page
+DIRECTORY_PAGE_SIZE = 500
+
+# Latency samples kept per profile
+MAX_SAMPLES = 1000
+
+# Users probed by default when there are no samples from earlier runs
+DEFAULT_PROBE_SIZE = 5
+
+
+def _samples_path(profile: Optional[str]):
+    return get_config_dir() / "stats" / f"{profile or 'default'}.json"
+
+
+def load_latency_samples(profile: Optional[str] = None) -> Optional[Dict]:
+    """
+    Load latency samples saved by earlier deployments to a profile.
+
+    Returns:
+        Dictionary with samples (seconds per user), retry_rate (retries per
+        user) and recorded (ISO time), or None if there are none
+    """
+    path = _samples_path(profile)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not data.get('samples'):
+        return None
+    return data
+
+
+def save_latency_samples(profile: Optional[str], latencies: Sequence[float], retries: int):
+    """
+    Save the per-user latencies of a deployment for future estimates.
+
+    Only the most recent MAX_SAMPLES latencies are kept, evenly sampled
+    from the deployment when it had more users.
+
+    Args:
+        profile: Profile deployed to (None for the default config)
+        latencies: Seconds per user spent on attempts, including retries
+            but not waiting for the rate limiter
+        retries: Total retries in the deployment
+    """
+    if not latencies:
+        return
+    step = max(1, len(latencies) // MAX_SAMPLES)
+    data = {
+        'samples': [round(value, 4) for value in list(latencies)[::step][:MAX_SAMPLES]],
+        'retry_rate': retries / len(latencies),
+        'users': len(latencies),
+        'recorded': datetime.now(timezone.utc).isoformat(),
+    }
+
+    path = _samples_path(profile)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, str(path))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def probe_latency(credentials, emails: Sequence[str], size: int = DEFAULT_PROBE_SIZE) -> Dict:
+    """
+    Measure API latency with read-only calls for a few users.
+
+    For each user, a Gmail client is built and sendAs.list is called twice:
+    the first call includes minting the user's token, the second stands in
+    for the patch a deployment would make. Nothing is changed.
+
+    Args:
+        credentials: Base service account credentials
+        emails: Users to choose from (the first `size` are probed)
+        size: Number of users to probe
+
+    Returns:
+        Dictionary with samples (estimated seconds per user), identities
+        (average sendAs identities per user) and errors (failed probes)
+    """
+    samples = []
+    identities = []
+    errors = 0
+
+    for email in list(emails)[:size]:
+        try:
+            started = time.monotonic()
+            service = get_service('gmail', 'v1', credentials, user_email=email)
+            send_as = service.users().settings().sendAs().list(userId=email).execute()
+            service.users().settings().sendAs().list(userId=email).execute()
+        except Exception:
+            errors += 1
+            continue
+        samples.append(time.monotonic() - started)
+        identities.append(len(send_as.get('sendAs', [])) or 1)
+
+    return {
+        'samples': samples,
+        'identities': sum(identities) / len(identities) if identities else 1.0,
+        'errors': errors,
+    }
+
+
+def estimate_deployment(
+    users: int,
+    directory_users: int,
+    samples: Optional[Sequence[float]] = None,
+    workers: int = 4,
+    rate: float = 10.0,
+    retry_rate: float = 0.0,
+    retry_delay: float = 2.0,
+    identities_per_user: float = 1.0,
+    alias_patches: int = 0,
+    directory_pages: Optional[int] = None
+) -> Dict:
+    """
+    Estimate the API calls, quota and time of a deployment.
+
+    Every user costs a token mint, a sendAs.list and one sendAs.patch per
+    identity updated; retries repeat the list and patches. Throughput is
+    whichever is lower: `workers` users in flight at the sampled latency,
+    or the rate limiter's one request (list or patch) per token. Samples must not include
+    time spent waiting for the rate limiter (deploy_signatures_batch leaves
+    it out), or throttling would be counted twice. Retry delays are not
+    spent on a worker, so they only lengthen the end of the run.
+
+    Args:
+        users: Users to deploy to
+        directory_users: Users listed from the Directory
+        samples: Seconds per user from earlier runs or a probe (no time
+            estimate without them)
+        workers: Users deployed at the same time
+        rate: Rate limit in Gmail API requests per second
+        retry_rate: Expected retries per user
+        retry_delay: Seconds before a failed user is retried
+        identities_per_user: sendAs identities patched per user
+        alias_patches: Extra patches for per-address signature files
+        directory_pages: users.list pages actually fetched (default: worked
+            out from directory_users)
+
+    Returns:
+        Dictionary with phases (list of {phase, calls, units}), calls,
+        units, and when samples are given: p50, p95, seconds, throughput
+        (users per second), bottleneck ('workers' or 'rate limit'),
+        saturating_workers (workers at which the rate limit is reached) and
+        units_per_minute
+    """
+    attempts = users * (1 + retry_rate)
+    patches = attempts * identities_per_user + alias_patches
+
+    if directory_pages is None:
+        directory_pages = math.ceil(directory_users / DIRECTORY_PAGE_SIZE) or 1
+
+    phases = [
+        {'phase': 'Directory users.list', 'calls': directory_pages, 'units': 0},
+        {'phase': 'Token mints', 'calls': users, 'units': 0},
+        {'phase': 'sendAs.list', 'calls': math.ceil(attempts), 'units': math.ceil(attempts) * GMAIL_QUOTA_UNITS['sendAs.list']},
+        {'phase': 'sendAs.patch', 'calls': math.ceil(patches), 'units': math.ceil(patches) * GMAIL_QUOTA_UNITS['sendAs.patch']},
+    ]
+    estimate = {
+        'phases': phases,
+        'calls': sum(p['calls'] for p in phases),
+        'units': sum(p['units'] for p in phases),
+    }
+
+    if not samples or not users:
+        return estimate
+
+    mean = sum(samples) / len(samples)
+    by_workers = workers / mean if mean > 0 else float('inf')
+    # Each attempt is a sendAs.list and its patches, each taking a token
+    by_rate = rate * users / (attempts + patches)
+    throughput = min(by_workers, by_rate)
+
+    # Users waiting to be retried don't hold a worker, so the delay only adds
+    # to the run when the last retries are still due after everyone else
+    tail = retry_delay * min(1.0, users * retry_rate)
+    seconds = users / throughput + tail + percentile(samples, 95)
+
+    estimate.update(
+        p50=percentile(samples, 50),
+        p95=percentile(samples, 95),
+        seconds=seconds,
+        throughput=throughput,
+        bottleneck='workers' if by_workers < by_rate else 'rate limit',
+        saturating_workers=math.ceil(by_rate * mean),
+        units_per_minute=estimate['units'] / seconds * 60,
+    )
+    return estimate
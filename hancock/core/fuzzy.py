@@ -0,0 +1,163 @@
+"""Fuzzy signature filename matching backed by a precomputed trigram index."""
+
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, List, Tuple
+
+from .matching import normalize_name, user_match_keys
+
+# Minimum similarity (Dice coefficient over trigrams) for a fuzzy match
+DEFAULT_FUZZY_THRESHOLD = 0.7
+
+# Candidates scoring within this margin of the best are considered ambiguous
+AMBIGUITY_MARGIN = 0.05
+
+# Trigrams shared by more keys than this are too common to narrow down
+# candidates (e.g. the leading "  j" of every "john"), so they are skipped
+# during candidate generation. They still count towards the final score.
+MAX_POSTING_SIZE = 2000
+
+
+def trigrams(key: str) -> frozenset:
+    """
+    Split a normalized key into padded character trigrams.
+
+    Spaces are dropped so that "jon smith" and "jonsmith" produce the same
+    trigrams.
+
+    Args:
+        key: Normalized name (see normalize_name)
+
+    Returns:
+        Frozen set of trigrams
+    """
+    padded = f"  {key.replace(' ', '')} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class FuzzyIndex:
+    """
+    Trigram index over the match keys of a set of users.
+
+    Built once per run, so looking up a filename only scores users that
+    share at least one reasonably rare trigram with it instead of comparing
+    against every user.
+    """
+
+    def __init__(self, users: List[Dict] = None, max_posting_size: int = MAX_POSTING_SIZE):
+        self.max_posting_size = max_posting_size
+        self._users = []
+        self._keys = []  # (user slot, trigram set)
+        self._postings = defaultdict(list)
+
+        for user_data in users or []:
+            self.add_user(user_data)
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def add_user(self, user_data: Dict):
+        """Index all match keys (email, name, combos, aliases) of a user."""
+        slot = len(self._users)
+        self._users.append(user_data)
+
+        for _, key in user_match_keys(user_data):
+            key_id = len(self._keys)
+            grams = trigrams(key)
+            self._keys.append((slot, grams))
+            for gram in grams:
+                self._postings[gram].append(key_id)
+
+    def search(
+        self,
+        filename: str,
+        threshold: float = DEFAULT_FUZZY_THRESHOLD,
+        limit: int = 5
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Find users whose match keys are similar to a filename.
+
+        Args:
+            filename: Signature filename (with or without extension)
+            threshold: Minimum similarity score (0-1)
+            limit: Maximum number of candidates to return
+
+        Returns:
+            List of (user_data, score) tuples, best match first
+        """
+        key = normalize_name(filename)
+        if not key:
+            return []
+
+        query = trigrams(key)
+        postings = [self._postings[g] for g in query if g in self._postings]
+        if not postings:
+            return []
+
+        selective = [p for p in postings if len(p) <= self.max_posting_size]
+        if not selective:
+            # Every trigram is common; fall back to the least common one
+            selective = [min(postings, key=len)]
+
+        # Trigrams left out of candidate generation can still add to the
+        # overlap, so they loosen the pruning bound below
+        skipped = len(postings) - len(selective)
+        hits = Counter(chain.from_iterable(selective))
+
+        # A Dice score >= threshold bounds the size of the other trigram set
+        size = len(query)
+        min_size = size * threshold / (2 - threshold)
+        max_size = size * (2 - threshold) / threshold
+
+        # Candidates need a minimum number of shared trigrams to possibly
+        # reach the threshold; most_common() lets us stop at the first miss
+        min_hits = threshold * (size + min_size) / 2 - skipped
+
+        best = {}
+        for key_id, count in hits.most_common():
+            if count < min_hits:
+                break
+
+            slot, grams = self._keys[key_id]
+            other = len(grams)
+            if not min_size <= other <= max_size:
+                continue
+            if count + skipped < threshold * (size + other) / 2:
+                continue
+
+            score = 2 * len(query & grams) / (size + other)
+            if score >= threshold and score > best.get(slot, 0.0):
+                best[slot] = score
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        return [(self._users[slot], round(score, 3)) for slot, score in ranked[:limit]]
+
+
+def find_fuzzy_match(
+    filename: str,
+    index: FuzzyIndex,
+    threshold: float = DEFAULT_FUZZY_THRESHOLD
+) -> Tuple[Dict, float, List[Tuple[Dict, float]]]:
+    """
+    Pick the best fuzzy match for a filename, refusing ambiguous results.
+
+    Args:
+        filename: Signature filename (with or without extension)
+        index: Prebuilt FuzzyIndex
+        threshold: Minimum similarity score (0-1)
+
+    Returns:
+        Tuple of (user_data, score, candidates)
+        - user_data is None when nothing scores above the threshold or when
+          the top candidates are too close to call
+        - candidates lists the scored users that were considered
+    """
+    candidates = index.search(filename, threshold=threshold)
+    if not candidates:
+        return None, 0.0, []
+
+    best_user, best_score = candidates[0]
+    if len(candidates) > 1 and best_score - candidates[1][1] < AMBIGUITY_MARGIN:
+        return None, best_score, candidates
+
+    return best_user, best_score, candidates
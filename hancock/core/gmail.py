@@ -1,46 +1,201 @@
 """Gmail API integration for deploying signatures."""
 
-from typing import Dict, List, Tuple, Optional, Callable
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Mapping, Tuple, Optional, Callable
 from googleapiclient.errors import HttpError
 from .auth import get_service
+from .ratelimit import RateLimiter
+from .tracing import span, current_span
 import time
 
+# Users deployed at the same time by hancock deploy
+DEFAULT_WORKERS = 4
 
-def deploy_signature(service, user_email: str, signature_html: str) -> Tuple[bool, Optional[str]]:
+
+def _format_http_error(error: HttpError) -> str:
+    """Format an API error the way Hancock reports it."""
+    content = error.content.decode('utf-8') if isinstance(error.content, bytes) else str(error.content)
+    return f"HTTP {error.resp.status}: {content}"
+
+
+def get_primary_send_as(send_as_entries: List[Dict]) -> Optional[Dict]:
+    """
+    Pick the primary sendAs identity.
+
+    Args:
+        send_as_entries: The 'sendAs' list from sendAs.list
+
+    Returns:
+        The entry marked isPrimary (the first entry if none is), or None
+    """
+    for entry in send_as_entries:
+        if entry.get('isPrimary'):
+            return entry
+    return send_as_entries[0] if send_as_entries else None
+
+
+def plan_send_as_updates(
+    send_as_entries: List[Dict],
+    signature_html: str,
+    all_aliases: bool = False,
+    alias_signatures: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """
+    Decide which sendAs identities get which signature.
+
+    Args:
+        send_as_entries: The 'sendAs' list from sendAs.list
+        signature_html: The user's signature
+        all_aliases: If True, every identity gets signature_html; otherwise
+            only the primary one
+        alias_signatures: Signatures for specific addresses (lowercased
+            sendAs email -> HTML), taking precedence over signature_html
+
+    Returns:
+        Dictionary mapping sendAsEmail -> signature HTML to set
+    """
+    alias_signatures = alias_signatures or {}
+    primary = get_primary_send_as(send_as_entries)
+
+    updates = {}
+    for entry in send_as_entries:
+        send_as_email = entry.get('sendAsEmail')
+        if not send_as_email:
+            continue
+        if send_as_email.lower() in alias_signatures:
+            updates[send_as_email] = alias_signatures[send_as_email.lower()]
+        elif all_aliases or entry is primary:
+            updates[send_as_email] = signature_html
+    return updates
+
+
+def _no_throttle(requests: int):
+    pass
+
+
+def deploy_signature(
+    service,
+    user_email: str,
+    signature_html: str,
+    all_aliases: bool = False,
+    alias_signatures: Optional[Dict[str, str]] = None,
+    throttle: Optional[Callable[[int], object]] = None
+) -> Tuple[bool, Optional[str]]:
     """
     Deploy signature to a single user's Gmail account.
 
+    Updates the primary sendAs identity (or all of them, see
+    plan_send_as_updates). Several updates are sent as one batch request
+    over the same client, so extra aliases cost no extra round trips.
+
     Args:
         service: Authenticated Gmail API service
         user_email: User's email address
         signature_html: HTML signature content
+        all_aliases: If True, update every sendAs identity, not just the primary
+        alias_signatures: Signatures for specific sendAs addresses
+            (lowercased email -> HTML)
+        throttle: Optional function called with the number of API requests
+            about to be made, before making them (e.g. RateLimiter.acquire)
 
     Returns:
         Tuple of (success: bool, error_message: Optional[str])
     """
+    if throttle is None:
+        throttle = _no_throttle
+
     try:
         # Get the user's sendAs settings
-        send_as_list = service.users().settings().sendAs().list(userId=user_email).execute()
+        throttle(1)
+        with span('sendAs.list'):
+            send_as_list = service.users().settings().sendAs().list(userId=user_email).execute()
 
         if not send_as_list.get('sendAs'):
             return False, "No sendAs configuration found"
 
-        # Update the primary sendAs (usually the first one)
-        primary_send_as = send_as_list['sendAs'][0]
-        send_as_email = primary_send_as.get('sendAsEmail', user_email)
+        updates = plan_send_as_updates(
+            send_as_list['sendAs'],
+            signature_html,
+            all_aliases=all_aliases,
+            alias_signatures=alias_signatures
+        )
+
+        def patch(send_as_email: str, html: str):
+            return service.users().settings().sendAs().patch(
+                userId=user_email,
+                sendAsEmail=send_as_email,
+                body={'signature': html}
+            )
+
+        # Update the signature; a batch counts as one request per update
+        throttle(len(updates))
+        if len(updates) == 1:
+            (send_as_email, html), = updates.items()
+            with span('sendAs.patch'):
+                patch(send_as_email, html).execute()
+            return True, None
+
+        failures = []
+
+        def callback(request_id, response, exception):
+            if exception is None:
+                return
+            if isinstance(exception, HttpError):
+                failures.append(f"{request_id}: {_format_http_error(exception)}")
+            else:
+                failures.append(f"{request_id}: {exception}")
+
+        batch = service.new_batch_http_request(callback=callback)
+        for send_as_email, html in updates.items():
+            batch.add(patch(send_as_email, html), request_id=send_as_email)
+        with span('sendAs.batch_patch', identities=len(updates)):
+            batch.execute()
+
+        if failures:
+            return False, '; '.join(failures)
+        return True, None
+
+    except HttpError as error:
+        return False, _format_http_error(error)
+    except Exception as e:
+        return False, str(e)
+
+
+def patch_signature(
+    service,
+    user_email: str,
+    signature_html: str,
+    send_as_email: Optional[str] = None
+) -> Tuple[bool, Optional[str]]:
+    """
+    Set one sendAs identity's signature in a single request.
 
-        # Update the signature
-        service.users().settings().sendAs().patch(
-            userId=user_email,
-            sendAsEmail=send_as_email,
-            body={'signature': signature_html}
-        ).execute()
+    Unlike deploy_signature, the user's sendAs settings are not listed
+    first, so the identity must be known: by default the user's primary
+    address, which is always a sendAs identity.
 
+    Args:
+        service: Authenticated Gmail API service
+        user_email: User's email address
+        signature_html: HTML signature content
+        send_as_email: sendAs address to update (default: user_email)
+
+    Returns:
+        Tuple of (success: bool, error_message: Optional[str])
+    """
+    try:
+        with span('sendAs.patch'):
+            service.users().settings().sendAs().patch(
+                userId=user_email,
+                sendAsEmail=send_as_email or user_email,
+                body={'signature': signature_html}
+            ).execute()
         return True, None
 
     except HttpError as error:
-        error_msg = f"HTTP {error.resp.status}: {error.content.decode('utf-8')}"
-        return False, error_msg
+        return False, _format_http_error(error)
     except Exception as e:
         return False, str(e)
 
@@ -63,56 +218,121 @@ def get_current_signature(service, user_email: str) -> Tuple[bool, Optional[str]
         if not send_as_list.get('sendAs'):
             return False, None, "No sendAs configuration found"
 
-        # Get the primary sendAs (usually the first one)
-        primary_send_as = send_as_list['sendAs'][0]
+        # Get the primary sendAs
+        primary_send_as = get_primary_send_as(send_as_list['sendAs'])
         signature = primary_send_as.get('signature', '')
 
         return True, signature, None
 
     except HttpError as error:
-        error_msg = f"HTTP {error.resp.status}: {error.content.decode('utf-8')}"
-        return False, None, error_msg
+        return False, None, _format_http_error(error)
     except Exception as e:
         return False, None, str(e)
 
 
 def deploy_signatures_batch(
     credentials,
-    signatures: Dict[str, str],
+    signatures: Mapping[str, str],
     retry_attempts: int = 3,
     retry_delay: int = 2,
-    progress_callback: Optional[Callable[[str, bool, Optional[str]], None]] = None
+    progress_callback: Optional[Callable[[str, bool, Optional[str]], None]] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    all_aliases: bool = False,
+    alias_signatures: Optional[Dict[str, str]] = None,
+    service_cache: Optional[Dict[str, object]] = None,
+    workers: int = 1,
+    stats: Optional[Dict] = None
 ) -> Tuple[int, int, List[Dict]]:
     """
     Deploy signatures to multiple users with retry logic.
 
+    Users are deployed from a thread pool of `workers` threads (each user
+    has its own client; the rate limiter is shared), and progress_callback
+    is called from the calling thread. A failed attempt does not hold its
+    worker: the user goes into a retry queue ordered by due time
+    (`retry_delay` seconds later) and workers keep deploying other users
+    until it is due.
+
     Args:
         credentials: Base service account credentials (will impersonate each user)
-        signatures: Dictionary mapping email -> signature HTML
+        signatures: Mapping of email -> signature HTML, read by the worker
+            about to send it (so a SignatureStore loads files lazily)
         retry_attempts: Number of retry attempts on failure
         retry_delay: Delay between retries (seconds)
         progress_callback: Optional callback function(email, success, error_msg)
+        rate_limiter: Limiter shared by all requests to this tenant
+            (default: a new RateLimiter at DEFAULT_RATE)
+        all_aliases: If True, update every sendAs identity of each user
+        alias_signatures: Signatures for specific sendAs addresses
+            (lowercased email -> HTML), applied to whichever user owns them
+        service_cache: Optional dictionary of Gmail clients by user email,
+            reused across calls by long-running processes (hancock watch)
+        workers: Number of users deployed at the same time
+        stats: Optional dictionary that receives 'latencies' (seconds per
+            user spent on attempts, not waiting for retries or the rate
+            limiter), 'limiter_wait' (total seconds spent waiting for the
+            rate limiter) and 'retries' (total retry count)
 
     Returns:
-        Tuple of (success_count, failed_count, errors_list)
+        Tuple of (success_count, failed_count, errors_list), where errors
+        are {email, error, attempts} for users that used up their attempts
     """
     success_count = 0
     failed_count = 0
     errors = []
 
-    for user_email, signature_html in signatures.items():
-        # Retry logic
-        success = False
-        error_msg = None
+    if rate_limiter is None:
+        rate_limiter = RateLimiter()
+    if stats is not None:
+        stats.setdefault('latencies', [])
+        stats.setdefault('limiter_wait', 0.0)
+        stats.setdefault('retries', 0)
+
+    # Worker threads don't inherit the caller's open span, so pass it along
+    parent_span = current_span()
+
+    def attempt_user(user_email: str, number: int) -> Tuple[bool, Optional[str], float, float]:
+        with span('deploy_user', parent=parent_span, user=user_email, attempt=number) as user_span:
+            started = time.monotonic()
+
+            # Create a Gmail service impersonating this specific user, shared by
+            # all of the user's requests and retries
+            user_service = service_cache.get(user_email) if service_cache is not None else None
+            if user_service is None:
+                user_service = get_service('gmail', 'v1', credentials, user_email=user_email)
+                if service_cache is not None:
+                    service_cache[user_email] = user_service
+
+            # Every API request takes a token; time spent waiting for them
+            # is left out of the latency
+            waited = 0.0
+
+            def throttle(requests: int):
+                nonlocal waited
+                with span('rate_limit.wait', requests=requests):
+                    waited += rate_limiter.acquire(requests)
+
+            with span('attempt', number=number) as attempt_span:
+                success, error_msg = deploy_signature(
+                    user_service,
+                    user_email,
+                    signatures[user_email],
+                    all_aliases=all_aliases,
+                    alias_signatures=alias_signatures,
+                    throttle=throttle
+                )
+                if error_msg:
+                    attempt_span.set('error', error_msg)
 
-        for attempt in range(retry_attempts):
-            # Create a Gmail service impersonating this specific user
-            user_service = get_service('gmail', 'v1', credentials, user_email=user_email)
-            success, error_msg = deploy_signature(user_service, user_email, signature_html)
-            if success:
-                break
-            if attempt < retry_attempts - 1:
-                time.sleep(retry_delay)
+            user_span.set('success', success)
+            return success, error_msg, time.monotonic() - started - waited, waited
+
+    # Attempts made and seconds spent so far, per user
+    attempts = {}
+    elapsed = {}
+
+    def record(user_email: str, success: bool, error_msg: Optional[str]):
+        nonlocal success_count, failed_count
 
         if success:
             success_count += 1
@@ -120,14 +340,66 @@ def deploy_signatures_batch(
             failed_count += 1
             errors.append({
                 'email': user_email,
-                'error': error_msg
+                'error': error_msg,
+                'attempts': attempts[user_email]
             })
 
+        if stats is not None:
+            stats['latencies'].append(elapsed.pop(user_email))
+            stats['retries'] += attempts[user_email] - 1
+
         # Call progress callback if provided
         if progress_callback:
             progress_callback(user_email, success, error_msg)
 
-        # Small delay for rate limiting
-        time.sleep(0.1)
+    # Users waiting to be retried, as (due time, order, email)
+    retry_queue = []
+    order = itertools.count()
+    fresh = iter(signatures)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        while True:
+            # Fill free workers, due retries first
+            while len(running) < max(1, workers):
+                if retry_queue and retry_queue[0][0] <= time.monotonic():
+                    user_email = heapq.heappop(retry_queue)[2]
+                else:
+                    user_email = next(fresh, None)
+                    if user_email is None:
+                        break
+                attempts[user_email] = attempts.get(user_email, 0) + 1
+                future = executor.submit(attempt_user, user_email, attempts[user_email])
+                running[future] = user_email
+
+            if not running:
+                if not retry_queue:
+                    break
+                # Only retries are left: wait for the next one
+                with span('retry.wait', parent=parent_span):
+                    time.sleep(max(0.0, retry_queue[0][0] - time.monotonic()))
+                continue
+
+            # With every worker busy only a finished attempt frees one; with a
+            # free worker, wake up when the next retry is due
+            timeout = None
+            if retry_queue and len(running) < max(1, workers):
+                timeout = max(0.0, retry_queue[0][0] - time.monotonic())
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                user_email = running.pop(future)
+                try:
+                    success, error_msg, latency, waited = future.result()
+                except Exception as e:
+                    success, error_msg, latency, waited = False, str(e), 0.0, 0.0
+                elapsed[user_email] = elapsed.get(user_email, 0.0) + latency
+                if stats is not None:
+                    stats['limiter_wait'] += waited
+
+                if success or attempts[user_email] >= retry_attempts:
+                    record(user_email, success, error_msg)
+                else:
+                    due = time.monotonic() + retry_delay
+                    heapq.heappush(retry_queue, (due, next(order), user_email))
 
     return success_count, failed_count, errors
@@ -0,0 +1,232 @@
+"""Record deployments in a local SQLite database and spot slow runs."""
+
+import json
+import re
+import sqlite3
+from collections import Counter
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from typing import Dict, Iterable, List, Optional
+
+from .config import get_config_dir
+
+# History database in the config folder, shared by all profiles
+HISTORY_FILE = "history.db"
+
+# Schema version stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+# Earlier runs of a profile that make up the rolling median
+DEFAULT_WINDOW = 10
+
+# A run is flagged when its users/sec is this much below the rolling median
+REGRESSION_THRESHOLD = 0.25
+
+# Earlier runs needed before a run is compared at all
+MIN_BASELINE_RUNS = 3
+
+# Seconds to wait for another process (e.g. --all-profiles) to finish writing
+LOCK_TIMEOUT = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started TEXT NOT NULL,
+    profile TEXT,
+    version TEXT,
+    shard TEXT,
+    transport TEXT,
+    workers INTEGER,
+    users INTEGER NOT NULL,
+    deployed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    retries INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    users_per_second REAL,
+    phases TEXT NOT NULL,
+    error_classes TEXT NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_profile ON runs (profile, id);
+"""
+
+_HTTP_STATUS = re.compile(r'HTTP (\d{3})')
+
+
+def get_history_path() -> Path:
+    """Get the history database path (<config dir>/history.db)."""
+    return get_config_dir() / HISTORY_FILE
+
+
+def _connect(path: Optional[Path] = None) -> sqlite3.Connection:
+    path = Path(path) if path else get_history_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(path), timeout=LOCK_TIMEOUT)
+    connection.row_factory = sqlite3.Row
+    if connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        connection.executescript(_SCHEMA)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return connection
+
+
+def error_class(message: Optional[str]) -> str:
+    """
+    Group a deployment error message, e.g. "HTTP 429" or "Request timed out".
+
+    API errors are grouped by status code; anything else by the text before
+    the first colon.
+    """
+    match = _HTTP_STATUS.search(message or '')
+    if match:
+        return f"HTTP {match.group(1)}"
+    return (message or 'Unknown error').split(':')[0].strip()[:60]
+
+
+def count_error_classes(failures: Iterable[Dict]) -> Dict[str, int]:
+    """Count failures ({email, error}) by error_class, most common first."""
+    return dict(Counter(error_class(f.get('error')) for f in failures).most_common())
+
+
+def record_run(run: Dict, path: Optional[Path] = None) -> int:
+    """
+    Add a deployment to the history.
+
+    Args:
+        run: Dictionary with users, deployed, failed, retries, seconds and
+            phases ({phase: seconds}), and optionally profile, version,
+            shard, transport, workers, failures ({email, error}) and error
+        path: Database file (default: get_history_path())
+
+    Returns:
+        The new run's id
+    """
+    attempted = run['deployed'] + run['failed']
+    deploy_seconds = run['phases'].get('deploy')
+    row = {
+        'started': run.get('started') or datetime.now(timezone.utc).isoformat(),
+        'profile': run.get('profile'),
+        'version': run.get('version'),
+        'shard': run.get('shard'),
+        'transport': run.get('transport'),
+        'workers': run.get('workers'),
+        'users': run['users'],
+        'deployed': run['deployed'],
+        'failed': run['failed'],
+        'retries': run.get('retries', 0),
+        'seconds': run['seconds'],
+        'users_per_second': attempted / deploy_seconds if attempted and deploy_seconds else None,
+        'phases': json.dumps(run['phases']),
+        'error_classes': json.dumps(count_error_classes(run.get('failures', []))),
+        'error': run.get('error'),
+    }
+
+    columns = ', '.join(row)
+    placeholders = ', '.join(f':{column}' for column in row)
+    with closing(_connect(path)) as connection, connection:
+        cursor = connection.execute(f"INSERT INTO runs ({columns}) VALUES ({placeholders})", row)
+        return cursor.lastrowid
+
+
+def load_runs(profile: Optional[str] = None, all_profiles: bool = True, path: Optional[Path] = None) -> List[Dict]:
+    """
+    Load recorded deployments, oldest first.
+
+    Args:
+        profile: Only load runs of this profile (None is the default config)
+        all_profiles: If True, ignore profile and load every run
+        path: Database file (default: get_history_path())
+
+    Returns:
+        Runs as dictionaries with the columns of record_run, phases and
+        error_classes decoded
+    """
+    path = Path(path) if path else get_history_path()
+    if not path.exists():
+        return []
+
+    query = "SELECT * FROM runs"
+    params = ()
+    if not all_profiles:
+        query += " WHERE profile IS ?"
+        params = (profile,)
+
+    with closing(_connect(path)) as connection:
+        rows = connection.execute(query + " ORDER BY id", params).fetchall()
+
+    runs = []
+    for row in rows:
+        run = dict(row)
+        run['phases'] = json.loads(run['phases'])
+        run['error_classes'] = json.loads(run['error_classes'])
+        runs.append(run)
+    return runs
+
+
+def find_regressions(
+    runs: List[Dict],
+    window: int = DEFAULT_WINDOW,
+    threshold: float = REGRESSION_THRESHOLD
+) -> List[Dict]:
+    """
+    Compare each run's throughput with the rolling median of its profile.
+
+    Each run gets baseline (median users/sec of up to `window` earlier runs
+    of the same profile, or None with fewer than MIN_BASELINE_RUNS), change
+    (relative to the baseline, e.g. -0.4 for 40% slower), regressed (change
+    below -threshold) and previous_version (version of the profile's
+    previous run). Runs that deployed nobody are not compared and do not
+    count towards later baselines.
+
+    Args:
+        runs: Runs from load_runs, oldest first
+        window: Earlier runs in the rolling median
+        threshold: Slowdown flagged as a regression (0.25 is 25% slower)
+
+    Returns:
+        The same runs, annotated
+    """
+    earlier = {}
+    for run in runs:
+        history = earlier.setdefault(run['profile'], [])
+        speeds = [r['users_per_second'] for r in history[-window:]]
+
+        run['previous_version'] = history[-1]['version'] if history else None
+        run['baseline'] = median(speeds) if len(speeds) >= MIN_BASELINE_RUNS else None
+        run['change'] = None
+        run['regressed'] = False
+        if run['baseline'] and run['users_per_second'] is not None:
+            run['change'] = run['users_per_second'] / run['baseline'] - 1
+            run['regressed'] = run['change'] < -threshold
+
+        if run['users_per_second'] is not None:
+            history.append(run)
+    return runs
+
+
+def slowest_phase(run: Dict, runs: List[Dict], window: int = DEFAULT_WINDOW) -> Optional[Dict]:
+    """
+    Find the phase of a run that grew the most against earlier runs.
+
+    Phase times are compared per user, with the median of up to `window`
+    earlier runs of the same profile.
+
+    Returns:
+        Dictionary with phase, seconds and baseline (seconds the phase
+        would have taken at the median rate), or None without earlier runs
+    """
+    earlier = [r for r in runs if r['profile'] == run['profile'] and r['id'] < run['id'] and r['users']]
+    earlier = earlier[-window:]
+    if not earlier or not run['users']:
+        return None
+
+    worst = None
+    for phase, seconds in run['phases'].items():
+        rates = [r['phases'][phase] / r['users'] for r in earlier if phase in r['phases']]
+        if not rates:
+            continue
+        baseline = median(rates) * run['users']
+        if worst is None or seconds - baseline > worst['seconds'] - worst['baseline']:
+            worst = {'phase': phase, 'seconds': seconds, 'baseline': baseline}
+    return worst
@@ -0,0 +1,96 @@
+"""Move embedded base64 images out of signatures into shared hosted files."""
+
+import base64
+import binascii
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+# data: URIs for images, as found in src="..." attributes or CSS url(...)
+DATA_IMAGE_PATTERN = re.compile(
+    r'data:image/([a-z0-9.+-]+);base64,([A-Za-z0-9+/=\s]+)',
+    re.IGNORECASE
+)
+
+# File extensions for image MIME subtypes
+IMAGE_EXTENSIONS = {
+    'png': 'png',
+    'jpeg': 'jpg',
+    'jpg': 'jpg',
+    'pjpeg': 'jpg',
+    'gif': 'gif',
+    'webp': 'webp',
+    'bmp': 'bmp',
+    'svg+xml': 'svg',
+    'x-icon': 'ico',
+    'vnd.microsoft.icon': 'ico',
+}
+
+# Length of the content hash used in image file names
+DIGEST_LENGTH = 16
+
+
+class ImageExtractor:
+    """
+    Replace base64 data: images with links to content-addressed files.
+
+    Every image is decoded and named after the hash of its bytes, so the
+    same logo embedded in 5,000 signatures is written once and all of them
+    link to the same URL. Calling the extractor on HTML returns the
+    rewritten HTML; it can be used as a signature transform.
+
+    The extractor only holds its settings, so it can be sent to worker
+    processes. Files are written atomically and skipped when they already
+    exist, so concurrent workers never produce partial images.
+    """
+
+    def __init__(self, base_url: str, output_dir: Optional[Path] = None):
+        """
+        Args:
+            base_url: Public URL the images will be hosted under
+            output_dir: Folder to write image files to (skipped when None,
+                e.g. when the images are already hosted)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.output_dir = Path(output_dir).expanduser() if output_dir else None
+
+    def __call__(self, html: str) -> str:
+        return DATA_IMAGE_PATTERN.sub(self._replace, html)
+
+    def _replace(self, match) -> str:
+        subtype = match.group(1).lower()
+        extension = IMAGE_EXTENSIONS.get(subtype)
+        if extension is None:
+            return match.group(0)
+
+        try:
+            data = base64.b64decode(re.sub(r'\s+', '', match.group(2)), validate=True)
+        except (binascii.Error, ValueError):
+            # Leave malformed images alone rather than breaking the signature
+            return match.group(0)
+
+        filename = f"{hashlib.sha256(data).hexdigest()[:DIGEST_LENGTH]}.{extension}"
+        if self.output_dir is not None:
+            self._write(filename, data)
+
+        return f"{self.base_url}/{filename}"
+
+    def _write(self, filename: str, data: bytes):
+        """Write an image file once, atomically."""
+        path = self.output_dir / filename
+        if path.exists():
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.output_dir), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, str(path))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,198 @@
+"""Single-pass linting of signature HTML."""
+
+import hashlib
+import re
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import Dict
+
+# Tags Gmail strips or that make no sense in a signature
+DISALLOWED_TAGS = (
+    'script', 'iframe', 'frame', 'frameset', 'object', 'embed', 'applet',
+    'form', 'input', 'button', 'select', 'textarea', 'video', 'audio',
+)
+
+# Elements that never have an end tag
+VOID_TAGS = (
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr',
+)
+
+# Elements whose end tag may be left out (closed implicitly by the parser)
+OPTIONAL_END_TAGS = (
+    'html', 'head', 'body', 'p', 'li', 'dt', 'dd', 'tr', 'td', 'th',
+    'thead', 'tbody', 'tfoot', 'option', 'colgroup', 'caption',
+)
+
+# Number of lint results kept in the per-process cache
+CACHE_SIZE = 4096
+
+_CSS_URL_PATTERN = re.compile(r'url\(\s*(["\']?)(.*?)\1\s*\)', re.IGNORECASE | re.DOTALL)
+_SRCSET_CANDIDATE_PATTERN = re.compile(r'\s*(data:[^,\s]*,[^,\s]*|[^,\s]+)(?:\s+[^,]*)?(?:,|$)')
+
+_cache = OrderedDict()
+
+
+class SignatureLinter(HTMLParser):
+    """
+    Collect every signature check in one traversal of the markup.
+
+    Content can be fed in chunks; call close() before reading the results.
+
+    Attributes:
+        images: Image URLs from src, srcset and CSS url(...), in document
+            order; data: URIs are kept as their header (e.g.
+            "data:image/png;base64") rather than the full payload
+        links: Link targets from <a href>
+        errors: Problems that make the signature unusable
+        warnings: Problems that are likely to display badly
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.images = []
+        self.links = []
+        self.errors = []
+        self.warnings = []
+        self.has_text = False
+        self._open = []
+        self._in_style = False
+
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs)
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+        if tag == 'style':
+            self._in_style = True
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs)
+
+    def _start(self, tag, attrs):
+        if tag in DISALLOWED_TAGS:
+            self._error(f"Disallowed tag <{tag}>")
+
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name == 'style':
+                self._scan_css(value)
+            elif tag == 'img' and name == 'src':
+                self._add_image(value)
+            elif tag in ('img', 'source') and name == 'srcset':
+                for match in _SRCSET_CANDIDATE_PATTERN.finditer(value):
+                    if match.group(1):
+                        self._add_image(match.group(1))
+            elif name == 'background':
+                self._add_image(value)
+            elif tag == 'a' and name == 'href':
+                self._add_link(value)
+            elif name.startswith('on'):
+                self._error(f"Event handler attribute {name} on <{tag}>")
+
+    def handle_endtag(self, tag):
+        if tag == 'style':
+            self._in_style = False
+        if tag in VOID_TAGS:
+            return
+        if tag not in self._open:
+            self._warning(f"Unexpected closing tag </{tag}>")
+            return
+
+        # Everything opened after the matching tag is closed with it
+        while True:
+            opened = self._open.pop()
+            if opened == tag:
+                break
+            if opened not in OPTIONAL_END_TAGS:
+                self._warning(f"Unclosed tag <{opened}>")
+
+    def handle_data(self, data):
+        if self._in_style:
+            self._scan_css(data)
+        elif not self.has_text and data.strip():
+            self.has_text = True
+
+    def close(self):
+        super().close()
+        for opened in reversed(self._open):
+            if opened not in OPTIONAL_END_TAGS:
+                self._warning(f"Unclosed tag <{opened}>")
+        self._open = []
+
+    def _scan_css(self, css: str):
+        for match in _CSS_URL_PATTERN.finditer(css):
+            self._add_image(match.group(2))
+
+    def _add_image(self, url: str):
+        url = url.strip()
+        if not url:
+            self._warning("Image with empty source")
+            return
+        if url[:5].lower() == 'data:':
+            self.images.append(url.split(',', 1)[0])
+            return
+        self.images.append(url)
+        if not url.lower().startswith(('http://', 'https://', '//', 'cid:')):
+            self._warning(f"Relative image path {url[:60]} will not load in email")
+
+    def _add_link(self, url: str):
+        url = url.strip()
+        self.links.append(url)
+        if url.lower().startswith('javascript:'):
+            self._error("javascript: link")
+
+    def _error(self, message: str):
+        if message not in self.errors:
+            self.errors.append(message)
+
+    def _warning(self, message: str):
+        if message not in self.warnings:
+            self.warnings.append(message)
+
+
+def lint_signature(content: str) -> Dict:
+    """
+    Lint signature HTML.
+
+    Results are cached by content hash, so identical signatures are only
+    parsed once per process.
+
+    Args:
+        content: Signature HTML
+
+    Returns:
+        Dictionary with:
+        - errors: List of problems that make the signature unusable
+        - warnings: List of problems that may display badly
+        - images: Image URLs (src, srcset, CSS url(...))
+        - links: Link targets
+        - has_content: Whether there is any visible text or image
+    """
+    key = hashlib.sha256(content.encode('utf-8', 'surrogatepass')).digest()
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return _copy_result(cached)
+
+    linter = SignatureLinter()
+    linter.feed(content)
+    linter.close()
+
+    result = {
+        'errors': linter.errors,
+        'warnings': linter.warnings,
+        'images': linter.images,
+        'links': linter.links,
+        'has_content': linter.has_text or bool(linter.images),
+    }
+
+    _cache[key] = result
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return _copy_result(result)
+
+
+def _copy_result(result: Dict) -> Dict:
+    """Copy a cached result so callers can modify their lists."""
+    return {k: list(v) if isinstance(v, list) else v for k, v in result.items()}
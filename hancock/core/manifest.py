@@ -0,0 +1,217 @@
+"""Explicit email -> signature file mappings (manifests)."""
+
+import csv
+import fnmatch
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+from .bundle import BundleMember, is_bundle_path
+from .matching import validate_signature_files
+from .shard import in_shard
+
+# Characters that turn a manifest email into a glob pattern
+PATTERN_CHARS = '*?['
+
+
+def iter_manifest_rows(manifest_path: Path) -> Iterator[Tuple[int, str, str]]:
+    """
+    Stream (line, email, file) rows from a manifest.
+
+    CSV manifests are read row by row with an optional "email,file" header.
+    YAML manifests are either a list of {email, file} mappings or a single
+    email -> file mapping; YAML is parsed in one go, so use CSV for very
+    large manifests.
+
+    Args:
+        manifest_path: Path to a .csv, .yaml or .yml manifest
+
+    Yields:
+        Tuples of (line_number, email, file). Malformed rows are yielded
+        with an empty email or file so callers can report them.
+    """
+    if manifest_path.suffix.lower() in ('.yaml', '.yml'):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or []
+
+        if isinstance(data, dict):
+            data = [{'email': k, 'file': v} for k, v in data.items()]
+        if not isinstance(data, list):
+            raise ValueError(f"Manifest must be a list or mapping: {manifest_path}")
+
+        for number, item in enumerate(data, 1):
+            if not isinstance(item, dict):
+                yield number, '', ''
+                continue
+            yield number, str(item.get('email') or '').strip(), str(item.get('file') or '').strip()
+        return
+
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        for row in reader:
+            if not row or not ''.join(row).strip() or row[0].lstrip().startswith('#'):
+                continue
+            if reader.line_num == 1 and row[0].strip().lower() == 'email':
+                continue
+            if len(row) < 2:
+                yield reader.line_num, row[0].strip(), ''
+                continue
+            yield reader.line_num, row[0].strip(), row[1].strip()
+
+
+def match_manifest_to_users(
+    manifest_path: Path,
+    signatures_folder: Path,
+    users: List[Dict],
+    transform: Optional[Callable[[str], str]] = None,
+    workers: Optional[int] = None,
+    shard: Optional[Tuple[int, int]] = None
+) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Map users to signature files through an explicit manifest.
+
+    Rows are streamed and joined against a user index keyed by email, so no
+    filename heuristics are involved. Each referenced file is validated only
+    once, however many users share it, and validation runs in parallel
+    across files (see validate_signature_files).
+
+    Rows whose email contains glob characters (e.g. "*@sales.example.com")
+    are pattern rules. They apply, in manifest order, to users no explicit
+    row mentions and whose resolved file exists. The file of a pattern rule
+    may use {email}, {local} and {domain} placeholders, e.g. "{local}.html".
+
+    Args:
+        manifest_path: Path to a CSV or YAML manifest (see iter_manifest_rows)
+        signatures_folder: Folder (or bundle) that relative file paths are resolved against
+        users: List of user dictionaries from Directory API
+        transform: Optional function applied to each file's HTML before
+            validation (see validate_signature_file)
+        workers: Processes used to validate files
+        shard: Optional (index, count) from parse_shard; files of users in
+            other shards are not validated or returned
+
+    Returns:
+        Tuple of (matched, unmatched, errors) in the same format as
+        match_signatures_to_users. Rows naming unknown users are unmatched.
+    """
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+
+    users_by_email = {}
+    for user_data in users:
+        email = user_data.get('email')
+        if email:
+            users_by_email[email.lower()] = user_data
+
+    matched = []
+    unmatched = []
+    errors = []
+    assigned = set()
+    patterns = []
+    assignments = []  # (user_data, file_path, label), validated at the end
+    files = {}  # file_path -> position in the validation batch
+
+    base_bundle = str(signatures_folder) if is_bundle_path(signatures_folder) else None
+
+    def resolve(file_name: str):
+        if base_bundle:
+            return BundleMember(base_bundle, file_name.replace('\\', '/'))
+        path = Path(file_name).expanduser()
+        if not path.is_absolute():
+            path = signatures_folder / path
+        return path
+
+    def assign(user_data: Dict, file_path, label: str):
+        if not in_shard(user_data['email'], shard):
+            return
+        files.setdefault(file_path, len(files))
+        assignments.append((user_data, file_path, label))
+
+    for line, email, file_name in iter_manifest_rows(manifest_path):
+        if not email or not file_name:
+            errors.append({
+                'filename': file_name or f"line {line}",
+                'path': str(manifest_path),
+                'error': f"Line {line}: expected 'email,file'"
+            })
+            continue
+
+        if any(c in email for c in PATTERN_CHARS):
+            patterns.append((email.lower(), file_name))
+            continue
+
+        if '@' not in email:
+            errors.append({
+                'filename': file_name,
+                'path': str(manifest_path),
+                'error': f"Line {line}: invalid email '{email}'"
+            })
+            continue
+
+        key = email.lower()
+        if key in assigned:
+            errors.append({
+                'filename': file_name,
+                'path': str(manifest_path),
+                'error': f"Line {line}: duplicate mapping for {email}"
+            })
+            continue
+
+        user_data = users_by_email.get(key)
+        if user_data is None:
+            unmatched.append({
+                'filename': file_name,
+                'path': str(resolve(file_name)),
+                'reason': f"No user {email}"
+            })
+            continue
+
+        assigned.add(key)
+        assign(user_data, resolve(file_name), file_name)
+
+    if patterns:
+        for key, user_data in users_by_email.items():
+            if key in assigned or not in_shard(key, shard):
+                continue
+            file_name = _match_pattern(key, patterns)
+            if not file_name:
+                continue
+            # Pattern rules only cover users whose file actually exists
+            file_path = resolve(file_name)
+            if file_path in files or file_path.exists():
+                assign(user_data, file_path, file_name)
+
+    results = validate_signature_files(list(files), transform, workers)
+
+    for user_data, file_path, label in assignments:
+        is_valid, error_msg, info = results[files[file_path]]
+
+        if not is_valid:
+            errors.append({
+                'filename': label,
+                'path': str(file_path),
+                'error': error_msg
+            })
+            continue
+
+        matched.append({
+            'filename': file_path.name,
+            'email': user_data['email'],
+            'name': user_data.get('name', ''),
+            'path': str(file_path),
+            'size': info['size'],
+            'info': info,
+            'match_type': 'manifest',
+        })
+
+    return matched, unmatched, errors
+
+
+def _match_pattern(email: str, patterns: List[Tuple[str, str]]) -> Optional[str]:
+    """Return the file of the first pattern rule matching an email, if any."""
+    for pattern, file_template in patterns:
+        if fnmatch.fnmatchcase(email, pattern):
+            local, _, domain = email.partition('@')
+            return file_template.format(email=email, local=local, domain=domain)
+    return None
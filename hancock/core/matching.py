@@ -1,16 +1,34 @@
 """Signature file to user matching logic."""
 
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Tuple, Optional, Sequence, Union
+
+from .lint import lint_signature
+from .shard import in_shard
 
 # Gmail signature size limit (approximately 10KB)
 MAX_SIGNATURE_SIZE = 10 * 1024  # 10KB in bytes
 
+# Batches smaller than this are validated without a process pool
+PARALLEL_VALIDATION_THRESHOLD = 256
+
+# Matching strategies, see user_match_keys
+MATCH_STRATEGIES = ('email', 'name', 'combo', 'alias')
+
+# Strategy priority used to resolve conflicts, highest first
+DEFAULT_MATCH_PRIORITY = MATCH_STRATEGIES
+
+# Per-address signature files, named after a sendAs email (see find_alias_files)
+ALIAS_FILE_PATTERNS = ('*@*.html', '*@*.htm')
+
 
 def normalize_name(name: str) -> str:
     """
     Normalize a name for matching purposes.
+    - Remove directory and .html/.htm extension
     - Remove 'sig' suffix
     - Convert to lowercase
     - Remove special characters
@@ -22,8 +40,9 @@ def normalize_name(name: str) -> str:
     Returns:
         Normalized string for matching
     """
-    # Remove file extension
-    name = Path(name).stem
+    # Remove directory and file extension. Only HTML extensions are stripped
+    # so dotted email prefixes like "john.smith" keep their last part.
+    name = re.sub(r'\.html?$', '', Path(name).name, flags=re.IGNORECASE)
 
     # Remove 'sig' or 'signature' suffix (case insensitive)
     name = re.sub(r'(sig|signature)$', '', name, flags=re.IGNORECASE)
@@ -43,198 +62,653 @@ def normalize_name(name: str) -> str:
     return name
 
 
-def match_filename_to_user(filename: str, user_data: Dict) -> bool:
+def user_match_keys(user_data: Dict) -> List[Tuple[str, str]]:
     """
-    Check if a filename matches a user's data.
+    Build the normalized keys a signature filename may match for a user.
 
-    Tries multiple matching strategies:
-    1. Email prefix (before @)
-    2. Full name
-    3. First + last name combinations
+    Keys are returned in matching priority order, each tagged with the
+    strategy that produced it:
+    1. 'email' - email prefix (before @)
+    2. 'name' - full name
+    3. 'combo' - first + last name combinations
+    4. 'alias' - email alias prefixes
 
     Args:
-        filename: Signature filename (with or without extension)
-        user_data: User data dictionary with email, name, first_name, last_name
+        user_data: User data dictionary with email, name, first_name, last_name, aliases
 
     Returns:
-        True if filename matches user, False otherwise
+        List of (strategy, normalized_key) tuples without duplicates
     """
-    normalized_filename = normalize_name(filename)
+    # Precomputed by UserRecord, as a flat (strategy, key, ...) tuple
+    cached = getattr(user_data, 'match_keys', None)
+    if cached is not None:
+        return list(zip(cached[::2], cached[1::2]))
 
-    # Strategy 1: Match email prefix
+    keys = []
+    seen = set()
+
+    def add(strategy: str, value: str):
+        key = normalize_name(value)
+        if key and (strategy, key) not in seen:
+            seen.add((strategy, key))
+            keys.append((strategy, key))
+
+    # Strategy 1: Email prefix
     email = user_data.get('email', '')
     if email:
-        email_prefix = email.split('@')[0].lower()
-        normalized_email = normalize_name(email_prefix)
-        if normalized_filename == normalized_email:
-            return True
+        add('email', email.split('@')[0].lower())
 
-    # Strategy 2: Match full name
+    # Strategy 2: Full name
     full_name = user_data.get('name', '')
     if full_name:
-        normalized_name_val = normalize_name(full_name)
-        if normalized_filename == normalized_name_val:
-            return True
+        add('name', full_name)
 
-    # Strategy 3: Match first + last name
+    # Strategy 3: First + last name combinations
     first_name = user_data.get('first_name', '').lower()
     last_name = user_data.get('last_name', '').lower()
 
     if first_name and last_name:
-        # Try various combinations
-        combinations = [
+        for combo in (
             f"{first_name} {last_name}",
             f"{first_name}{last_name}",
             f"{last_name} {first_name}",
             f"{last_name}{first_name}",
-        ]
+        ):
+            add('combo', combo)
 
-        for combo in combinations:
-            normalized_combo = normalize_name(combo)
-            if normalized_filename == normalized_combo:
-                return True
+    # Strategy 4: Email aliases
+    for alias in user_data.get('aliases', []) or []:
+        add('alias', alias.split('@')[0].lower())
 
-    return False
+    return keys
 
 
-def validate_signature_file(file_path: Path) -> Tuple[bool, Optional[str], Dict]:
+def match_filename_to_user(filename: str, user_data: Dict) -> bool:
     """
-    Validate a signature HTML file.
+    Check if a filename matches a user's data.
 
-    Checks:
-    - File exists and is readable
-    - File size is within limits
-    - Contains HTML content
-    - Analyzes image usage (base64 vs external URLs)
+    Tries multiple matching strategies:
+    1. Email prefix (before @)
+    2. Full name
+    3. First + last name combinations
+    4. Email aliases
 
     Args:
-        file_path: Path to signature HTML file
+        filename: Signature filename (with or without extension)
+        user_data: User data dictionary with email, name, first_name, last_name
 
     Returns:
-        Tuple of (is_valid, error_message, info_dict)
+        True if filename matches user, False otherwise
     """
-    info = {
+    normalized_filename = normalize_name(filename)
+    if not normalized_filename:
+        return False
+
+    return any(key == normalized_filename for _, key in user_match_keys(user_data))
+
+
+def _empty_info() -> Dict:
+    """Validation info before anything is known about a file."""
+    return {
         'size': 0,
         'has_base64_images': False,
         'has_external_images': False,
         'external_image_urls': [],
+        'images': [],
+        'links': [],
+        'warnings': [],
     }
 
-    # Check file exists
-    if not file_path.exists():
-        return False, f"File not found: {file_path}", info
 
-    # Check file is readable
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except Exception as e:
-        return False, f"Could not read file: {e}", info
+def validate_signature_content(data: Union[bytes, memoryview, str]) -> Tuple[bool, Optional[str], Dict]:
+    """
+    Validate signature HTML content.
+
+    Raw bytes (including memoryview slices of a bundle) are size-checked
+    before anything is decoded or copied.
+
+    Checks:
+    - Size is within limits
+    - Content is valid UTF-8 and has visible text or images
+    - Markup has no disallowed tags or scripts (see hancock.core.lint)
+    - Analyzes image usage (base64 vs external URLs, including srcset
+      and CSS backgrounds); other markup problems go to info['warnings']
+
+    Args:
+        data: Signature content as UTF-8 bytes or text
+
+    Returns:
+        Tuple of (is_valid, error_message, info_dict)
+    """
+    info = _empty_info()
+
+    # Check size
+    if isinstance(data, str):
+        content = data
+        file_size = len(content.encode('utf-8'))
+    else:
+        file_size = len(data)
 
-    # Check file size
-    file_size = len(content.encode('utf-8'))
     info['size'] = file_size
 
     if file_size > MAX_SIGNATURE_SIZE:
         return False, f"File size ({file_size} bytes) exceeds limit ({MAX_SIGNATURE_SIZE} bytes)", info
 
-    # Basic HTML validation
-    if not content.strip():
+    if not isinstance(data, str):
+        try:
+            content = str(data, 'utf-8')
+        except UnicodeDecodeError as e:
+            return False, f"Could not read file: {e}", info
+
+    # Lint the markup in a single pass
+    lint = lint_signature(content)
+    info['images'] = lint['images']
+    info['links'] = lint['links']
+    info['warnings'] = lint['warnings']
+
+    for url in lint['images']:
+        if url.lower().startswith('data:image'):
+            info['has_base64_images'] = True
+        elif url.startswith(('http://', 'https://', '//')):
+            info['has_external_images'] = True
+            info['external_image_urls'].append(url)
+
+    if not lint['has_content']:
         return False, "File is empty", info
 
-    # Analyze images
-    # Check for base64 encoded images
-    if 'data:image' in content:
-        info['has_base64_images'] = True
+    if lint['errors']:
+        return False, '; '.join(lint['errors']), info
 
-    # Check for external image URLs (img src with http/https)
-    img_pattern = r'<img[^>]+src=["\']([^"\']+)["\']'
-    img_matches = re.findall(img_pattern, content, re.IGNORECASE)
+    return True, None, info
 
-    for img_src in img_matches:
-        if img_src.startswith(('http://', 'https://', '//')):
-            info['has_external_images'] = True
-            info['external_image_urls'].append(img_src)
 
-    return True, None, info
+def validate_signature_file(
+    file_path,
+    transform: Optional[Callable[[str], str]] = None
+) -> Tuple[bool, Optional[str], Dict]:
+    """
+    Validate a signature HTML file.
+
+    Checks:
+    - File exists and is readable
+    - Everything validate_signature_content checks, after transform
+
+    Args:
+        file_path: Path to signature HTML file, or a bundle member
+            (see hancock.core.bundle)
+        transform: Optional function applied to the HTML before validation
+            (e.g. an ImageExtractor); info['original_size'] keeps the size
+            before it ran
+
+    Returns:
+        Tuple of (is_valid, error_message, info_dict)
+    """
+    from .scanner import read_signature_bytes
+
+    try:
+        data = read_signature_bytes(file_path)
+    except FileNotFoundError:
+        return False, f"File not found: {file_path}", _empty_info()
+    except Exception as e:
+        return False, f"Could not read file: {e}", _empty_info()
+
+    if transform is None:
+        is_valid, error_msg, info = validate_signature_content(data)
+        info['original_size'] = info['size']
+        return is_valid, error_msg, info
+
+    try:
+        content = transform(str(data, 'utf-8'))
+    except UnicodeDecodeError as e:
+        return False, f"Could not read file: {e}", _empty_info()
+
+    is_valid, error_msg, info = validate_signature_content(content)
+    info['original_size'] = len(data)
+    return is_valid, error_msg, info
+
+
+def validate_signature_files(
+    file_paths: Sequence,
+    transform: Optional[Callable[[str], str]] = None,
+    workers: Optional[int] = None
+) -> List[Tuple[bool, Optional[str], Dict]]:
+    """
+    Validate many signature files, in parallel when it pays off.
+
+    Large batches are spread over a process pool so reading, transforming
+    (e.g. minifying) and checking files uses every core. Small batches are
+    validated inline, where starting processes would cost more than it saves.
+
+    Args:
+        file_paths: Files or bundle members to validate
+        transform: Optional picklable function applied before validation
+        workers: Number of worker processes (default: CPU count; 1 disables
+            the pool)
+
+    Returns:
+        List of (is_valid, error_message, info_dict), in file_paths order
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(file_paths) < PARALLEL_VALIDATION_THRESHOLD:
+        return [validate_signature_file(path, transform) for path in file_paths]
+
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            validate_signature_file,
+            file_paths,
+            [transform] * len(file_paths),
+            chunksize=chunksize
+        ))
+
+
+def build_match_index(
+    users: List[Dict],
+    priority: Sequence[str] = DEFAULT_MATCH_PRIORITY
+) -> Dict[str, List[Tuple[int, Dict]]]:
+    """
+    Build an inverted index from normalized match key to users.
+
+    Args:
+        users: List of user dictionaries from Directory API
+        priority: Matching strategies to use, highest priority first
+
+    Returns:
+        Dictionary mapping key -> list of (rank, user_data), where rank is the
+        position of the strategy that produced the key in priority
+    """
+    ranks = {strategy: rank for rank, strategy in enumerate(priority)}
+    index = {}
+
+    for user_data in users:
+        if not user_data.get('email'):
+            continue
+        for strategy, key in user_match_keys(user_data):
+            rank = ranks.get(strategy)
+            if rank is not None:
+                index.setdefault(key, []).append((rank, user_data))
+
+    return index
 
 
 def match_signatures_to_users(
-    signatures_folder: Path,
-    users: List[Dict]
+    signatures_folder: Union[Path, Sequence[Path]],
+    users: List[Dict],
+    fuzzy: bool = False,
+    fuzzy_threshold: Optional[float] = None,
+    priority: Sequence[str] = DEFAULT_MATCH_PRIORITY,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    recursive: bool = False,
+    transform: Optional[Callable[[str], str]] = None,
+    workers: Optional[int] = None,
+    shard: Optional[Tuple[int, int]] = None
 ) -> Tuple[List[Dict], List[Dict], List[Dict]]:
     """
     Match signature HTML files to users.
 
+    Files are looked up in an inverted index of user match keys (see
+    build_match_index), so every file and user is visited once. Collisions
+    are resolved deterministically:
+    - A file matching several users takes the user from the highest
+      priority strategy; a tie at that level is reported as an error and
+      the file is not deployed.
+    - A user matched by several files keeps the file from the highest
+      priority strategy (then alphabetical filename and path); the others
+      are reported as unmatched with the reason.
+
+    Files are streamed from disk (see hancock.core.scanner), so only files
+    that matched or are left over are kept in memory.
+
+    With fuzzy=True, files left over are then matched against the remaining
+    users through a trigram index (see hancock.core.fuzzy); ambiguous
+    fuzzy results are reported as unmatched with the candidates listed.
+
     Args:
-        signatures_folder: Path to folder containing signature HTML files
+        signatures_folder: Folder or bundle (or a list of them) containing
+            signature HTML files
         users: List of user dictionaries from Directory API
+        fuzzy: Enable the fuzzy matching tier
+        fuzzy_threshold: Minimum fuzzy similarity score (0-1)
+        priority: Matching strategies to use, highest priority first
+            (any of 'email', 'name', 'combo', 'alias')
+        include: File patterns to pick up (default: *.html, *.htm)
+        exclude: File or directory patterns to skip
+        recursive: Also scan subfolders
+        transform: Optional function applied to each matched file's HTML
+            before validation (see validate_signature_file)
+        workers: Processes used to validate matched files
+            (see validate_signature_files)
+        shard: Optional (index, count) from parse_shard; only users in this
+            shard are validated and returned as matched, while files are
+            still matched against every user so that unmatched files and
+            conflicts are reported the same way by every shard
 
     Returns:
         Tuple of (matched, unmatched, errors)
-        - matched: List of dicts with {filename, email, name, path, size, info}
-        - unmatched: List of dicts with {filename, path}
-        - errors: List of dicts with {filename, path, error}
+        - matched: List of dicts with {filename, email, name, path, size, info, match_type}
+        - unmatched: List of dicts with {filename, path} and an optional reason
+        - errors: List of dicts with {filename, path, error} and, for files
+          matching several users, conflict (list of emails)
+    """
+    from .scanner import iter_signature_files
+    from .bundle import is_bundle_path
+
+    if isinstance(signatures_folder, (str, Path)):
+        signatures_folder = [signatures_folder]
+    roots = [Path(root) for root in signatures_folder]
+    for root in roots:
+        if not root.exists():
+            raise FileNotFoundError(f"Signatures folder not found: {root}")
+
+        if not root.is_dir() and not is_bundle_path(root):
+            raise NotADirectoryError(f"Path is not a directory: {root}")
+
+    matched, unmatched, errors = match_files_to_users(
+        iter_signature_files(roots, include, exclude, recursive=recursive),
+        users,
+        fuzzy=fuzzy,
+        fuzzy_threshold=fuzzy_threshold,
+        priority=priority,
+        transform=transform,
+        workers=workers,
+        shard=shard
+    )
+
+    # Every file ends up in exactly one of the lists (or another shard)
+    if not (matched or unmatched or errors or shard):
+        raise ValueError(f"No HTML files found in {', '.join(str(r) for r in roots)}")
+
+    return matched, unmatched, errors
+
+
+def match_files_to_users(
+    file_paths: Iterable,
+    users: List[Dict],
+    fuzzy: bool = False,
+    fuzzy_threshold: Optional[float] = None,
+    priority: Sequence[str] = DEFAULT_MATCH_PRIORITY,
+    transform: Optional[Callable[[str], str]] = None,
+    workers: Optional[int] = None,
+    index: Optional[Dict[str, List[Tuple[int, Dict]]]] = None,
+    shard: Optional[Tuple[int, int]] = None
+) -> Tuple[List[Dict], List[Dict], List[Dict]]:
     """
-    if not signatures_folder.exists():
-        raise FileNotFoundError(f"Signatures folder not found: {signatures_folder}")
+    Match given signature files to users (see match_signatures_to_users).
 
-    if not signatures_folder.is_dir():
-        raise NotADirectoryError(f"Path is not a directory: {signatures_folder}")
+    Args:
+        file_paths: Signature files or bundle members, consumed once
+        users: List of user dictionaries from Directory API
+        fuzzy: Enable the fuzzy matching tier
+        fuzzy_threshold: Minimum fuzzy similarity score (0-1)
+        priority: Matching strategies to use, highest priority first
+        transform: Optional function applied to each matched file's HTML
+            before validation
+        workers: Processes used to validate matched files
+        index: Prebuilt build_match_index(users, priority), to skip
+            rebuilding it when matching repeatedly against the same users
+        shard: Optional (index, count); only users in this shard are
+            validated and returned as matched
 
-    # Get all HTML files
-    html_files = list(signatures_folder.glob('*.html')) + list(signatures_folder.glob('*.htm'))
+    Returns:
+        Tuple of (matched, unmatched, errors) as for match_signatures_to_users
+    """
+    unknown = set(priority) - set(MATCH_STRATEGIES)
+    if unknown:
+        raise ValueError(f"Unknown matching strategies: {', '.join(sorted(unknown))}")
 
-    if not html_files:
-        raise ValueError(f"No HTML files found in {signatures_folder}")
+    if index is None:
+        index = build_match_index(users, priority)
 
-    matched = []
     errors = []
-    matched_files = set()
+    leftover = []  # files with no exact match, in discovery order
+    duplicates = []  # (path, reason) for files losing a one-to-many conflict
+    user_files = {}  # email -> list of (rank, filename, path)
+
+    # Single pass over files: resolve each file to at most one user
+    for file_path in file_paths:
+        candidates = index.get(normalize_name(file_path.name))
+        if not candidates:
+            leftover.append(file_path)
+            continue
 
-    # Match files to users
+        best_rank = min(rank for rank, _ in candidates)
+        best_users = {}
+        for rank, user_data in candidates:
+            if rank == best_rank:
+                best_users.setdefault(user_data['email'], user_data)
+
+        if len(best_users) > 1:
+            emails = list(best_users)
+            errors.append({
+                'filename': file_path.name,
+                'path': str(file_path),
+                'error': f"Matches multiple users: {', '.join(emails)}",
+                'conflict': emails,
+            })
+            continue
+
+        user_email = next(iter(best_users))
+        user_files.setdefault(user_email, []).append((best_rank, file_path.name, file_path))
+
+    # Resolve users claimed by several files
+    winners = []
+    matched_emails = set()
     for user_data in users:
         user_email = user_data.get('email')
-        if not user_email:
+        if not user_email or user_email in matched_emails or user_email not in user_files:
             continue
 
-        # Try to find a matching file
-        matched_file = None
-        for file_path in html_files:
-            if match_filename_to_user(file_path.name, user_data):
-                matched_file = file_path
-                break
-
-        if matched_file:
-            # Validate the file
-            is_valid, error_msg, info = validate_signature_file(matched_file)
-
-            if not is_valid:
-                errors.append({
-                    'filename': matched_file.name,
-                    'path': str(matched_file),
-                    'error': error_msg
-                })
-                continue
-
-            # Add to matched list
-            matched.append({
+        choices = sorted(user_files[user_email], key=lambda c: (c[0], c[1], str(c[2])))
+        matched_file = choices[0][2]
+        for _, _, other in choices[1:]:
+            duplicates.append((other, f"Duplicate for {user_email} (using {matched_file})"))
+
+        matched_emails.add(user_email)
+        winners.append((user_data, matched_file))
+
+    # Other shards validate and deploy their own users
+    if shard:
+        winners = [(u, f) for u, f in winners if in_shard(u['email'], shard)]
+
+    # Validate each winning file once
+    matched = []
+    results = validate_signature_files([f for _, f in winners], transform, workers)
+    for (user_data, matched_file), (is_valid, error_msg, info) in zip(winners, results):
+        if not is_valid:
+            errors.append({
                 'filename': matched_file.name,
-                'email': user_email,
-                'name': user_data.get('name', ''),
                 'path': str(matched_file),
-                'size': info['size'],
-                'info': info
+                'error': error_msg
             })
-            matched_files.add(matched_file)
+            continue
 
-    # Find unmatched files
+        # Add to matched list
+        matched.append({
+            'filename': matched_file.name,
+            'email': user_data['email'],
+            'name': user_data.get('name', ''),
+            'path': str(matched_file),
+            'size': info['size'],
+            'info': info,
+            'match_type': 'exact',
+        })
+
+    # Fuzzy tier for whatever is left over
+    reasons = {}
+    if fuzzy:
+        leftover = _match_fuzzy(
+            leftover,
+            [u for u in users if u.get('email') and u.get('email') not in matched_emails],
+            fuzzy_threshold,
+            transform,
+            matched,
+            errors,
+            reasons,
+            shard,
+        )
+
+    # Report unmatched files
     unmatched = []
+    for file_path in leftover:
+        entry = {
+            'filename': file_path.name,
+            'path': str(file_path)
+        }
+        if file_path in reasons:
+            entry['reason'] = reasons[file_path]
+        unmatched.append(entry)
+
+    for file_path, reason in duplicates:
+        unmatched.append({
+            'filename': file_path.name,
+            'path': str(file_path),
+            'reason': reason
+        })
+
+    return matched, unmatched, errors
+
+
+def find_alias_files(
+    signatures_folder: Union[Path, Sequence[Path]],
+    exclude: Optional[Sequence[str]] = None,
+    recursive: bool = False,
+    transform: Optional[Callable[[str], str]] = None,
+    workers: Optional[int] = None
+) -> Tuple[Dict[str, Dict], List[Dict]]:
+    """
+    Find and validate per-address signature files.
+
+    A file named after an email address (e.g. "sales@company.com.html") is
+    the signature for the sendAs identity with that address, whichever user
+    it belongs to. These files are left out of filename matching.
+
+    Args:
+        signatures_folder: Folder or bundle (or a list of them) to scan
+        exclude: File or directory patterns to skip
+        recursive: Also scan subfolders
+        transform: Optional function applied before validation
+        workers: Processes used to validate files
+
+    Returns:
+        Tuple of (alias_files, errors): alias_files maps the lowercased
+        address to a match dictionary (as in match_signatures_to_users, with
+        match_type 'address'); errors lists invalid files
+    """
+    from .scanner import iter_signature_files
+
+    files = {}
+    for file_path in iter_signature_files(
+        signatures_folder, include=ALIAS_FILE_PATTERNS, exclude=exclude, recursive=recursive
+    ):
+        address = re.sub(r'\.html?$', '', file_path.name, flags=re.IGNORECASE).lower()
+        # First file wins, like the scan order of the folders given
+        files.setdefault(address, file_path)
+
+    alias_files = {}
+    errors = []
+    results = validate_signature_files(list(files.values()), transform, workers)
+
+    for (address, file_path), (is_valid, error_msg, info) in zip(files.items(), results):
+        if not is_valid:
+            errors.append({
+                'filename': file_path.name,
+                'path': str(file_path),
+                'error': error_msg
+            })
+            continue
+        alias_files[address] = {
+            'filename': file_path.name,
+            'email': address,
+            'name': '',
+            'path': str(file_path),
+            'size': info['size'],
+            'info': info,
+            'match_type': 'address',
+        }
+
+    return alias_files, errors
+
+
+def _match_fuzzy(
+    html_files: List[Path],
+    users: List[Dict],
+    threshold: Optional[float],
+    transform: Optional[Callable[[str], str]],
+    matched: List[Dict],
+    errors: List[Dict],
+    reasons: Dict,
+    shard: Optional[Tuple[int, int]] = None
+) -> List[Path]:
+    """
+    Run the fuzzy matching tier over files and users left by exact matching.
+
+    Matches and validation errors are appended to matched and errors;
+    reasons collects why files stayed unmatched. Files matched to users
+    outside the shard are dropped without being validated.
+
+    Returns:
+        Files that are still unmatched
+    """
+    from .fuzzy import FuzzyIndex, find_fuzzy_match, DEFAULT_FUZZY_THRESHOLD
+
+    if not html_files or not users:
+        return html_files
+
+    if threshold is None:
+        threshold = DEFAULT_FUZZY_THRESHOLD
+
+    index = FuzzyIndex(users)
+
+    # Score every file first so the strongest matches claim users first
+    results = []
     for file_path in html_files:
-        if file_path not in matched_files:
-            unmatched.append({
+        user_data, score, candidates = find_fuzzy_match(file_path.name, index, threshold)
+        if user_data is None:
+            if candidates:
+                names = ', '.join(u.get('email', '') for u, _ in candidates[:3])
+                reasons[file_path] = f"Ambiguous match: {names}"
+            continue
+        results.append((score, file_path, user_data))
+
+    results.sort(key=lambda r: (-r[0], r[1].name, str(r[1])))
+
+    handled_files = set()
+    claimed = set()
+    for score, file_path, user_data in results:
+        user_email = user_data['email']
+        if user_email in claimed:
+            reasons[file_path] = f"Fuzzy match to {user_email} already taken"
+            continue
+
+        if not in_shard(user_email, shard):
+            handled_files.add(file_path)
+            claimed.add(user_email)
+            continue
+
+        is_valid, error_msg, info = validate_signature_file(file_path, transform)
+        if not is_valid:
+            errors.append({
                 'filename': file_path.name,
-                'path': str(file_path)
+                'path': str(file_path),
+                'error': error_msg
             })
+            handled_files.add(file_path)
+            continue
 
-    return matched, unmatched, errors
+        matched.append({
+            'filename': file_path.name,
+            'email': user_email,
+            'name': user_data.get('name', ''),
+            'path': str(file_path),
+            'size': info['size'],
+            'info': info,
+            'match_type': 'fuzzy',
+            'score': score,
+        })
+        handled_files.add(file_path)
+        claimed.add(user_email)
+
+    return [f for f in html_files if f not in handled_files]
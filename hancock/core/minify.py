@@ -0,0 +1,139 @@
+"""Shrink signature HTML without changing how it renders."""
+
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Iterator
+
+# Elements whose contents must be kept verbatim
+_RAW_BLOCK_PATTERN = re.compile(
+    r'<(pre|textarea|script|style)\b.*?</\1\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Comments, except Outlook conditional comments which carry markup
+_COMMENT_PATTERN = re.compile(r'<!--(?!\[if|<!\[endif).*?-->', re.DOTALL)
+
+_STYLE_ATTR_PATTERN = re.compile(r'(\s)style\s*=\s*(["\'])(.*?)\2', re.IGNORECASE | re.DOTALL)
+_UNSAFE_STYLE_PATTERN = re.compile(r'\([^)]*;|["\'&]')
+_WHITESPACE = re.compile(r'\s+')
+_IMPORTANT_PATTERN = re.compile(r'!\s*important$', re.IGNORECASE)
+
+# Whitespace next to these tags never renders, so it can be dropped entirely
+BLOCK_TAGS = (
+    'html', 'head', 'body', 'meta', 'title', 'link', 'table', 'thead', 'tbody',
+    'tfoot', 'tr', 'td', 'th', 'div', 'p', 'br', 'hr', 'ul', 'ol', 'li', 'h1',
+    'h2', 'h3', 'h4', 'h5', 'h6', 'center', 'blockquote', '!doctype',
+)
+
+_BLOCK_TAG_SPACE_PATTERN = re.compile(
+    r' ?(</?(?:%s)\b[^>]*>) ?' % '|'.join(re.escape(t) for t in BLOCK_TAGS),
+    re.IGNORECASE
+)
+_TAG_END_SPACE_PATTERN = re.compile(r'(<[^<>]*?) (/?>)')
+
+# Number of minified documents kept in the per-process cache
+CACHE_SIZE = 1024
+
+_cache = OrderedDict()
+
+
+def minify_style(style: str) -> str:
+    """
+    Minify an inline style attribute value.
+
+    Whitespace around separators is removed and repeated properties are
+    collapsed to the value browsers apply: the last !important one if there
+    is any, otherwise the last one.
+
+    Args:
+        style: Contents of a style="..." attribute
+
+    Returns:
+        Minified style declarations
+    """
+    if _UNSAFE_STYLE_PATTERN.search(style):
+        # Semicolons inside url(...) or quotes (e.g. data: URIs) are not
+        # declaration separators; only collapse whitespace
+        return _WHITESPACE.sub(' ', style.strip())
+
+    declarations = OrderedDict()
+    for declaration in style.split(';'):
+        prop, sep, value = declaration.partition(':')
+        prop = prop.strip().lower()
+        value = _WHITESPACE.sub(' ', value.strip())
+        if not sep or not prop or not value:
+            continue
+        # An earlier !important declaration beats a later plain one
+        if _IMPORTANT_PATTERN.search(declarations.get(prop, '')) and not _IMPORTANT_PATTERN.search(value):
+            continue
+        # Re-insert so the surviving value keeps the position of the last one
+        declarations.pop(prop, None)
+        declarations[prop] = value
+    return ';'.join(f"{prop}:{value}" for prop, value in declarations.items())
+
+
+def _minify_markup(markup: str) -> str:
+    """Minify a stretch of HTML that contains no raw-text elements."""
+    markup = _COMMENT_PATTERN.sub('', markup)
+    markup = _STYLE_ATTR_PATTERN.sub(
+        lambda m: f"{m.group(1)}style={m.group(2)}{minify_style(m.group(3))}{m.group(2)}",
+        markup
+    )
+    markup = _WHITESPACE.sub(' ', markup)
+    markup = _BLOCK_TAG_SPACE_PATTERN.sub(r'\1', markup)
+    return _TAG_END_SPACE_PATTERN.sub(r'\1\2', markup)
+
+
+def iter_minified(html: str) -> Iterator[str]:
+    """
+    Minify HTML as a stream of output pieces.
+
+    - Comments are dropped (conditional comments for Outlook are kept)
+    - pre/textarea/script/style elements are passed through untouched
+    - Whitespace collapses to a single space, and is dropped entirely
+      around block-level tags (table, tr, td, p, div, ...)
+    - Inline styles lose redundant whitespace and repeated properties
+
+    Each stretch between raw-text elements is processed with a handful of
+    whole-string regex passes rather than token by token.
+
+    Args:
+        html: Signature HTML
+
+    Yields:
+        Pieces of minified HTML, in order
+    """
+    position = 0
+    for match in _RAW_BLOCK_PATTERN.finditer(html):
+        yield _minify_markup(html[position:match.start()])
+        yield match.group(0)
+        position = match.end()
+    yield _minify_markup(html[position:])
+
+
+def minify_html(html: str) -> str:
+    """
+    Minify signature HTML (see iter_minified).
+
+    Results are cached by content hash, so identical signatures are only
+    minified once per process.
+
+    Args:
+        html: Signature HTML
+
+    Returns:
+        Minified HTML
+    """
+    key = hashlib.sha256(html.encode('utf-8')).digest()
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+
+    result = ''.join(iter_minified(html)).strip()
+
+    _cache[key] = result
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
@@ -0,0 +1,70 @@
+"""Client-side rate limiting for Google API calls."""
+
+import asyncio
+import threading
+import time
+
+# Default sustained request rate per tenant (requests per second)
+DEFAULT_RATE = 10.0
+
+# Default number of requests allowed back to back before throttling
+DEFAULT_BURST = 10
+
+
+class RateLimiter:
+    """
+    Token bucket limiting how fast API requests are made.
+
+    Tokens refill continuously at `rate` per second up to `burst`; each
+    request takes one token and waits only when the bucket is empty. Unlike
+    a fixed sleep after every call, short batches run at full speed and
+    time spent on the request itself counts towards the interval.
+
+    A limiter is safe to share between threads, and asyncio code can wait
+    with acquire_async() instead of blocking the event loop. Each tenant (and each
+    process) should use its own, as Google's quotas are per project and user.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """
+        Args:
+            rate: Sustained requests per second
+            burst: Requests allowed back to back before throttling
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Take tokens and return how long to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Reserve the tokens now; waiters queue up behind each other
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Take a token per request about to be made, waiting until they are available.
+
+        Returns:
+            Seconds waited
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int = 1) -> float:
+        """Take tokens like acquire(), waiting without blocking the event loop."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,233 @@
+"""Staged (canary) rollouts that stop when a wave goes wrong."""
+
+import hashlib
+import math
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+from .gmail import deploy_signatures_batch
+from .ratelimit import RateLimiter
+
+# Default share of failed users in a wave that halts the rollout
+DEFAULT_MAX_ERROR_RATE = 0.05
+
+
+def parse_stages(value: str) -> List[Union[int, float]]:
+    """
+    Parse a stage list such as "1%,10%,100%" or "50,500,100%".
+
+    Args:
+        value: Comma-separated stages; "N%" is a share of all users, a bare
+            number is a user count. Stages are cumulative.
+
+    Returns:
+        List of stages: floats (0-1] for shares, ints for counts
+
+    Raises:
+        ValueError: If a stage is malformed
+    """
+    stages = []
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            if item.endswith('%'):
+                share = float(item[:-1]) / 100
+                if not 0 < share <= 1:
+                    raise ValueError
+                stages.append(share)
+            else:
+                count = int(item)
+                if count <= 0:
+                    raise ValueError
+                stages.append(count)
+        except ValueError:
+            raise ValueError(f"Invalid stage '{item}': use a percentage (10%) or a user count (50)")
+    if not stages:
+        raise ValueError("No stages given")
+    return stages
+
+
+def rollout_order(emails: Sequence[str]) -> List[str]:
+    """
+    Order users for a rollout.
+
+    Users are ordered by a hash of their email, which spreads canaries
+    across departments and name ranges, and picks the same canaries when a
+    rollout is repeated.
+    """
+    return sorted(emails, key=lambda email: hashlib.sha1(email.lower().encode('utf-8')).hexdigest())
+
+
+def plan_waves(
+    emails: Sequence[str],
+    canary: Optional[int] = None,
+    stages: Optional[Sequence[Union[int, float]]] = None
+) -> List[List[str]]:
+    """
+    Split users into rollout waves.
+
+    Args:
+        emails: Users to deploy to
+        canary: Size of a first wave deployed on its own
+        stages: Cumulative stage sizes (see parse_stages); a final wave
+            with everyone left is always added
+
+    Returns:
+        Non-empty waves of emails, in deployment order (a single wave in
+        the given order when there is no canary and no stages)
+    """
+    if not canary and not stages:
+        return [list(emails)] if emails else []
+
+    ordered = rollout_order(emails)
+    total = len(ordered)
+
+    boundaries = []
+    if canary:
+        boundaries.append(canary)
+    for stage in stages or []:
+        if isinstance(stage, float):
+            boundaries.append(math.ceil(stage * total))
+        else:
+            boundaries.append(stage)
+    boundaries.append(total)
+
+    waves = []
+    start = 0
+    for end in boundaries:
+        end = min(max(end, start), total)
+        if end > start:
+            waves.append(ordered[start:end])
+            start = end
+    return waves
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile (p in 0-100) of a list of numbers; 0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _WaveSignatures(Mapping):
+    """The signatures of one wave's users, looked up only when deployed."""
+
+    def __init__(self, signatures: Mapping[str, str], emails: Sequence[str]):
+        self._signatures = signatures
+        self._emails = emails
+
+    def __getitem__(self, email: str) -> str:
+        return self._signatures[email]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._emails)
+
+    def __len__(self) -> int:
+        return len(self._emails)
+
+
+def run_rollout(
+    credentials,
+    signatures: Mapping[str, str],
+    waves: List[List[str]],
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    max_p95_latency: Optional[float] = None,
+    wave_callback: Optional[Callable[[Dict], None]] = None,
+    deploy: Callable = deploy_signatures_batch,
+    **deploy_options
+) -> Dict:
+    """
+    Deploy signatures wave by wave, halting when a wave breaches a threshold.
+
+    Each wave is deployed concurrently through `deploy` (pass workers=...
+    in deploy_options). After a wave, its error rate and
+    latency percentiles are checked; if either is over its limit the
+    remaining waves are skipped.
+
+    Args:
+        credentials: Base service account credentials
+        signatures: Mapping of email -> signature HTML (e.g. a SignatureStore,
+            read as each user is deployed)
+        waves: Lists of emails from plan_waves
+        max_error_rate: Highest acceptable share of failed users per wave (0-1)
+        max_p95_latency: Highest acceptable 95th percentile seconds per user
+        wave_callback: Optional function called with each wave's summary
+        deploy: Function deploying a wave, deploy_signatures_batch or
+            deploy_signatures_async
+        **deploy_options: Passed to `deploy` (workers,
+            progress_callback, rate_limiter, all_aliases, ...)
+
+    Returns:
+        Dictionary with success, failed, errors (as deploy_signatures_batch),
+        skipped (users in waves not deployed), waves (per-wave summaries with
+        wave, size, success, failed, error_rate, p50, p95, p99), latencies
+        (seconds per deployed user, not counting the rate limiter),
+        limiter_wait (total seconds waiting for the rate limiter), retries
+        (total) and halted (the reason the rollout stopped, or None)
+    """
+    result = {
+        'success': 0,
+        'failed': 0,
+        'errors': [],
+        'skipped': 0,
+        'waves': [],
+        'latencies': [],
+        'limiter_wait': 0.0,
+        'retries': 0,
+        'halted': None,
+    }
+
+    # One limiter for the whole rollout, not a fresh burst per wave
+    deploy_options.setdefault('rate_limiter', RateLimiter())
+
+    for number, wave in enumerate(waves, 1):
+        if result['halted']:
+            result['skipped'] += len(wave)
+            continue
+
+        stats = {}
+        success, failed, errors = deploy(
+            credentials,
+            _WaveSignatures(signatures, wave),
+            stats=stats,
+            **deploy_options
+        )
+
+        latencies = stats.get('latencies', [])
+        summary = {
+            'wave': number,
+            'size': len(wave),
+            'success': success,
+            'failed': failed,
+            'error_rate': failed / len(wave),
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+        }
+        result['waves'].append(summary)
+        result['success'] += success
+        result['failed'] += failed
+        result['errors'].extend(errors)
+        result['latencies'].extend(latencies)
+        result['limiter_wait'] += stats.get('limiter_wait', 0.0)
+        result['retries'] += stats.get('retries', 0)
+
+        if number < len(waves):
+            if summary['error_rate'] > max_error_rate:
+                result['halted'] = (
+                    f"Wave {number} error rate {summary['error_rate']:.1%} "
+                    f"exceeds {max_error_rate:.1%}"
+                )
+            elif max_p95_latency is not None and summary['p95'] > max_p95_latency:
+                result['halted'] = (
+                    f"Wave {number} p95 latency {summary['p95']:.2f}s "
+                    f"exceeds {max_p95_latency:.2f}s"
+                )
+
+        if wave_callback:
+            wave_callback(summary)
+
+    return result
@@ -0,0 +1,276 @@
+"""Streaming discovery of signature files across one or more folders."""
+
+import fnmatch
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterator, Mapping, Optional, Sequence, Union
+
+# Files picked up when no include patterns are given
+DEFAULT_INCLUDE = ('*.html', '*.htm')
+
+# Read size used when hashing file contents
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Bytes of signature HTML (UTF-8) a SignatureStore keeps in memory
+DEFAULT_CACHE_SIZE = 32 * 1024 * 1024
+
+
+def read_signature_bytes(path) -> Union[bytes, memoryview]:
+    """
+    Read a signature file or bundle member (see hancock.core.bundle).
+
+    Bundle members are returned as zero-copy memoryview slices.
+
+    Args:
+        path: File path, "<bundle>::<member>" reference or BundleMember
+
+    Returns:
+        Raw signature bytes
+
+    Raises:
+        FileNotFoundError: If the file or bundle member does not exist
+    """
+    from .bundle import split_bundle_ref, read_bundle_member
+
+    if split_bundle_ref(path):
+        return read_bundle_member(path)
+
+    with open(str(path), 'rb') as f:
+        return f.read()
+
+
+def read_signature(path) -> str:
+    """
+    Read a signature file or bundle member as text.
+
+    Args:
+        path: File path, "<bundle>::<member>" reference or BundleMember
+
+    Returns:
+        Signature HTML
+    """
+    return str(read_signature_bytes(path), 'utf-8')
+
+
+class SignatureStore(Mapping):
+    """
+    Signature HTML by user email, read from disk when it is first needed.
+
+    A read-only mapping that deploy_signatures_batch can use in place of a
+    dictionary, so a deployment starts without reading every file first and
+    memory stays flat however large the folder is. Recently used signatures
+    are kept in a least-recently-used cache of at most `max_size` bytes
+    (UTF-8), shared by users mapped to the same file (e.g. by a
+    manifest) and by retries. Safe to read from several threads.
+    """
+
+    def __init__(
+        self,
+        paths: Mapping[str, object],
+        transform: Optional[Callable[[str], str]] = None,
+        max_size: int = DEFAULT_CACHE_SIZE
+    ):
+        """
+        Args:
+            paths: Signature file or bundle member by user email
+            transform: Optional function applied to the HTML after reading
+                (e.g. a chain of ImageExtractor and minify_html)
+            max_size: Bytes of HTML (UTF-8) to keep cached
+        """
+        self._paths = dict(paths)
+        self._transform = transform
+        self._max_size = max_size
+        self._cache = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.reads = 0
+
+    def __getitem__(self, email: str) -> str:
+        path = self._paths[email]
+
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None:
+                self._cache.move_to_end(path)
+                return cached[0]
+
+        # Read outside the lock so workers don't wait on each other's disk
+        html = read_signature(path)
+        if self._transform:
+            html = self._transform(html)
+        size = len(html.encode('utf-8'))
+
+        with self._lock:
+            self.reads += 1
+            if path not in self._cache and size <= self._max_size:
+                self._cache[path] = (html, size)
+                self._size += size
+                while self._size > self._max_size:
+                    _, (_, evicted) = self._cache.popitem(last=False)
+                    self._size -= evicted
+        return html
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, email) -> bool:
+        return email in self._paths
+
+    @property
+    def cached_size(self) -> int:
+        """Bytes of HTML (UTF-8) currently cached."""
+        return self._size
+
+
+def file_digest(path) -> str:
+    """
+    Hash a file's contents without loading it into memory at once.
+
+    Args:
+        path: File path, "<bundle>::<member>" reference or BundleMember
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    from .bundle import split_bundle_ref, read_bundle_member
+
+    if split_bundle_ref(path):
+        return hashlib.sha256(read_bundle_member(path)).hexdigest()
+
+    digest = hashlib.sha256()
+    with open(str(path), 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _matches(patterns: Sequence[str], name: str, rel_path: str) -> bool:
+    """Check a file against patterns; patterns with a slash match the relative path."""
+    for pattern in patterns:
+        pattern = pattern.lower()
+        target = rel_path if '/' in pattern else name
+        if fnmatch.fnmatchcase(target, pattern):
+            return True
+    return False
+
+
+def iter_signature_files(
+    roots: Union[Path, Sequence[Path]],
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    recursive: bool = False,
+    dedupe: bool = True
+) -> Iterator[Path]:
+    """
+    Stream signature files from one or more folders or bundles.
+
+    Bundles (see hancock.core.bundle) yield BundleMember references for
+    their members. Folders are walked with os.scandir, one directory at a time, so nothing
+    but the pending directory stack is held in memory. Hidden files and
+    directories (starting with ".") are skipped.
+
+    Patterns are case-insensitive globs. A pattern containing "/" is
+    matched against the path relative to its root ("sales/*.html"),
+    otherwise against the file name. Exclude patterns also prune whole
+    directories when recursing.
+
+    With dedupe=True, a file whose name was already seen is skipped when its
+    content is byte-identical to the earlier one (e.g. the same signature
+    copied into two roots). Contents are only hashed on name collisions.
+
+    Args:
+        roots: Folder, bundle, or a list of them to scan
+        include: File patterns to pick up (default: *.html, *.htm)
+        exclude: File or directory patterns to skip
+        recursive: Descend into subfolders
+        dedupe: Skip same-named files with identical content
+
+    Yields:
+        Paths of matching files, or BundleMembers for bundle contents
+    """
+    from .bundle import is_bundle_path, open_bundle
+
+    if isinstance(roots, (str, Path)):
+        roots = [roots]
+
+    include = include or DEFAULT_INCLUDE
+    exclude = exclude or ()
+    needs_rel_path = any('/' in p for p in list(include) + list(exclude))
+
+    seen_names = {}  # name -> list of paths already yielded
+    digests = {}  # path -> content digest, computed on demand
+
+    def digest_of(path) -> str:
+        if path not in digests:
+            digests[path] = file_digest(path)
+        return digests[path]
+
+    def is_duplicate(name: str, path) -> bool:
+        earlier = seen_names.setdefault(name, [])
+        if earlier:
+            current = digest_of(path)
+            if any(digest_of(p) == current for p in earlier):
+                return True
+        earlier.append(path)
+        return False
+
+    for root in roots:
+        if is_bundle_path(root):
+            for member in open_bundle(root).members():
+                name = member.name.lower()
+                if not _matches(include, name, member.member.lower()):
+                    continue
+                if _matches(exclude, name, member.member.lower()):
+                    continue
+                if not recursive and '/' in member.member:
+                    continue
+                if dedupe and is_duplicate(member.name, member):
+                    continue
+                yield member
+            continue
+
+        root = str(root)
+        stack = [root]
+
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+
+            subdirs = []
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+
+                    name = entry.name.lower()
+                    rel_path = name
+                    if needs_rel_path:
+                        rel_path = os.path.relpath(entry.path, root).replace(os.sep, '/').lower()
+
+                    if entry.is_dir():
+                        if recursive and not _matches(exclude, name, rel_path):
+                            subdirs.append(entry.path)
+                        continue
+
+                    if not entry.is_file():
+                        continue
+                    if not _matches(include, name, rel_path) or _matches(exclude, name, rel_path):
+                        continue
+
+                    if dedupe and is_duplicate(entry.name, entry.path):
+                        continue
+
+                    yield Path(entry.path)
+
+            # Visit subfolders in name order
+            stack.extend(sorted(subdirs, reverse=True))
+
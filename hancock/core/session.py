@@ -0,0 +1,213 @@
+"""A reusable connection to a Workspace tenant, for using Hancock from Python."""
+
+import threading
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from .auth import authenticate, get_service
+from .config import Config, get_config
+from .directory import load_user_records, DEFAULT_CRAWL_WORKERS, UserRecord
+from .gmail import deploy_signature, deploy_signatures_batch, get_current_signature, patch_signature, DEFAULT_WORKERS
+from .ratelimit import RateLimiter, DEFAULT_RATE
+
+
+class Session:
+    """
+    Authenticated access to one tenant that stays warm between calls.
+
+    Credentials are loaded once, and each user's Gmail client (with its
+    HTTP connection and delegated access token) is built on first use and
+    reused after that. Updating a user that was seen before is a single
+    sendAs.patch request; the first call for a user also mints its token.
+    All calls share one rate limiter. Google API clients are not thread
+    safe, so use a Session from one thread at a time (deploy_many runs its
+    own workers).
+
+    Example:
+        import hancock
+
+        session = hancock.Session(profile="acme")
+        ok, error = session.deploy("new.hire@acme.com", html)
+    """
+
+    def __init__(
+        self,
+        service_account_file: Optional[str] = None,
+        admin_email: Optional[str] = None,
+        profile: Optional[str] = None,
+        rate: float = DEFAULT_RATE,
+        load_users: bool = False
+    ):
+        """
+        Args:
+            service_account_file: Service account JSON key (default: from
+                the profile's configuration)
+            admin_email: Workspace admin to impersonate for the Directory
+                API (default: from the profile's configuration)
+            profile: Configuration profile to read defaults from (default:
+                the active profile)
+            rate: Gmail API requests per second, shared by all calls
+            load_users: If True, load the user index right away (see users)
+
+        Raises:
+            ValueError: If no service account or admin email is configured
+            FileNotFoundError: If the service account file doesn't exist
+        """
+        config = Config(profile) if profile else get_config()
+        service_account_file = service_account_file or config.get('service_account_file')
+        admin_email = admin_email or config.get('admin_email')
+        if not service_account_file or not admin_email:
+            raise ValueError("Hancock is not configured: pass service_account_file and admin_email, or run hancock init")
+
+        self.profile = config.profile
+        self.credentials, self.admin_email = authenticate(service_account_file, admin_email)
+        self.rate_limiter = RateLimiter(rate)
+
+        self._services = {}
+        self._directory = None
+        self._users = None
+        self._index = None
+        self._lock = threading.Lock()
+
+        if load_users:
+            self.users()
+
+    def gmail(self, email: str):
+        """Get the Gmail client acting as a user, building it on first use."""
+        service = self._services.get(email)
+        if service is None:
+            service = get_service('gmail', 'v1', self.credentials, user_email=email)
+            with self._lock:
+                service = self._services.setdefault(email, service)
+        return service
+
+    def directory(self):
+        """Get the Directory client acting as the admin, building it on first use."""
+        if self._directory is None:
+            self._directory = get_service('admin', 'directory_v1', self.credentials, user_email=self.admin_email)
+        return self._directory
+
+    def users(self, refresh: bool = False, workers: int = DEFAULT_CRAWL_WORKERS) -> List[UserRecord]:
+        """
+        Get every user of the tenant, loading them on first use.
+
+        Once loaded, deploy accepts aliases as well as primary addresses and
+        rejects unknown users without calling the Gmail API.
+
+        Args:
+            refresh: If True, load the users again
+            workers: Parallel Directory requests (see crawl_users)
+
+        Returns:
+            UserRecords sorted by email
+        """
+        if self._users is None or refresh:
+            users = load_user_records(
+                self.directory(),
+                service_factory=lambda: get_service('admin', 'directory_v1', self.credentials, user_email=self.admin_email),
+                workers=workers
+            )
+            index = {}
+            for user in users:
+                for address in (user.email,) + user.aliases:
+                    index.setdefault(address.lower(), user)
+            self._users, self._index = users, index
+        return self._users
+
+    def find_user(self, email: str) -> Optional[UserRecord]:
+        """Find a user by primary address or alias in the loaded users (None if not loaded or unknown)."""
+        if self._index is None:
+            return None
+        return self._index.get(email.lower())
+
+    def deploy(self, email: str, html: str, all_aliases: bool = False) -> Tuple[bool, Optional[str]]:
+        """
+        Set a user's signature.
+
+        Args:
+            email: The user's primary address, or an alias once users are loaded
+            html: Signature HTML
+            all_aliases: If True, update every sendAs identity of the user
+                (lists them first, so one more request)
+
+        Returns:
+            Tuple of (success: bool, error_message: Optional[str])
+        """
+        if self._index is not None:
+            user = self.find_user(email)
+            if user is None:
+                return False, f"Unknown user: {email}"
+            email = user.email
+
+        service = self.gmail(email)
+        if all_aliases:
+            return deploy_signature(service, email, html, all_aliases=True, throttle=self.rate_limiter.acquire)
+        self.rate_limiter.acquire()
+        return patch_signature(service, email, html)
+
+    def deploy_many(
+        self,
+        signatures: Mapping[str, str],
+        workers: int = DEFAULT_WORKERS,
+        all_aliases: bool = False,
+        progress_callback: Optional[Callable[[str, bool, Optional[str]], None]] = None
+    ) -> Dict:
+        """
+        Set the signatures of many users, with retries (see deploy_signatures_batch).
+
+        Args:
+            signatures: Mapping of primary email -> signature HTML
+            workers: Users deployed at the same time
+            all_aliases: If True, update every sendAs identity of each user
+            progress_callback: Optional callback function(email, success, error_msg)
+
+        Returns:
+            Dictionary with success and failed counts and errors
+            ({email, error, attempts})
+        """
+        success, failed, errors = deploy_signatures_batch(
+            self.credentials,
+            signatures,
+            progress_callback=progress_callback,
+            rate_limiter=self.rate_limiter,
+            all_aliases=all_aliases,
+            service_cache=self._services,
+            workers=workers
+        )
+        return {'success': success, 'failed': failed, 'errors': errors}
+
+    def fetch(self, email: str) -> str:
+        """
+        Get a user's current signature (of their primary sendAs identity).
+
+        Raises:
+            RuntimeError: If the signature could not be read
+        """
+        user = self.find_user(email)
+        email = user.email if user else email
+        self.rate_limiter.acquire()
+        ok, signature, error = get_current_signature(self.gmail(email), email)
+        if not ok:
+            raise RuntimeError(f"Could not fetch the signature of {email}: {error}")
+        return signature
+
+    def close(self):
+        """Drop cached clients, closing their HTTP connections."""
+        with self._lock:
+            services = list(self._services.values())
+            if self._directory is not None:
+                services.append(self._directory)
+            self._services = {}
+            self._directory = None
+        for service in services:
+            close = getattr(service, 'close', None)
+            if close:
+                close()
+
+    def __enter__(self) -> 'Session':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"Session(profile={self.profile!r}, admin_email={self.admin_email!r})"
@@ -0,0 +1,181 @@
+"""Split a deployment across machines and combine their results."""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Version of the results file format
+RESULTS_VERSION = 1
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Parse a shard such as "3/8" (the third of eight shards).
+
+    Args:
+        value: "K/N" with 1 <= K <= N
+
+    Returns:
+        Tuple of (index, count)
+
+    Raises:
+        ValueError: If the shard is malformed
+    """
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}': use K/N, e.g. 3/8")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}': K must be between 1 and N")
+    return index, count
+
+
+def format_shard(shard: Optional[Tuple[int, int]]) -> Optional[str]:
+    """Format a shard as "K/N" (None stays None)."""
+    return f"{shard[0]}/{shard[1]}" if shard else None
+
+
+def shard_of(email: str, count: int) -> int:
+    """
+    Get the shard (1 to count) a user belongs to.
+
+    Based on a hash of the lowercased email, so every machine assigns users
+    to the same shards without coordinating, and a user only moves when the
+    shard count changes.
+    """
+    digest = hashlib.sha1(email.lower().encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
+
+
+def in_shard(email: str, shard: Optional[Tuple[int, int]]) -> bool:
+    """Check whether a user belongs to a shard (always True without one)."""
+    return shard is None or shard_of(email, shard[1]) == shard[0]
+
+
+def write_results(path: str, summaries: Sequence[Dict], shard: Optional[Tuple[int, int]] = None):
+    """
+    Save deployment summaries for hancock merge-results.
+
+    Args:
+        path: Output JSON file
+        summaries: Summaries returned by run_deploy (one per profile)
+        shard: The shard that was deployed, if any
+    """
+    data = {
+        'version': RESULTS_VERSION,
+        'shard': format_shard(shard),
+        'created': datetime.now(timezone.utc).isoformat(),
+        'summaries': list(summaries),
+    }
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def read_results(path: str) -> Dict:
+    """
+    Load a results file written by write_results.
+
+    Raises:
+        ValueError: If the file is not a Hancock results file
+    """
+    with open(Path(path).expanduser(), 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: not a results file ({e})")
+    if not isinstance(data, dict) or 'summaries' not in data:
+        raise ValueError(f"{path}: not a results file")
+    if data.get('version', 1) > RESULTS_VERSION:
+        raise ValueError(f"{path}: written by a newer version of Hancock")
+    return data
+
+
+def check_shards(results: Iterable[Dict]) -> List[str]:
+    """
+    Look for gaps and overlaps in a set of shard results.
+
+    Returns:
+        Problems found, e.g. "Missing shards: 4/8" (empty when complete)
+    """
+    seen = {}
+    for data in results:
+        if data.get('shard'):
+            index, count = parse_shard(data['shard'])
+            seen.setdefault(count, []).append(index)
+
+    problems = []
+    if len(seen) > 1:
+        problems.append(f"Results use different shard counts: {', '.join(str(c) for c in sorted(seen))}")
+    for count, indexes in sorted(seen.items()):
+        missing = sorted(set(range(1, count + 1)) - set(indexes))
+        repeated = sorted({i for i in indexes if indexes.count(i) > 1})
+        if missing:
+            problems.append(f"Missing shards: {', '.join(f'{i}/{count}' for i in missing)}")
+        if repeated:
+            problems.append(f"Shards included more than once: {', '.join(f'{i}/{count}' for i in repeated)}")
+    return problems
+
+
+def merge_results(results: Iterable[Dict]) -> List[Dict]:
+    """
+    Combine the summaries of several shards into one per profile.
+
+    User counts (matched, deployed, failed) are added up. Unmatched and
+    invalid files are seen by every shard, so they are combined by path
+    rather than added.
+
+    Args:
+        results: Loaded results files
+
+    Returns:
+        One summary per profile, in the order profiles first appear
+    """
+    merged = {}
+    unmatched = {}
+    invalid = {}
+
+    for data in results:
+        for summary in data['summaries']:
+            profile = summary.get('profile')
+            total = merged.get(profile)
+            if total is None:
+                total = merged[profile] = {
+                    'profile': profile,
+                    'matched': 0,
+                    'unmatched': 0,
+                    'errors': 0,
+                    'deployed': 0,
+                    'failed': 0,
+                    'error': None,
+                    'unmatched_files': [],
+                    'error_files': [],
+                    'failures': [],
+                }
+                unmatched[profile] = {}
+                invalid[profile] = {}
+
+            for key in ('matched', 'deployed', 'failed'):
+                total[key] += summary.get(key, 0)
+            total['failures'].extend(summary.get('failures', []))
+
+            for path in summary.get('unmatched_files', []):
+                unmatched[profile].setdefault(path, None)
+            for error in summary.get('error_files', []):
+                invalid[profile].setdefault(error['path'], error)
+
+            if summary.get('error'):
+                label = f"shard {data['shard']}: " if data.get('shard') else ""
+                message = label + summary['error']
+                total['error'] = f"{total['error']}; {message}" if total['error'] else message
+
+    for profile, total in merged.items():
+        total['unmatched_files'] = list(unmatched[profile])
+        total['error_files'] = list(invalid[profile].values())
+        total['unmatched'] = len(total['unmatched_files'])
+        total['errors'] = len(total['error_files'])
+
+    return list(merged.values())
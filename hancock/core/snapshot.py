@@ -0,0 +1,149 @@
+"""Cached and exported user lists, for matching without the Directory API."""
+
+import csv
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .config import get_config_dir
+from .directory import UserRecord
+
+# Version of the snapshot file format
+SNAPSHOT_VERSION = 1
+
+# CSV column names recognized for each user field, lowercased. Includes the
+# headers of the Google Admin console user export ("Email Address [Required]")
+CSV_COLUMNS = {
+    'email': ('email', 'email address', 'primary email', 'primaryemail'),
+    'first_name': ('first name', 'first_name', 'given name', 'givenname'),
+    'last_name': ('last name', 'last_name', 'family name', 'familyname'),
+    'name': ('name', 'full name', 'full_name', 'fullname'),
+    'aliases': ('aliases', 'alias', 'email aliases'),
+}
+
+
+def get_snapshot_path(profile: Optional[str] = None) -> Path:
+    """Get a profile's user snapshot (<config dir>/users/<profile>.json)."""
+    return get_config_dir() / "users" / f"{profile or 'default'}.json"
+
+
+def save_user_snapshot(profile: Optional[str], users: Iterable[UserRecord]):
+    """
+    Save the users of a tenant for offline matching (hancock validate).
+
+    Args:
+        profile: Profile the users belong to (None for the default config)
+        users: Every user of the tenant, as loaded by load_user_records
+    """
+    data = {
+        'version': SNAPSHOT_VERSION,
+        'saved': datetime.now(timezone.utc).isoformat(),
+        'users': [user.to_dict() for user in users],
+    }
+
+    path = get_snapshot_path(profile)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, str(path))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_user_snapshot(path: Path) -> Tuple[List[UserRecord], Optional[str]]:
+    """
+    Load users saved by save_user_snapshot.
+
+    Returns:
+        Tuple of (users, saved), where saved is the ISO time of the snapshot
+
+    Raises:
+        ValueError: If the file is not a user snapshot
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: not a user snapshot ({e})")
+    if not isinstance(data, dict) or 'users' not in data:
+        raise ValueError(f"{path}: not a user snapshot")
+    if data.get('version', 1) > SNAPSHOT_VERSION:
+        raise ValueError(f"{path}: written by a newer version of Hancock")
+
+    users = [
+        UserRecord(
+            user['email'],
+            user.get('name', ''),
+            user.get('first_name', ''),
+            user.get('last_name', ''),
+            user.get('aliases', ())
+        )
+        for user in data['users']
+    ]
+    return users, data.get('saved')
+
+
+def load_users_csv(path: Path) -> List[UserRecord]:
+    """
+    Load users from a CSV file, such as the Google Admin console user export.
+
+    The header row names the columns (see CSV_COLUMNS; " [Required]" and
+    " [Upload Only]" suffixes are ignored). Only an email column is needed.
+    Aliases are separated by semicolons or spaces.
+
+    Raises:
+        ValueError: If the file has no email column
+    """
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+
+        columns = {}
+        for position, title in enumerate(header):
+            title = title.split('[')[0].strip().lower()
+            for field, names in CSV_COLUMNS.items():
+                if title in names:
+                    columns.setdefault(field, position)
+        if 'email' not in columns:
+            raise ValueError(f"{path}: no email column (expected one of: {', '.join(CSV_COLUMNS['email'])})")
+
+        users = []
+        for row in reader:
+            values = {
+                field: row[position].strip() if position < len(row) else ''
+                for field, position in columns.items()
+            }
+            if not values['email']:
+                continue
+            first_name = values.get('first_name', '')
+            last_name = values.get('last_name', '')
+            users.append(UserRecord(
+                values['email'],
+                values.get('name') or f"{first_name} {last_name}".strip(),
+                first_name,
+                last_name,
+                values.get('aliases', '').replace(';', ' ').split()
+            ))
+
+    users.sort(key=lambda user: user.email.lower())
+    return users
+
+
+def load_users_file(path) -> List[UserRecord]:
+    """
+    Load users from a snapshot (.json) or CSV export (anything else).
+
+    Raises:
+        ValueError: If the file cannot be understood
+    """
+    path = Path(path).expanduser()
+    if path.suffix.lower() == '.json':
+        return load_user_snapshot(path)[0]
+    return load_users_csv(path)
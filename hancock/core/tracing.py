@@ -0,0 +1,278 @@
+"""Lightweight request tracing with an OTLP/JSON file exporter.
+
+Spans are recorded in memory while tracing is enabled (``hancock --trace
+trace.json ...``) and written out as OpenTelemetry OTLP/JSON, which tools
+such as Jaeger or otel-cli can import without running a collector. While
+tracing is disabled, span() returns a shared no-op context manager, so
+instrumented code pays almost nothing.
+
+Usage::
+
+    with span('sendAs.list', user=email):
+        ...
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Service name reported in exported traces
+SERVICE_NAME = 'hancock'
+
+
+class Span:
+    """A timed operation, possibly nested inside another span."""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'start_ns', 'end_ns', 'attributes', 'error')
+
+    def __init__(self, trace_id: str, name: str, parent_id: Optional[str], attributes: Dict):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.error = None
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds (0 while the span is open)."""
+        if self.end_ns is None:
+            return 0.0
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set(self, key: str, value):
+        """Add an attribute."""
+        self.attributes[key] = value
+
+
+class _NullSpan:
+    """Stand-in span used while tracing is disabled."""
+
+    def set(self, key: str, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+_lock = threading.Lock()
+_spans = []  # finished spans
+_trace_id = None  # set while tracing is enabled
+
+# Innermost open span; a context variable so concurrent asyncio tasks each
+# keep their own nesting (new threads start without one)
+_current = contextvars.ContextVar('hancock_span', default=None)
+
+
+def enable():
+    """Start recording spans (clears any previous recording)."""
+    global _trace_id
+    with _lock:
+        _spans.clear()
+        _trace_id = os.urandom(16).hex()
+
+
+def disable():
+    """Stop recording spans."""
+    global _trace_id
+    _trace_id = None
+
+
+def is_enabled() -> bool:
+    """Check whether spans are being recorded."""
+    return _trace_id is not None
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span in this thread or task, if any."""
+    return _current.get()
+
+
+def get_spans() -> List[Span]:
+    """Finished spans, in the order they ended."""
+    with _lock:
+        return list(_spans)
+
+
+@contextmanager
+def _record(name: str, parent: Optional[Span], attributes: Dict) -> Iterator[Span]:
+    if parent is None:
+        parent = _current.get()
+    current = Span(_trace_id, name, parent.span_id if parent else None, attributes)
+
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current.reset(token)
+        with _lock:
+            _spans.append(current)
+
+
+@contextmanager
+def _null() -> Iterator[_NullSpan]:
+    yield _NULL_SPAN
+
+
+def span(name: str, parent: Optional[Span] = None, **attributes):
+    """
+    Time a block of code as a span.
+
+    Args:
+        name: Operation name, e.g. "sendAs.patch"
+        parent: Parent span when it is open on another thread (e.g. a worker
+            pool); defaults to the innermost open span in this thread or task
+        **attributes: Extra details, e.g. user="john@company.com"
+
+    Returns:
+        Context manager yielding the span (call .set() to add attributes)
+    """
+    if _trace_id is None:
+        return _null()
+    return _record(name, parent, attributes)
+
+
+def _otlp_value(value) -> Dict:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def to_otlp(spans: List[Span]) -> Dict:
+    """
+    Convert spans to an OTLP/JSON ExportTraceServiceRequest.
+
+    Args:
+        spans: Finished spans
+
+    Returns:
+        JSON-serializable dictionary
+    """
+    otlp_spans = []
+    for s in spans:
+        item = {
+            'traceId': s.trace_id,
+            'spanId': s.span_id,
+            'name': s.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(s.start_ns),
+            'endTimeUnixNano': str(s.end_ns),
+            'attributes': [{'key': k, 'value': _otlp_value(v)} for k, v in s.attributes.items()],
+            'status': {'code': 2, 'message': s.error} if s.error else {'code': 1},
+        }
+        if s.parent_id:
+            item['parentSpanId'] = s.parent_id
+        otlp_spans.append(item)
+
+    return {
+        'resourceSpans': [{
+            'resource': {
+                'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}],
+            },
+            'scopeSpans': [{
+                'scope': {'name': SERVICE_NAME},
+                'spans': otlp_spans,
+            }],
+        }],
+    }
+
+
+def export_otlp_json(path: str, spans: Optional[List[Span]] = None) -> int:
+    """
+    Write spans to a file as OTLP/JSON.
+
+    Args:
+        path: Output file
+        spans: Spans to write (default: everything recorded)
+
+    Returns:
+        Number of spans written
+    """
+    spans = get_spans() if spans is None else spans
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(to_otlp(spans), f)
+    return len(spans)
+
+
+def summarize(spans: Optional[List[Span]] = None) -> List[Dict]:
+    """
+    Aggregate spans by their position in the call tree.
+
+    Spans are grouped by path (e.g. "deploy_user > attempt > sendAs.patch").
+    Self time is the time not covered by child spans, which shows where
+    time actually goes.
+
+    Args:
+        spans: Spans to summarize (default: everything recorded)
+
+    Returns:
+        List of dictionaries with path, depth, name, count, total, self,
+        p50, p95 and max (seconds), in call-tree order
+    """
+    spans = get_spans() if spans is None else spans
+    by_id = {s.span_id: s for s in spans}
+
+    children_time = {}
+    for s in spans:
+        if s.parent_id in by_id:
+            children_time[s.parent_id] = children_time.get(s.parent_id, 0.0) + s.duration
+
+    paths = {}
+
+    def path_of(s: Span) -> tuple:
+        if s.span_id not in paths:
+            parent = by_id.get(s.parent_id)
+            paths[s.span_id] = (path_of(parent) if parent else ()) + (s.name,)
+        return paths[s.span_id]
+
+    groups = {}
+    first_start = {}
+    for s in spans:
+        path = path_of(s)
+        groups.setdefault(path, []).append(s)
+        first_start[path] = min(first_start.get(path, s.start_ns), s.start_ns)
+
+    rows = []
+    for path, members in groups.items():
+        durations = sorted(m.duration for m in members)
+        rows.append({
+            'path': ' > '.join(path),
+            'depth': len(path) - 1,
+            'name': path[-1],
+            'count': len(members),
+            'total': sum(durations),
+            # Children of concurrent spans can add up to more than the parent
+            'self': max(0.0, sum(m.duration - children_time.get(m.span_id, 0.0) for m in members)),
+            'p50': durations[(len(durations) - 1) // 2],
+            'p95': durations[max(0, -(-95 * len(durations) // 100) - 1)],
+            'max': durations[-1],
+        })
+
+    # Parents before children, siblings in the order they first ran
+    def sort_key(row):
+        parts = row['path'].split(' > ')
+        return tuple(first_start[tuple(parts[:i + 1])] for i in range(len(parts)))
+
+    rows.sort(key=sort_key)
+    return rows
+
+
+def slowest(name: str, limit: int = 5, spans: Optional[List[Span]] = None) -> List[Span]:
+    """The longest spans with a given name, e.g. the slowest users."""
+    spans = get_spans() if spans is None else spans
+    matching = [s for s in spans if s.name == name]
+    return sorted(matching, key=lambda s: s.duration, reverse=True)[:limit]
@@ -0,0 +1,38 @@
+"""Composition of signature HTML transforms (minify, image extraction, ...)."""
+
+from typing import Callable, Optional
+
+Transform = Callable[[str], str]
+
+
+class TransformChain:
+    """
+    Apply several transforms in order.
+
+    Unlike a closure, a chain of picklable transforms is itself picklable,
+    so it can be handed to worker processes.
+    """
+
+    def __init__(self, *transforms: Transform):
+        self.transforms = transforms
+
+    def __call__(self, html: str) -> str:
+        for transform in self.transforms:
+            html = transform(html)
+        return html
+
+
+def chain_transforms(*transforms: Optional[Transform]) -> Optional[Transform]:
+    """
+    Combine transforms, skipping None entries.
+
+    Returns:
+        None when there is nothing to apply, the transform itself when there
+        is only one, otherwise a TransformChain
+    """
+    transforms = [t for t in transforms if t is not None]
+    if not transforms:
+        return None
+    if len(transforms) == 1:
+        return transforms[0]
+    return TransformChain(*transforms)
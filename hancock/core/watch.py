@@ -0,0 +1,191 @@
+"""Detect changed signature files and work out which users they affect."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .matching import normalize_name
+from .scanner import iter_signature_files
+
+# Seconds a file must stay unchanged before it is deployed
+DEFAULT_DEBOUNCE = 2.0
+
+# Seconds between folder scans
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Gmail clients kept between deployments by a watcher
+SERVICE_CACHE_SIZE = 256
+
+
+class FolderWatcher:
+    """
+    Poll signature folders for added, modified and deleted files.
+
+    Each poll walks the folders with os.scandir (see iter_signature_files)
+    and compares modification time and size against the previous scan, so
+    it works the same on every platform and on network mounts where change
+    notifications are unreliable. No file contents are read.
+    """
+
+    def __init__(
+        self,
+        roots: Sequence[Path],
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        recursive: bool = False
+    ):
+        """
+        Args:
+            roots: Folders to watch
+            include: File patterns to pick up (default: *.html, *.htm)
+            exclude: File or directory patterns to skip
+            recursive: Also watch subfolders
+        """
+        self.roots = list(roots)
+        self.include = include
+        self.exclude = exclude
+        self.recursive = recursive
+        self._state = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Map every watched file to its (mtime_ns, size)."""
+        state = {}
+        for path in iter_signature_files(
+            self.roots, self.include, self.exclude, recursive=self.recursive, dedupe=False
+        ):
+            try:
+                stat = os.stat(str(path))
+            except OSError:
+                # Deleted between listing and stat
+                continue
+            state[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    @property
+    def files(self) -> List[Path]:
+        """Files present at the last scan."""
+        return [Path(path) for path in self._state]
+
+    def poll(self) -> Set[str]:
+        """
+        Rescan and report what changed since the previous scan.
+
+        Returns:
+            Paths of files that were added, modified or deleted
+        """
+        previous = self._state
+        self._state = self._scan()
+        return {
+            path for path in set(previous) | set(self._state)
+            if previous.get(path) != self._state.get(path)
+        }
+
+
+class DebounceQueue:
+    """
+    Collect items and release each once it has been quiet for `delay` seconds.
+
+    Editors often write a file several times when saving; re-adding an item
+    restarts its timer, so a burst of writes results in one deployment.
+    """
+
+    def __init__(self, delay: float = DEFAULT_DEBOUNCE):
+        self.delay = delay
+        self._pending = OrderedDict()  # item -> time of last change
+
+    def add(self, item: Hashable, now: Optional[float] = None):
+        """Add an item, or restart its timer if it is already queued."""
+        self._pending.pop(item, None)
+        self._pending[item] = time.monotonic() if now is None else now
+
+    def pop_ready(self, now: Optional[float] = None) -> List:
+        """Remove and return the items that have been quiet long enough, oldest first."""
+        now = time.monotonic() if now is None else now
+        ready = [item for item, changed in self._pending.items() if now - changed >= self.delay]
+        for item in ready:
+            del self._pending[item]
+        return ready
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+class ServiceCache(OrderedDict):
+    """
+    Clients by user email that keeps only the `max_size` most recently used.
+
+    Passed as service_cache to deploy_signatures_batch by long-running
+    processes, so users who change their signature again reuse their
+    client without the cache growing with every user ever deployed. Safe
+    to use from deploy_signatures_batch's worker threads.
+    """
+
+    def __init__(self, max_size: int = SERVICE_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        super().__init__()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self:
+                return default
+            self.move_to_end(key)
+            return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.max_size:
+                self.popitem(last=False)
+
+
+def users_for_files(
+    file_names: Iterable[str],
+    index: Dict[str, List[Tuple[int, Dict]]]
+) -> Set[str]:
+    """
+    Find every user a set of signature file names could belong to.
+
+    Args:
+        file_names: File names or paths
+        index: Match index from build_match_index
+
+    Returns:
+        Emails of users whose match keys equal any of the names
+    """
+    emails = set()
+    for name in file_names:
+        for _, user_data in index.get(normalize_name(name), []):
+            emails.add(user_data['email'])
+    return emails
+
+
+def files_for_users(
+    files: Iterable[Path],
+    emails: Set[str],
+    index: Dict[str, List[Tuple[int, Dict]]]
+) -> List[Path]:
+    """
+    Select the files that could match any of the given users.
+
+    Matching just these files against all users gives the same result for
+    those users as matching the whole folder, including conflicts.
+
+    Args:
+        files: All current signature files
+        emails: Users to select files for
+        index: Match index from build_match_index
+
+    Returns:
+        Files whose names match at least one of the users
+    """
+    selected = []
+    for path in files:
+        candidates = index.get(normalize_name(path.name), [])
+        if any(user_data['email'] in emails for _, user_data in candidates):
+            selected.append(path)
+    return selected
@@ -5,8 +5,13 @@ from rich.text import Text
 from .colors import console
 
 
-def create_match_table(matches: list, unmatched: list = None, errors: list = None) -> Table:
-    """Create a table showing file-to-user matches."""
+def create_match_table(
+    matches: list,
+    unmatched: list = None,
+    errors: list = None,
+    limit: int = None
+) -> Table:
+    """Create a table showing file-to-user matches, optionally capped at limit rows."""
     table = Table(
         title="Deployment Preview",
         show_header=True,
@@ -20,13 +25,25 @@ def create_match_table(matches: list, unmatched: list = None, errors: list = Non
     table.add_column("", style="muted", width=3)
     table.add_column("User", style="")
 
+    # Errors and warnings are kept first when the table is truncated
+    hidden = 0
+    if limit is not None:
+        total = len(matches) + len(unmatched or []) + len(errors or [])
+        errors = (errors or [])[:limit]
+        unmatched = (unmatched or [])[:limit - len(errors)]
+        matches = matches[:limit - len(errors) - len(unmatched)]
+        hidden = total - len(matches) - len(unmatched) - len(errors)
+
     # Add matched files
     for match in matches:
+        user = match.get("email", "")
+        if match.get("match_type") == "fuzzy":
+            user += f" (fuzzy {match.get('score', 0):.2f})"
         table.add_row(
             "✓",
             match.get("filename", ""),
             "→",
-            match.get("email", ""),
+            user,
             style="success"
         )
 
@@ -37,7 +54,7 @@ def create_match_table(matches: list, unmatched: list = None, errors: list = Non
                 "⚠",
                 file.get("filename", ""),
                 "→",
-                "No match found",
+                file.get("reason", "No match found"),
                 style="warning"
             )
 
@@ -52,6 +69,9 @@ def create_match_table(matches: list, unmatched: list = None, errors: list = Non
                 style="error"
             )
 
+    if hidden:
+        table.add_row("", f"... and {hidden} more", "", "", style="muted")
+
     return table
 
 
@@ -80,3 +100,266 @@ def print_deployment_summary(successful: int, failed: int, skipped: int):
     if failed > 0:
         console.print(f"[error]✗ {failed} files failed[/error]")
     console.print()
+
+
+def print_size_savings(matches: list, limit: int = 10):
+    """Print bytes saved per file (largest savings first) and in total."""
+    savings = []
+    for match in matches:
+        info = match.get("info", {})
+        before = info.get("original_size", info.get("size", 0))
+        after = info.get("size", 0)
+        if before > after:
+            savings.append((before - after, before, after, match.get("filename", "")))
+
+    if not savings:
+        console.print("[muted]Optimization saved no bytes[/muted]\n")
+        return
+
+    savings.sort(reverse=True)
+    total_before = sum(m.get("info", {}).get("original_size", m.get("size", 0)) for m in matches)
+    total_saved = sum(s[0] for s in savings)
+
+    table = Table(
+        title="Size Savings",
+        show_header=True,
+        header_style="bold cyan",
+        border_style="cyan",
+        title_style="bold",
+    )
+    table.add_column("File")
+    table.add_column("Before", justify="right")
+    table.add_column("After", justify="right")
+    table.add_column("Saved", justify="right", style="success")
+
+    for saved, before, after, filename in savings[:limit]:
+        table.add_row(filename, f"{before:,}", f"{after:,}", f"{saved:,} ({saved / before:.0%})")
+
+    if len(savings) > limit:
+        table.add_row(f"... and {len(savings) - limit} more", "", "", "", style="muted")
+
+    console.print(table)
+    console.print(
+        f"\n[success]Saved {total_saved / 1024:.1f}KB of {total_before / 1024:.1f}KB "
+        f"({total_saved / total_before:.0%}) across {len(savings)} files[/success]\n"
+    )
+
+
+def print_profile_summary(summaries: list):
+    """Print one row per profile (tenant) and the combined totals."""
+    table = Table(
+        title="Fleet Summary",
+        show_header=True,
+        header_style="bold cyan",
+        border_style="cyan",
+        title_style="bold",
+    )
+    table.add_column("Status", style="bold", width=3)
+    table.add_column("Profile")
+    table.add_column("Matched", justify="right")
+    table.add_column("Deployed", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Notes")
+
+    for summary in summaries:
+        if summary.get("error"):
+            status, style = "✗", "error"
+        elif summary.get("failed") or summary.get("errors"):
+            status, style = "⚠", "warning"
+        else:
+            status, style = "✓", "success"
+        notes = summary.get("error") or ""
+        if not notes and summary.get("errors"):
+            notes = f"{summary['errors']} invalid files"
+        table.add_row(
+            status,
+            summary.get("profile") or "default",
+            str(summary.get("matched", 0)),
+            str(summary.get("deployed", 0)),
+            str(summary.get("failed", 0)),
+            notes,
+            style=style
+        )
+
+    console.print(table)
+
+    deployed = sum(s.get("deployed", 0) for s in summaries)
+    failed = sum(s.get("failed", 0) for s in summaries)
+    stopped = sum(1 for s in summaries if s.get("error"))
+
+    console.print()
+    if deployed > 0:
+        tenants = sum(1 for s in summaries if s.get("deployed"))
+        console.print(f"[success]✓ Deployed {deployed} signatures across {tenants} tenants[/success]")
+    if failed > 0:
+        console.print(f"[error]✗ {failed} signatures failed[/error]")
+    if stopped > 0:
+        console.print(f"[error]✗ {stopped} tenants stopped early[/error]")
+    console.print()
+
+
+def print_trace_summary(rows: list, slowest: list = None):
+    """
+    Print a call-tree breakdown of where traced time went.
+
+    Args:
+        rows: Aggregated span rows from tracing.summarize()
+        slowest: Optional slowest 'deploy_user' spans, listed as outliers
+    """
+    table = Table(
+        title="Trace Breakdown",
+        show_header=True,
+        header_style="bold cyan",
+        border_style="cyan",
+        title_style="bold",
+    )
+    table.add_column("Span")
+    table.add_column("Count", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Self", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("Max", justify="right")
+
+    for row in rows:
+        table.add_row(
+            "  " * row["depth"] + row["name"],
+            str(row["count"]),
+            f"{row['total']:.2f}s",
+            f"{row['self']:.2f}s",
+            f"{row['p50'] * 1000:.0f}ms",
+            f"{row['p95'] * 1000:.0f}ms",
+            f"{row['max'] * 1000:.0f}ms",
+        )
+
+    console.print(table)
+
+    if slowest:
+        console.print("\n[bold]Slowest users:[/bold]")
+        for item in slowest:
+            retries = item.attributes.get("retries", 0)
+            note = f" [muted]({retries} retries)[/muted]" if retries else ""
+            console.print(f"  {item.duration:6.2f}s  {item.attributes.get('user', '')}{note}")
+    console.print()
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as e.g. "45s", "12m 30s" or "2h 05m"."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+def print_estimate(estimate: dict, workers: int, rate: float, source: str = None, quota_limit: int = None):
+    """
+    Print the API calls, quota and time a deployment is expected to take.
+
+    Args:
+        estimate: Result of estimate_deployment()
+        workers: Users deployed at the same time
+        rate: Rate limit in requests per second
+        source: Where the latency samples came from, if any
+        quota_limit: Project quota units per minute, to warn when exceeded
+    """
+    table = Table(
+        title="Deployment Estimate",
+        show_header=True,
+        header_style="bold cyan",
+        border_style="cyan",
+        title_style="bold",
+    )
+    table.add_column("Phase")
+    table.add_column("API calls", justify="right")
+    table.add_column("Quota units", justify="right")
+
+    for phase in estimate["phases"]:
+        table.add_row(phase["phase"], f"{phase['calls']:,}", f"{phase['units']:,}" if phase["units"] else "-")
+    table.add_row("Total", f"{estimate['calls']:,}", f"{estimate['units']:,}", style="bold")
+
+    console.print(table)
+    console.print()
+
+    if "seconds" not in estimate:
+        console.print(
+            "[muted]No latency data for a time estimate yet: add --probe 5 to time a few "
+            "users' API calls (read-only), or deploy once to record real timings.[/muted]\n"
+        )
+        return
+
+    console.print(
+        f"[bold]Estimated time: ~{format_duration(estimate['seconds'])}[/bold] "
+        f"with {workers} workers at {rate:g} requests/s (limited by {estimate['bottleneck']})"
+    )
+    console.print(
+        f"[muted]Per user: p50 {estimate['p50']:.2f}s, p95 {estimate['p95']:.2f}s"
+        f"{f', from {source}' if source else ''}[/muted]"
+    )
+    if estimate["bottleneck"] == "workers":
+        console.print(
+            f"[muted]Up to --workers {estimate['saturating_workers']} would be faster; "
+            f"beyond that the rate limit is the bottleneck.[/muted]"
+        )
+    if quota_limit and estimate["units_per_minute"] > quota_limit:
+        console.print(
+            f"[warning]⚠ ~{estimate['units_per_minute']:,.0f} quota units/minute exceeds the Gmail API's "
+            f"{quota_limit:,} per project; expect rate limit errors and retries.[/warning]"
+        )
+    console.print()
+
+
+def print_history(runs: list, show_profile: bool = False):
+    """
+    Print past deployments, highlighting runs slower than their baseline.
+
+    Args:
+        runs: Runs annotated by find_regressions, oldest first
+        show_profile: If True, add a profile column
+    """
+    table = Table(
+        title="Deployment History",
+        caption="Times are UTC",
+        show_header=True,
+        header_style="bold cyan",
+        border_style="cyan",
+        title_style="bold",
+    )
+    table.add_column("Run", justify="right")
+    table.add_column("Started", no_wrap=True)
+    if show_profile:
+        table.add_column("Profile")
+    table.add_column("Version")
+    table.add_column("Users", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Retries", justify="right")
+    table.add_column("Time", justify="right", no_wrap=True)
+    table.add_column("Users/s", justify="right")
+    table.add_column("vs median", justify="right")
+    table.add_column("Top error")
+
+    for run in runs:
+        if run["change"] is None:
+            change = Text("-", style="muted")
+        else:
+            change = Text(f"{run['change']:+.0%}", style="red" if run["regressed"] else "green" if run["change"] >= 0 else "")
+        top_error = next(iter(run["error_classes"].items()), None)
+
+        row = [str(run["id"]), run["started"][5:16].replace("T", " ")]
+        if show_profile:
+            row.append(run["profile"] or "default")
+        row += [
+            run["version"] or "-",
+            f"{run['users']:,}",
+            Text(f"{run['failed']:,}", style="red") if run["failed"] else "0",
+            f"{run['retries']:,}",
+            format_duration(run["seconds"]),
+            f"{run['users_per_second']:.1f}" if run["users_per_second"] is not None else "-",
+            change,
+            f"{top_error[0]} ×{top_error[1]}" if top_error else "-",
+        ]
+        table.add_row(*row, style="bold" if run["regressed"] else None)
+
+    console.print(table)
+    console.print()